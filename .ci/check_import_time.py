@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+
+# This program is free software: you can redistribute it and/or modify it
+# under the terms of the GNU Affero General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or (at your
+# option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE.  See the GNU Affero General Public License
+# for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Imports every module under ``bears/`` in a fresh interpreter and reports how
+much time and memory the import takes on top of importing coala itself.
+
+Collecting bears imports all bear modules, so third party packages that are
+only needed to run a bear should be imported in ``run``, or in the function
+using them, instead of at the top of the bear module. Packages coala imports
+itself, like ``requests``, cost nothing and may stay at the top, e.g. where
+``URLHeadBear`` needs them at class definition time. This check runs in the
+``pip`` tox environments, so moving such an import back to the top doesn't go
+unnoticed. Modules exceeding the budget are listed and the exit code is 1.
+Modules that can't be imported because of missing dependencies are reported
+but don't fail the check.
+"""
+
+import argparse
+import glob
+import json
+import os
+import subprocess
+import sys
+
+PROJECT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+PROJECT_BEAR_DIR = os.path.join(PROJECT_DIR, 'bears')
+
+# Everything a bear module imports anyway, measured once as baseline.
+BASELINE_IMPORTS = ('bears',
+                    'coalib.bears.LocalBear',
+                    'coalib.bears.GlobalBear',
+                    'coalib.bearlib.abstractions.Linter',
+                    'coalib.results.Result')
+
+MEASURE_CODE = """
+import importlib, json, resource, sys, time
+for module in {baseline!r}:
+    importlib.import_module(module)
+rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+start = time.perf_counter()
+error = None
+if {module!r}:
+    try:
+        importlib.import_module({module!r})
+    except Exception as exception:
+        error = '{{}}: {{}}'.format(type(exception).__name__, exception)
+print(json.dumps({{
+    'time': time.perf_counter() - start,
+    'rss': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - rss,
+    'error': error}}))
+"""
+
+
+def get_bear_modules():
+    """
+    :return: The names of all modules under ``bears/``, sorted.
+    """
+    modules = []
+    for filename in glob.glob(os.path.join(PROJECT_BEAR_DIR, '**', '*.py'),
+                              recursive=True):
+        module = os.path.relpath(filename, PROJECT_DIR)[:-len('.py')]
+        module = module.replace(os.path.sep, '.')
+        if module.endswith('.__init__'):
+            module = module[:-len('.__init__')]
+        modules.append(module)
+
+    return sorted(modules)
+
+
+def measure_import(module):
+    """
+    Imports the given module in a fresh interpreter after the baseline
+    imports.
+
+    :param module: The module name, an empty string only imports the
+                   baseline.
+    :return:       A dictionary holding the import time in seconds, the
+                   increase of the maximum RSS in KiB and an error message
+                   or None.
+    """
+    output = subprocess.check_output(
+        [sys.executable, '-c',
+         MEASURE_CODE.format(baseline=BASELINE_IMPORTS, module=module)],
+        cwd=PROJECT_DIR,
+        universal_newlines=True)
+    return json.loads(output.splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('modules', nargs='*',
+                        help='modules to check, defaults to all bear modules')
+    parser.add_argument('--max-time', type=float, default=0.15,
+                        help='import time budget per module in seconds')
+    parser.add_argument('--max-memory', type=float, default=20,
+                        help='memory budget per module in MiB')
+    args = parser.parse_args()
+
+    modules = args.modules or get_bear_modules()
+    over_budget = []
+    total_time = 0
+
+    print('{:<70} {:>9} {:>9}'.format('module', 'time [s]', 'RSS [MiB]'))
+    for module in modules:
+        result = measure_import(module)
+        if result['error']:
+            print('{:<70} {}'.format(module, result['error']))
+            continue
+
+        memory = result['rss'] / 1024
+        total_time += result['time']
+        print('{:<70} {:>9.3f} {:>9.1f}'.format(
+            module, result['time'], memory))
+        if result['time'] > args.max_time or memory > args.max_memory:
+            over_budget.append(module)
+
+    print('Total import time: {:.2f}s'.format(total_time))
+    if over_budget:
+        print('Over budget ({}s, {} MiB):'.format(args.max_time,
+                                                  args.max_memory))
+        for module in over_budget:
+            print(' ', module)
+        return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
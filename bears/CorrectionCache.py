@@ -0,0 +1,197 @@
+"""
+Caches the corrected files of fixer bears on disk.
+
+Fixers like ``autopep8`` or ``yapf`` take a while to correct a file, but
+their output only depends on the file contents, the settings and the version
+of the fixer. Set the ``correction_cache_size`` setting of these bears to
+reuse the corrections of unchanged files in later runs, e.g. in CI builds.
+The corrections are stored in the data directory of each bear, the least
+recently used ones are removed first.
+
+Corrections depending on the environment in other ways, e.g. on the
+installed packages isort looks at to place a module in a section, aren't
+told apart. Remove the cache directory after changing them.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from functools import lru_cache
+
+from bears import VERSION
+
+
+def get_correction_key(bear_name, tool_version, settings, lines):
+    """
+    Retrieves the key of a correction, it changes whenever the correction
+    may change.
+
+    >>> key = get_correction_key('PEP8Bear', '1.4', {'a': 1}, ['x\\n'])
+    >>> key == get_correction_key('PEP8Bear', '1.4', {'a': 1}, ['x\\n'])
+    True
+    >>> key == get_correction_key('PEP8Bear', '1.5', {'a': 1}, ['x\\n'])
+    False
+    >>> key == get_correction_key('PEP8Bear', '1.4', {'a': 2}, ['x\\n'])
+    False
+    >>> key == get_correction_key('PEP8Bear', '1.4', {'a': 1}, ['x', '\\n'])
+    False
+
+    :param bear_name:    The name of the bear correcting the file.
+    :param tool_version: The version of the tool correcting the file.
+    :param settings:     A dictionary of the settings the correction depends
+                         on.
+    :param lines:        The lines of the file to correct.
+    :return:             A hexadecimal SHA-256 hash.
+    """
+    key = hashlib.sha256()
+    key.update(repr((bear_name,
+                     VERSION,
+                     tool_version,
+                     sorted((name, repr(value))
+                            for name, value in settings.items()))).encode())
+    for line in lines:
+        # Prefixing the length keeps line boundaries apart.
+        encoded_line = line.encode('utf-8', 'surrogatepass')
+        key.update(b'%d:' % len(encoded_line))
+        key.update(encoded_line)
+    return key.hexdigest()
+
+
+class CorrectionCache:
+    """
+    Stores corrected files in a directory, one JSON file per correction.
+    Reading a correction updates the modification time of its file, so the
+    oldest files are the least recently used ones.
+    """
+
+    def __init__(self, directory, max_size):
+        """
+        :param directory: The directory to store the corrections in, it is
+                          created if needed.
+        :param max_size:  The maximum size of all corrections in bytes.
+        """
+        self.directory = directory
+        self.max_size = max_size
+        self.size = None
+        self.hits = 0
+        self.misses = 0
+
+    def _get_path(self, key):
+        return os.path.join(self.directory, key + '.json')
+
+    def get(self, key):
+        """
+        :param key: The key of the correction, see ``get_correction_key``.
+        :return:    The corrected lines or None if they aren't cached.
+        """
+        path = self._get_path(key)
+        try:
+            with open(path, 'r', encoding='utf-8',
+                      errors='surrogatepass') as cache_file:
+                lines = json.load(cache_file)
+            os.utime(path)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return lines
+
+    def set(self, key, lines):
+        """
+        Stores the given corrected lines and removes the least recently used
+        corrections if the cache gets too big.
+
+        :param key:   The key of the correction, see ``get_correction_key``.
+        :param lines: The corrected lines.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        if self.size is None:
+            self.size = sum(size for _, _, size in self._get_entries())
+
+        # Write to a temporary file first, so other processes never read a
+        # partial correction.
+        handle, temporary_path = tempfile.mkstemp(dir=self.directory,
+                                                  suffix='.tmp')
+        with open(handle, 'w', encoding='utf-8',
+                  errors='surrogatepass') as cache_file:
+            json.dump(list(lines), cache_file)
+        self.size += os.path.getsize(temporary_path)
+        os.replace(temporary_path, self._get_path(key))
+
+        if self.size > self.max_size:
+            self.evict()
+
+    def _get_entries(self):
+        entries = []
+        for entry in os.scandir(self.directory):
+            if not entry.name.endswith('.json'):
+                continue
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, entry.path, stat.st_size))
+        return entries
+
+    def evict(self):
+        """
+        Removes the least recently used corrections until the cache holds
+        at most ``max_size`` bytes.
+        """
+        entries = sorted(self._get_entries())
+        self.size = sum(size for _, _, size in entries)
+        for _, path, size in entries:
+            if self.size <= self.max_size:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                # Another process removed it already.
+                pass
+            self.size -= size
+
+    def __str__(self):
+        return 'Correction cache: {} hits, {} misses'.format(
+            self.hits, self.misses)
+
+
+@lru_cache(maxsize=None)
+def get_correction_cache(directory, max_size):
+    """
+    Returns the ``CorrectionCache`` of a directory shared by all files
+    checked in this process.
+    """
+    return CorrectionCache(directory, max_size)
+
+
+def get_corrected_lines(bear, tool_version, settings, lines, correct,
+                        cache_size=0):
+    """
+    Corrects the given lines, or takes the correction from the cache if it
+    is enabled.
+
+    :param bear:         The bear correcting the lines.
+    :param tool_version: The version of the tool correcting the lines.
+    :param settings:     A dictionary of the settings the correction depends
+                         on.
+    :param lines:        The lines to correct.
+    :param correct:      A function returning the corrected lines, called
+                         without arguments on a cache miss.
+    :param cache_size:   The maximum size of the cached corrections of the
+                         bear in MiB, 0 disables the cache.
+    :return:             A list of the corrected lines.
+    """
+    if cache_size <= 0:
+        return list(correct())
+
+    cache = get_correction_cache(os.path.join(bear.data_dir, 'corrections'),
+                                 cache_size * 1024 * 1024)
+    key = get_correction_key(type(bear).__name__, tool_version, settings,
+                             lines)
+    corrected = cache.get(key)
+    if corrected is None:
+        corrected = list(correct())
+        cache.set(key, corrected)
+    return corrected
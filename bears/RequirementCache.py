@@ -0,0 +1,181 @@
+"""
+Caches whether the requirements of the bears are installed.
+
+Checking a requirement usually runs its package manager, e.g. ``pip show``
+for every ``PipRequirement``, and coala checks the requirements of every bear
+it instantiates. The results are reused as long as the environment the
+requirements are looked up in doesn't change.
+
+The cache is only used for the bears passed to ``cache_requirement_checks``.
+coala doesn't call it when it collects or runs bears, so a coala run still
+checks the requirements of every bear it instantiates. Only the test suite of
+coala-bears opts in, see ``tests/conftest.py``.
+"""
+
+import functools
+import os
+import sys
+
+from dependency_management.requirements.PipRequirement import PipRequirement
+
+try:
+    from importlib.metadata import distribution, PackageNotFoundError
+except ImportError:  # pragma: no cover
+    # Python < 3.8
+    from pkg_resources import (DistributionNotFound as PackageNotFoundError,
+                               get_distribution as distribution)
+
+
+def get_environment_fingerprint():
+    """
+    Retrieves a fingerprint of everything the requirement checks depend on:
+    the interpreter, the working directory, ``sys.path``, ``PATH`` and the
+    modification times of the directories in them. Installing or removing a
+    package or an executable changes the modification time of the directory
+    it lives in.
+
+    :return: A hashable fingerprint of the environment.
+    """
+    path = os.environ.get('PATH', '')
+    directories = tuple(sys.path) + tuple(path.split(os.pathsep))
+    modification_times = []
+    for directory in directories:
+        try:
+            modification_times.append(os.stat(directory or '.').st_mtime_ns)
+        except OSError:
+            modification_times.append(None)
+
+    return (sys.executable,
+            os.getcwd(),
+            directories,
+            tuple(modification_times))
+
+
+def get_requirement_key(requirement):
+    """
+    Retrieves a key that is equal for requirements requiring the same thing,
+    even if they are declared by different bears.
+
+    >>> (get_requirement_key(PipRequirement('safety', '1.8.2')) ==
+    ...  get_requirement_key(PipRequirement('safety', '1.8.2')))
+    True
+    >>> from dependency_management.requirements.NpmRequirement import (
+    ...     NpmRequirement)
+    >>> (get_requirement_key(PipRequirement('safety')) ==
+    ...  get_requirement_key(NpmRequirement('safety')))
+    False
+
+    :param requirement: A requirement object.
+    :return:            A hashable key.
+    """
+    return (type(requirement).__qualname__,
+            repr(sorted((name, value)
+                        for name, value in vars(requirement).items()
+                        if not name.startswith('_') and
+                        name != 'is_installed')))
+
+
+def is_pip_package_installed(package):
+    """
+    Looks the given package up in the running interpreter instead of running
+    ``pip show``.
+
+    >>> is_pip_package_installed('coala-bears-not-existing-package')
+
+    :param package: The name of the package.
+    :return:        True if the package is installed, None if it can't be
+                    found this way.
+    """
+    try:
+        distribution(package)
+        return True
+    except PackageNotFoundError:
+        return None
+
+
+class RequirementCache:
+    """
+    Remembers whether requirements are installed. All results are dropped as
+    soon as the environment fingerprint changes, see
+    ``get_environment_fingerprint``.
+    """
+
+    def __init__(self):
+        self.fingerprint = None
+        self.results = {}
+        self.checks = 0
+        self.hits = 0
+
+    def is_installed(self, requirement, is_installed):
+        """
+        Checks if the given requirement is installed if it wasn't checked in
+        the current environment yet.
+
+        :param requirement:  The requirement to check.
+        :param is_installed: The function checking the requirement, called
+                             without arguments.
+        :return:             True if the requirement is installed.
+        """
+        fingerprint = get_environment_fingerprint()
+        if fingerprint != self.fingerprint:
+            self.fingerprint = fingerprint
+            self.results = {}
+
+        key = get_requirement_key(requirement)
+        if key in self.results:
+            self.hits += 1
+        else:
+            self.checks += 1
+            self.results[key] = is_installed()
+
+        return self.results[key]
+
+    def __str__(self):
+        return 'Requirement cache: {} checks, {} hits'.format(
+            self.checks, self.hits)
+
+
+requirement_cache = RequirementCache()
+
+
+def cache_requirement_checks(bears, cache=requirement_cache):
+    """
+    Makes the requirements of the given bears use the cache when checking
+    whether they are installed. Only the requirement objects of the bears are
+    changed, the requirement classes of ``dependency_management`` are left
+    alone. Pip packages are looked up in the running interpreter before
+    asking pip. Requirements that already use a cache are left alone.
+
+    :param bears: The bear classes to cache the requirement checks of.
+    :param cache: The ``RequirementCache`` to use.
+    """
+    for bear in bears:
+        for requirement in bear.REQUIREMENTS:
+            is_installed = requirement.is_installed
+            if hasattr(is_installed, 'requirement_cache'):
+                continue
+
+            if isinstance(requirement, PipRequirement):
+                is_installed = _look_up_pip_package_first(requirement,
+                                                          is_installed)
+
+            requirement.is_installed = _use_cache(requirement, is_installed,
+                                                  cache)
+
+
+def _look_up_pip_package_first(requirement, is_installed):
+    @functools.wraps(is_installed)
+    def decorated():
+        return (is_pip_package_installed(requirement.package) or
+                is_installed())
+
+    return decorated
+
+
+def _use_cache(requirement, is_installed, cache):
+    @functools.wraps(is_installed)
+    def decorated():
+        return cache.is_installed(requirement, is_installed)
+
+    decorated.requirement_cache = cache
+    return decorated
@@ -45,4 +45,23 @@ def check_coala_version():
                       'checking.')
 
 
+def cache_requirement_checks(bears):
+    """
+    Caches whether the requirements of the given bears are installed, see
+    ``bears.RequirementCache``. This isn't done when importing the package
+    and coala doesn't call it, only the test suite of coala-bears does.
+
+    :param bears: The bear classes to cache the requirement checks of.
+    """
+    try:
+        import dependency_management
+    except ImportError:  # pragma: no cover
+        logging.error('Module dependency_management is not found. Cannot '
+                      'cache requirement checks.')
+        return
+
+    from bears.RequirementCache import cache_requirement_checks
+    cache_requirement_checks(bears)
+
+
 check_coala_version()
@@ -1,3 +1,6 @@
+import hashlib
+from collections import OrderedDict
+
 from clang.cindex import Index, LibclangError
 
 from coalib.bears.LocalBear import LocalBear
@@ -28,6 +31,95 @@ def clang_available(cls):
         return str(error)
 
 
+class TranslationUnitCache:
+    """
+    Keeps the most recently parsed translation units, so bears checking the
+    same file with the same arguments share one parse.
+
+    A translation unit is only reused while the contents of its file are
+    unchanged. If they changed, the translation unit is reparsed in place,
+    which lets libclang reuse its precompiled preamble if it was parsed with
+    ``TranslationUnit.PARSE_PRECOMPILED_PREAMBLE``.
+    """
+
+    def __init__(self, maxsize):
+        """
+        :param maxsize: The maximum number of translation units to keep.
+        """
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.index = None
+        self.parses = 0
+        self.reparses = 0
+        self.hits = 0
+
+    def parse(self, filename, file=None, args=None, options=0):
+        """
+        Parses a file or returns its cached translation unit.
+
+        :param filename: The path of the file to parse.
+        :param file:     The contents of the file as a list of lines. If
+                         omitted, the file is read from disk.
+        :param args:     The command line arguments to pass to Clang.
+        :param options:  The ``TranslationUnit.PARSE_*`` flags to use.
+        :return:         A ``TranslationUnit``.
+        """
+        if file is None:
+            try:
+                with open(filename, 'rb') as fp:
+                    content_hash = hashlib.sha256(fp.read()).hexdigest()
+            except OSError:
+                # Let libclang report the error
+                return Index.create().parse(filename, args=args,
+                                            options=options)
+            unsaved_files = None
+        else:
+            contents = ''.join(file)
+            content_hash = hashlib.sha256(contents.encode()).hexdigest()
+            unsaved_files = [(filename, contents)]
+
+        key = (filename, tuple(args or ()), options)
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            entry_hash, translation_unit = self.entries[key]
+            if entry_hash == content_hash:
+                self.hits += 1
+            else:
+                translation_unit.reparse(unsaved_files, options)
+                self.entries[key] = (content_hash, translation_unit)
+                self.reparses += 1
+            return translation_unit
+
+        if self.index is None:
+            self.index = Index.create()
+        translation_unit = self.index.parse(filename,
+                                            args=args,
+                                            unsaved_files=unsaved_files,
+                                            options=options)
+        self.parses += 1
+        self.entries[key] = (content_hash, translation_unit)
+        if len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+        return translation_unit
+
+    def __str__(self):
+        return ('Translation unit cache: {} parses, {} reparses, '
+                '{} hits'.format(self.parses, self.reparses, self.hits))
+
+
+translation_unit_cache = TranslationUnitCache(maxsize=32)
+
+
+def get_translation_unit(filename, file=None, args=None, options=0):
+    """
+    Parses a file with libclang, reusing the translation unit of an earlier
+    parse of the same contents and arguments in this process.
+
+    See ``TranslationUnitCache.parse`` for the parameters.
+    """
+    return translation_unit_cache.parse(filename, file, args, options)
+
+
 def diff_from_clang_fixit(fixit, file):
     """
     Creates a ``Diff`` object from a given clang fixit and the file contents.
@@ -88,11 +180,10 @@ class ClangBear(LocalBear):
         :param clang_cli_options: Any options that will be passed through to
                                   Clang.
         """
-        index = Index.create()
-        diagnostics = index.parse(
-            filename,
-            args=clang_cli_options,
-            unsaved_files=[(filename, ''.join(file))]).diagnostics
+        diagnostics = get_translation_unit(filename,
+                                           file,
+                                           args=clang_cli_options).diagnostics
+        self.debug(str(translation_unit_cache))
         for diag in diagnostics:
             severity = {0: RESULT_SEVERITY.INFO,
                         1: RESULT_SEVERITY.INFO,
@@ -1,10 +1,11 @@
-from clang.cindex import Index, CursorKind
+from clang.cindex import CursorKind
 
 from coalib.bears.LocalBear import LocalBear
 from coalib.results.Result import Result
 from coalib.bearlib import deprecate_settings
 from bears.c_languages.ClangBear import (
-    clang_available, ClangBear, sourcerange_from_clang_range,
+    clang_available, ClangBear, get_translation_unit,
+    sourcerange_from_clang_range, translation_unit_cache,
 )
 
 
@@ -96,7 +97,8 @@ class ClangComplexityBear(LocalBear):
                                 explanation of why the limit was exceeded."
         """
 
-        root = Index.create().parse(filename).cursor
+        root = get_translation_unit(filename).cursor
+        self.debug(str(translation_unit_cache))
         for cursor, complexity in self.complexities(root, filename):
             if complexity > cyclomatic_complexity:
                 affected_code = (sourcerange_from_clang_range(cursor.extent),)
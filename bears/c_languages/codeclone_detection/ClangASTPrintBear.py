@@ -1,6 +1,7 @@
-from clang.cindex import Index, TranslationUnit
+from clang.cindex import TranslationUnit
 
-from bears.c_languages.ClangBear import clang_available, ClangBear
+from bears.c_languages.ClangBear import (
+    clang_available, ClangBear, get_translation_unit, translation_unit_cache)
 from coalib.bears.GlobalBear import GlobalBear
 
 
@@ -57,9 +58,11 @@ class ClangASTPrintBear(GlobalBear):
         prints out the whole AST for a file to the DEBUG channel.
         """
         for filename, file in sorted(self.file_dict.items()):
-            root = Index.create().parse(
+            root = get_translation_unit(
                 filename,
                 options=TranslationUnit.PARSE_DETAILED_PROCESSING_RECORD
                 ).cursor
 
             self.print_node(root, filename)
+
+        self.debug(str(translation_unit_cache))
@@ -1,7 +1,11 @@
-from clang.cindex import Cursor, Index
+from collections import Counter
 
+from clang.cindex import Cursor
+
+from bears.c_languages.ClangBear import get_translation_unit
 from bears.c_languages.codeclone_detection.ClangCountingConditions import (
-    get_identifier_name, is_function_declaration, is_literal, is_reference)
+    condition_kinds, get_identifier_name, is_function_declaration, is_literal,
+    is_reference)
 from bears.c_languages.codeclone_detection.CountVector import CountVector
 
 
@@ -19,6 +23,9 @@ class ClangCountVectorCreator:
 
     The ClangCountVectorCreator will only count variables local to each
     function.
+
+    Conditions listed in ``condition_kinds`` are only called if one of their
+    cursor kinds is on the stack.
     """
 
     def __init__(self,
@@ -38,30 +45,32 @@ class ClangCountVectorCreator:
         self.weightings = weightings
         self.count_vectors = {}
         self.stack = []
+        self.stack_kinds = Counter()
+        self.required_kinds = [condition_kinds.get(condition)
+                               for condition in (conditions or [])]
 
     def count_identifier(self, identifier, category):
         if identifier not in self.count_vectors:
             self.count_vectors[identifier] = CountVector(
                 identifier, category, self.conditions, self.weightings)
 
-        self.count_vectors[identifier].count_reference(self.stack)
+        condition_indices = [
+            i for i, kinds in enumerate(self.required_kinds)
+            if kinds is None or any(self.stack_kinds[kind] for kind in kinds)]
+        self.count_vectors[identifier].count_reference_for(condition_indices,
+                                                           self.stack)
 
-    def _get_vector_for_function(self, cursor, child_num=0):
+    def _push(self, cursor, child_num):
         """
-        Creates a CountVector object for the given cursor.
-
-        Note: this function uses self.count_vectors for storing its results.
-        This is done knowingly because passing back and forth mutable objects
-        is not nice and yields in bigger complexity IMHO.
+        Pushes the given cursor on the stack and counts its identifier if it
+        is a reference or a literal.
 
-        This function creates a CountVector object for all variables found in
-        self.local_vars and in the tree elements below the given one, stores it
-        in self.count_vectors.
-
-        :param cursor: Clang cursor to iterate over.
+        :param cursor:    The clang cursor to push.
+        :param child_num: The number of the cursor within its parent's
+                          children.
         """
-        assert isinstance(cursor, Cursor)
         self.stack.append((cursor, child_num))
+        self.stack_kinds[cursor.kind] += 1
 
         if is_reference(cursor):
             self.count_identifier(get_identifier_name(cursor),
@@ -72,10 +81,42 @@ class ClangCountVectorCreator:
                 self.count_identifier(tokens[0].spelling,
                                       CountVector.Category.literal)
 
-        for i, child in enumerate(cursor.get_children()):
-            self._get_vector_for_function(child, i)
+    def _pop(self):
+        """
+        Removes the cursor on top of the stack.
+        """
+        cursor, _ = self.stack.pop()
+        self.stack_kinds[cursor.kind] -= 1
+
+    def _get_vector_for_function(self, cursor, child_num=0):
+        """
+        Creates a CountVector object for the given cursor.
+
+        Note: this function uses self.count_vectors for storing its results.
+        This is done knowingly because passing back and forth mutable objects
+        is not nice and yields in bigger complexity IMHO.
+
+        This function creates a CountVector object for all variables found in
+        self.local_vars and in the tree elements below the given one, stores it
+        in self.count_vectors.
+
+        The tree is walked with an explicit stack of child iterators so
+        deeply nested code doesn't hit the recursion limit.
 
-        self.stack.pop()
+        :param cursor: Clang cursor to iterate over.
+        """
+        assert isinstance(cursor, Cursor)
+        self._push(cursor, child_num)
+        children = [enumerate(cursor.get_children())]
+
+        while children:
+            for i, child in children[-1]:
+                self._push(child, i)
+                children.append(enumerate(child.get_children()))
+                break
+            else:
+                children.pop()
+                self._pop()
 
     def _get_vectors_for_cursor(self, cursor, filename):
         """
@@ -100,6 +141,7 @@ class ClangCountVectorCreator:
             # Reset local states
             self.count_vectors = {}
             self.stack = []
+            self.stack_kinds = Counter()
         else:
             result = {}
             for child in cursor.get_children():
@@ -119,6 +161,6 @@ class ClangCountVectorCreator:
                          in all functions.
         """
         args = ['-I'+path for path in include_paths]
-        root = Index.create().parse(filename, args=args).cursor
+        root = get_translation_unit(filename, args=args).cursor
 
         return self._get_vectors_for_cursor(root, filename)
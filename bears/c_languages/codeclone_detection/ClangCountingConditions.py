@@ -112,46 +112,93 @@ def is_function(stack):
     return _is_nth_child_of_kind(stack, [0], CursorKind.CALL_EXPR) != 0
 
 
+def _get_tokens(cursor):
+    """
+    Retrieves the spelling and the position of all tokens of the given cursor.
+
+    The conditions look at the tokens of the same parent cursors for every
+    variable below them, so the tokens are cached on the cursor.
+
+    :param cursor: A clang cursor from the AST.
+    :return:       A list of tuples holding the spelling, the start and the
+                   end (both as tuple of line and column) of each token.
+    """
+    try:
+        return cursor.coala_tokens
+    except AttributeError:
+        cursor.coala_tokens = []
+        for token in cursor.get_tokens():
+            extent = token.extent
+            cursor.coala_tokens.append((token.spelling,
+                                        (extent.start.line,
+                                         extent.start.column),
+                                        (extent.end.line,
+                                         extent.end.column)))
+        return cursor.coala_tokens
+
+
 FOR_POSITION = enum('UNKNOWN', 'INIT', 'COND', 'INC', 'BODY')
 
 
-def _get_position_in_for_tokens(tokens, position):
+def _get_for_state_changes(tokens):
     """
-    Retrieves the semantic position of the given position in a for loop. It
-    operates under the assumptions that the given tokens represent a for loop
-    and that the given position is within the tokens.
+    Retrieves the positions where a for loop enters its next semantic part.
 
-    :param tokens:   The tokens representing the for loop (clang extent)
-    :param position: A tuple holding (line, column) of the position to
-                     identify.
-    :return:         A FOR_POSITION object indicating where the position is
-                     semantically.
+    :param tokens: The tokens representing the for loop, see ``_get_tokens``.
+    :return:       A list of tuples holding the position of the token, the
+                   FOR_POSITION before and the FOR_POSITION after it.
     """
+    changes = []
     state = FOR_POSITION.INIT
     next_state = state
     opened_brackets = 0
-    for token in tokens:
-        if token.spelling == ';':
+    for spelling, start, _ in tokens:
+        if spelling == ';':
             next_state = state + 1
-        elif token.spelling == '(':
+        elif spelling == '(':
             opened_brackets += 1
-        elif token.spelling == ')':
+        elif spelling == ')':
             opened_brackets -= 1
             # Closed bracket for for condition, otherwise syntax error by clang
             if opened_brackets == 0:
                 next_state = FOR_POSITION.BODY
 
         if next_state is not state:
-            token_position = (token.extent.start.line,
-                              token.extent.start.column)
-            if position <= token_position:
-                return state
-            # Last state, if we reach it the position must be in body
-            elif next_state == FOR_POSITION.BODY:
-                return next_state
+            changes.append((start, state, next_state))
+            # Last state, every following position is in the body
+            if next_state == FOR_POSITION.BODY:
+                break
 
             state = next_state
 
+    return changes
+
+
+def _get_position_in_for_loop(cursor, position):
+    """
+    Retrieves the semantic position of the given position in a for loop. It
+    operates under the assumption that the given position is within the for
+    loop.
+
+    :param cursor:   A cursor of kind FOR_STMT.
+    :param position: A tuple holding (line, column) of the position to
+                     identify.
+    :return:         A FOR_POSITION object indicating where the position is
+                     semantically.
+    """
+    try:
+        state_changes = cursor.coala_for_state_changes
+    except AttributeError:
+        state_changes = _get_for_state_changes(_get_tokens(cursor))
+        cursor.coala_for_state_changes = state_changes
+
+    for token_position, state, next_state in state_changes:
+        if position <= token_position:
+            return state
+        # Last state, if we reach it the position must be in body
+        elif next_state == FOR_POSITION.BODY:
+            return next_state
+
     # We probably have a macro here, clang doesn't preprocess them. I don't see
     # a chance of getting macros parsed right here in the limited time
     # available. For our heuristic approach we'll just not count for loops
@@ -171,36 +218,42 @@ def _get_positions_in_for_loop(stack):
     :return:       A list of semantic FOR_POSITION's within for loops.
     """
     results = []
+    position = None
     for elem, _ in stack:
         if elem.kind == CursorKind.FOR_STMT:
-            results.append(_get_position_in_for_tokens(
-                elem.get_tokens(),
-                (stack[-1][0].location.line, stack[-1][0].location.column)))
+            if position is None:
+                location = stack[-1][0].location
+                position = (location.line, location.column)
+            results.append(_get_position_in_for_loop(elem, position))
 
     return results
 
 
 def _get_binop_operator(cursor):
     """
-    Returns the operator token of a binary operator cursor.
+    Returns the operator of a binary operator cursor. The result is cached on
+    the cursor.
 
     :param cursor: A cursor of kind BINARY_OPERATOR.
-    :return:       The token object containing the actual operator or None.
+    :return:       The spelling of the actual operator or None.
     """
+    try:
+        return cursor.coala_operator
+    except AttributeError:
+        cursor.coala_operator = None
+
     children = list(cursor.get_children())
     operator_min_begin = (children[0].location.line,
                           children[0].location.column)
     operator_max_end = (children[1].location.line,
                         children[1].location.column)
 
-    for token in cursor.get_tokens():
-        if (operator_min_begin < (token.extent.start.line,
-                                  token.extent.start.column) and
-            operator_max_end >= (token.extent.end.line,
-                                 token.extent.end.column)):
-            return token
+    for spelling, start, end in _get_tokens(cursor):
+        if operator_min_begin < start and operator_max_end >= end:
+            cursor.coala_operator = spelling
+            break
 
-    return None  # pragma: no cover
+    return cursor.coala_operator
 
 
 def _stack_contains_operators(stack, operators):
@@ -221,7 +274,7 @@ def _stack_contains_operators(stack, operators):
             if operator is None:  # pragma: no cover
                 continue
 
-            if operator.spelling in operators:
+            if operator in operators:
                 return True
 
     return False
@@ -289,8 +342,8 @@ def is_inc_or_dec(stack):
     """
     for elem, _ in stack:
         if elem.kind == CursorKind.UNARY_OPERATOR:
-            for token in elem.get_tokens():
-                if token.spelling in ['--', '++']:
+            for spelling, _, _ in _get_tokens(elem):
+                if spelling in ['--', '++']:
                     return True
 
     return False
@@ -342,12 +395,10 @@ def is_assignee(stack):
         if (
                 elem.kind == CursorKind.BINARY_OPERATOR or
                 elem.kind == CursorKind.COMPOUND_ASSIGNMENT_OPERATOR):
-            for token in elem.get_tokens():
-                token_pos = (token.extent.start.line,
-                             token.extent.start.column)
+            for spelling, token_pos, _ in _get_tokens(elem):
                 # This needs to be an assignment and cursor has to be on LHS
                 if (
-                        token.spelling in ASSIGNMENT_OPERATORS and
+                        spelling in ASSIGNMENT_OPERATORS and
                         cursor_pos <= token_pos):
                     return True
 
@@ -364,14 +415,13 @@ def is_assigner(stack):
         if (
                 elem.kind == CursorKind.BINARY_OPERATOR or
                 elem.kind == CursorKind.COMPOUND_ASSIGNMENT_OPERATOR):
-            for token in elem.get_tokens():
-                token_pos = (token.extent.end.line, token.extent.end.column)
+            for spelling, _, token_pos in _get_tokens(elem):
                 # This needs to be an assignment and cursor has to be on RHS
                 # or if we have something like += its irrelevant on which side
                 # it is because += reads on both sides
-                if (token.spelling in ASSIGNMENT_OPERATORS and (
+                if (spelling in ASSIGNMENT_OPERATORS and (
                         token_pos <= cursor_pos or
-                        token.spelling != '=')):
+                        spelling != '=')):
                     return True
 
     return is_inc_or_dec(stack)
@@ -455,6 +505,40 @@ condition_dict = {'used': used,
                   'member_accessed': member_accessed}
 
 
+_ASSIGNMENT_KINDS = (CursorKind.BINARY_OPERATOR,
+                     CursorKind.COMPOUND_ASSIGNMENT_OPERATOR,
+                     CursorKind.UNARY_OPERATOR)
+_BINARY_OPERATOR_KINDS = (CursorKind.BINARY_OPERATOR,
+                          CursorKind.COMPOUND_ASSIGNMENT_OPERATOR)
+_LOOP_KINDS = (CursorKind.FOR_STMT, CursorKind.WHILE_STMT)
+
+# Maps counting conditions to the cursor kinds of which at least one has to be
+# on the stack for the condition to be true. Conditions that are not listed
+# can be true anywhere.
+condition_kinds = {
+    returned: (CursorKind.RETURN_STMT,),
+    is_condition: (CursorKind.WHILE_STMT,
+                   CursorKind.IF_STMT,
+                   CursorKind.SWITCH_STMT,
+                   CursorKind.CASE_STMT,
+                   CursorKind.FOR_STMT),
+    in_condition: (CursorKind.IF_STMT, CursorKind.SWITCH_STMT),
+    in_second_level_condition: (CursorKind.IF_STMT,),
+    in_third_level_condition: (CursorKind.IF_STMT,),
+    is_assignee: _ASSIGNMENT_KINDS,
+    is_assigner: _ASSIGNMENT_KINDS,
+    loop_content: _LOOP_KINDS,
+    second_level_loop_content: _LOOP_KINDS,
+    third_level_loop_content: _LOOP_KINDS,
+    is_param: (CursorKind.PARM_DECL,),
+    is_called: (CursorKind.CALL_EXPR,),
+    is_call_param: (CursorKind.CALL_EXPR,),
+    in_sum: _BINARY_OPERATOR_KINDS,
+    in_product: _BINARY_OPERATOR_KINDS,
+    in_binary_operation: _BINARY_OPERATOR_KINDS,
+    member_accessed: (CursorKind.MEMBER_REF_EXPR,)}
+
+
 def counting_condition(value):
     """
     This is a custom converter to convert a setting from coala into counting
@@ -1,13 +1,17 @@
 import functools
-from itertools import combinations
+import os
+from array import array
+from multiprocessing import Pool
 
-from bears.c_languages.ClangBear import clang_available, ClangBear
+from bears.c_languages.ClangBear import (
+    clang_available, ClangBear, translation_unit_cache)
 from bears.c_languages.codeclone_detection.ClangCountingConditions import (
     condition_dict)
 from bears.c_languages.codeclone_detection.ClangCountVectorCreator import (
     ClangCountVectorCreator)
 from bears.c_languages.codeclone_detection.CloneDetectionRoutines import (
-    compare_functions, get_count_matrices)
+    CountMatrixCache, compare_count_arrays, get_clone_candidates,
+    get_count_array, get_count_matrices, get_function_size)
 from coala_utils.string_processing.StringConverter import StringConverter
 from coalib.bears.GlobalBear import GlobalBear
 from dependency_management.requirements.PipRequirement import PipRequirement
@@ -48,6 +52,59 @@ in_binary_operation,
 member_accessed"""))
 
 
+@generate_repr('functions')
+@generate_ordering('functions',
+                   'first_functions',
+                   'second_functions',
+                   'differences')
+class FunctionDifferences:
+    """
+    Holds the differences of function pairs compactly. Every function is
+    stored only once while the pairs are stored as indices and differences in
+    arrays.
+
+    Iterating over it yields ``(function_1, function_2, difference)`` tuples.
+
+    >>> differences = FunctionDifferences(['f', 'g', 'h'])
+    >>> differences.append(0, 2, 0.5)
+    >>> len(differences), list(differences)
+    (1, [('f', 'h', 0.5)])
+    """
+
+    def __init__(self, functions):
+        """
+        :param functions: A list holding all functions the pairs may refer to.
+        """
+        self.functions = functions
+        self.first_functions = array('L')
+        self.second_functions = array('L')
+        self.differences = array('d')
+
+    def append(self, first_function, second_function, difference):
+        """
+        Adds the difference of a function pair.
+
+        :param first_function:  The index of the first function.
+        :param second_function: The index of the second function.
+        :param difference:      The difference between the functions.
+        """
+        self.first_functions.append(first_function)
+        self.second_functions.append(second_function)
+        self.differences.append(difference)
+
+    def __len__(self):
+        return len(self.differences)
+
+    def __iter__(self):
+        for first_function, second_function, difference in zip(
+                self.first_functions,
+                self.second_functions,
+                self.differences):
+            yield (self.functions[first_function],
+                   self.functions[second_function],
+                   difference)
+
+
 @generate_repr(('id', hex),
                'origin',
                'differences',
@@ -61,7 +118,7 @@ class ClangFunctionDifferenceResult(HiddenResult):
 
     @enforce_signature
     def __init__(self, origin,
-                 differences: list,
+                 differences: (list, FunctionDifferences),
                  count_matrices: dict):
         super().__init__(origin,
                          [differences, count_matrices])
@@ -69,17 +126,22 @@ class ClangFunctionDifferenceResult(HiddenResult):
         self.count_matrices = count_matrices
 
 
-def get_difference(function_pair,
-                   count_matrices,
-                   average_calculation,
-                   poly_postprocessing,
-                   exp_postprocessing):
+def get_row_differences(row,
+                        count_arrays,
+                        candidates,
+                        average_calculation,
+                        poly_postprocessing,
+                        exp_postprocessing):
     """
-    Retrieves the difference between two functions using the munkres algorithm.
+    Retrieves the differences between one function and its clone candidates
+    using the hungarian algorithm.
 
-    :param function_pair:       A tuple containing both indices for the
-                                count_matrices dictionary.
-    :param count_matrices:      A dictionary holding CMs.
+    :param row:                 The index of the function in count_arrays.
+    :param count_arrays:        A list holding the count arrays of the CMs,
+                                see ``get_count_array``.
+    :param candidates:          A list holding the indices of the clone
+                                candidates of every function, see
+                                ``get_clone_candidates``.
     :param average_calculation: If set to true the difference calculation
                                 function will take the average of all variable
                                 differences as the difference, else it will
@@ -91,23 +153,36 @@ def get_difference(function_pair,
     :param exp_postprocessing:  If set to true, the difference value of big
                                 function pairs will be reduced using an
                                 exponential approach.
-    :return:                    A tuple containing both function ids and their
-                                difference.
+    :return:                    A list holding the differences to the
+                                candidates of the function.
     """
-    function_1, function_2 = function_pair
-    return (function_1,
-            function_2,
-            compare_functions(count_matrices[function_1],
-                              count_matrices[function_2],
-                              average_calculation,
-                              poly_postprocessing,
-                              exp_postprocessing))
+    return [compare_count_arrays(count_arrays[row],
+                                 count_arrays[candidate],
+                                 average_calculation,
+                                 poly_postprocessing,
+                                 exp_postprocessing)
+            for candidate in candidates[row]]
+
+
+# The count arrays are sent to every worker process once when it starts, not
+# with every row it calculates.
+_worker_get_row_differences = None
+
+
+def _initialize_worker(partial_get_row_differences):
+    global _worker_get_row_differences
+    _worker_get_row_differences = partial_get_row_differences
+
+
+def _get_row_differences_in_worker(row):
+    return _worker_get_row_differences(row)
 
 
 class ClangFunctionDifferenceBear(GlobalBear):
     check_prerequisites = classmethod(clang_available)
     LANGUAGES = ClangBear.LANGUAGES
-    REQUIREMENTS = ClangBear.REQUIREMENTS | {PipRequirement('munkres', '1.1.2')}
+    REQUIREMENTS = ClangBear.REQUIREMENTS | {PipRequirement('numpy', '1.16'),
+                                             PipRequirement('scipy', '1.2')}
 
     def run(self,
             counting_conditions: counting_condition_dict = default_cc_dict,
@@ -115,6 +190,10 @@ class ClangFunctionDifferenceBear(GlobalBear):
             poly_postprocessing: bool = True,
             exp_postprocessing: bool = False,
             extra_include_paths: path_list = (),
+            jobs: int = 1,
+            max_clone_difference: float = 0.185,
+            cache_count_matrices: bool = False,
+            only_keep_clones: bool = False,
             ):
         """
         Retrieves similarities for code clone detection. Those can be reused in
@@ -153,6 +232,25 @@ class ClangFunctionDifferenceBear(GlobalBear):
         :param exp_postprocessing:  If set to true, the difference value of big
                                     function pairs will be reduced using an
                                     exponential approach.
+        :param jobs:                The number of processes to calculate the
+                                    differences with. If set to 0, one process
+                                    per CPU is used.
+        :param max_clone_difference:
+                                    The maximum difference a clone should have.
+                                    Pairs of functions that certainly differ
+                                    more are left out of the result without
+                                    calculating their difference.
+        :param cache_count_matrices:
+                                    If set to true, the count matrices of each
+                                    file are cached and only created again if
+                                    the file, the include paths or the counting
+                                    conditions changed. Changes in included
+                                    files are not detected.
+        :param only_keep_clones:    If set to true, only function pairs with a
+                                    difference below max_clone_difference and
+                                    the count matrices of their functions are
+                                    kept in the result. This needs a lot less
+                                    memory for big code bases.
         """
         self.debug('Using the following counting conditions:')
         for key, val in counting_conditions.items():
@@ -165,26 +263,82 @@ class ClangFunctionDifferenceBear(GlobalBear):
             list(self.file_dict.keys()),
             lambda prog: self.debug('{:2.4f}%...'.format(prog)),
             self.section['files'].origin,
-            collect_dirs(extra_include_paths))
+            collect_dirs(extra_include_paths),
+            CountMatrixCache(os.path.join(self.data_dir,
+                                          'count_matrices.sqlite3'))
+            if cache_count_matrices else None)
+        self.debug(str(translation_unit_cache))
 
         self.debug('Calculating differences...')
 
-        differences = []
-        function_count = len(count_matrices)
+        functions = list(count_matrices)
+        count_arrays = [get_count_array(count_matrices[function])
+                        for function in functions]
+        if all(count_array.min() >= 0 for count_array in count_arrays):
+            candidates = get_clone_candidates(
+                [get_function_size(count_array, average_calculation)
+                 for count_array in count_arrays],
+                max_clone_difference,
+                average_calculation,
+                poly_postprocessing,
+                exp_postprocessing)
+        else:
+            # The lower bounds only hold for positive weightings.
+            candidates = [list(range(row + 1, len(functions)))
+                          for row in range(len(functions))]
+
+        if only_keep_clones:
+            differences = FunctionDifferences(functions)
+        else:
+            differences = []
         # Thats n over 2, hardcoded to simplify calculation
-        combination_length = function_count * (function_count-1) / 2
-        partial_get_difference = functools.partial(
-            get_difference,
-            count_matrices=count_matrices,
+        pair_count = len(functions) * (len(functions)-1) // 2
+        combination_length = sum(map(len, candidates))
+        self.debug('Skipping {} of {} function pairs.'.format(
+            pair_count - combination_length, pair_count))
+        partial_get_row_differences = functools.partial(
+            get_row_differences,
+            count_arrays=count_arrays,
+            candidates=candidates,
             average_calculation=average_calculation,
             poly_postprocessing=poly_postprocessing,
             exp_postprocessing=exp_postprocessing)
 
-        for i, elem in enumerate(
-                map(partial_get_difference,
-                    [(f1, f2) for f1, f2 in combinations(count_matrices, 2)])):
-            if i % 50 == 0:
-                self.debug('{:2.4f}%...'.format(100*i/combination_length))
-            differences.append(elem)
+        # Every row holds the differences of one function to its clone
+        # candidates, imap keeps the rows in order.
+        if jobs == 1:
+            pool = None
+            rows = map(partial_get_row_differences, range(len(functions)))
+        else:
+            pool = Pool(jobs or None,
+                        _initialize_worker,
+                        (partial_get_row_differences,))
+            rows = pool.imap(_get_row_differences_in_worker,
+                             range(len(functions)))
+
+        calculated = 0
+        try:
+            for row, row_differences in enumerate(rows):
+                if row_differences:
+                    self.debug('{:2.4f}%...'.format(
+                        100*calculated/combination_length))
+                calculated += len(row_differences)
+                for candidate, difference in zip(candidates[row],
+                                                 row_differences):
+                    if not only_keep_clones:
+                        differences.append((functions[row],
+                                            functions[candidate],
+                                            difference))
+                    elif difference < max_clone_difference:
+                        differences.append(row, candidate, difference)
+        finally:
+            if pool is not None:
+                pool.terminate()
+
+        if only_keep_clones:
+            count_matrices = {
+                function: count_matrices[function]
+                for function_1, function_2, _ in differences
+                for function in (function_1, function_2)}
 
         yield ClangFunctionDifferenceResult(self, differences, count_matrices)
@@ -1,15 +1,14 @@
 import copy
+import hashlib
 import math
 import os
-
-from munkres import Munkres
+import pickle
+import sqlite3
+from bisect import bisect_left, bisect_right
 
 from coalib.collecting.Collectors import collect_dirs
 from bears.c_languages.codeclone_detection.CountVector import CountVector
 
-# Instantiate globally since this class is holding stateless public methods.
-munkres = Munkres()
-
 
 def exclude_function(count_matrix):
     """
@@ -36,11 +35,108 @@ def exclude_function(count_matrix):
             var_count < 2)
 
 
+class CountMatrixCache:
+    """
+    Caches the count matrices of files in a SQLite database, so they are only
+    created again if the file, the include paths, the counting conditions or
+    their weightings have changed.
+
+    Changes in included files are not detected.
+    """
+
+    def __init__(self, database):
+        """
+        :param database: The path of the SQLite database.
+        """
+        self.connection = sqlite3.connect(database, timeout=30)
+        with self.connection:
+            self.connection.execute(
+                'CREATE TABLE IF NOT EXISTS count_matrices ('
+                'filename TEXT PRIMARY KEY, key TEXT, count_dict BLOB)')
+
+    @staticmethod
+    def get_key(filename, include_paths, count_vector_creator):
+        """
+        Calculates the key the count matrices of a file are valid for.
+
+        :param filename:             The path of the file.
+        :param include_paths:        The include paths the file is parsed
+                                     with.
+        :param count_vector_creator: The ``ClangCountVectorCreator`` creating
+                                     the count vectors.
+        :return:                     A hex digest.
+        """
+        key = hashlib.sha256()
+        with open(filename, 'rb') as file:
+            key.update(file.read())
+        key.update(repr((list(include_paths),
+                         [condition.__name__ for condition
+                          in count_vector_creator.conditions or ()],
+                         count_vector_creator.weightings)).encode())
+        return key.hexdigest()
+
+    def get(self, filename, key, count_vector_creator):
+        """
+        Gets the cached count matrices of a file.
+
+        :param filename:             The path of the file.
+        :param key:                  The key of the file, see ``get_key``.
+        :param count_vector_creator: The ``ClangCountVectorCreator`` to take
+                                     the counting conditions and weightings
+                                     from.
+        :return:                     The dictionary holding the count vectors
+                                     of all functions like
+                                     ``get_vectors_for_file`` returns it or
+                                     None if there is no valid entry.
+        """
+        row = self.connection.execute(
+            'SELECT count_dict FROM count_matrices '
+            'WHERE filename = ? AND key = ?', (filename, key)).fetchone()
+        if row is None:
+            return None
+
+        count_dict = {}
+        for function, variables in pickle.loads(row[0]).items():
+            count_dict[function] = {}
+            for name, category, count_vector, unweighted in variables:
+                count_dict[function][name] = CountVector(
+                    name,
+                    category,
+                    count_vector_creator.conditions,
+                    count_vector_creator.weightings)
+                count_dict[function][name].count_vector = count_vector
+                count_dict[function][name].unweighted = unweighted
+
+        return count_dict
+
+    def set(self, filename, key, count_dict):
+        """
+        Stores the count matrices of a file.
+
+        :param filename:   The path of the file.
+        :param key:        The key of the file, see ``get_key``.
+        :param count_dict: The dictionary holding the count vectors of all
+                           functions in the file.
+        """
+        variables = {function: [(name,
+                                 count_vector.category,
+                                 count_vector.count_vector,
+                                 count_vector.unweighted)
+                                for name, count_vector
+                                in count_matrix.items()]
+                     for function, count_matrix in count_dict.items()}
+        with self.connection:
+            self.connection.execute(
+                'INSERT OR REPLACE INTO count_matrices VALUES (?, ?, ?)',
+                (filename, key, pickle.dumps(variables)))
+
+
 def get_count_matrices(count_vector_creator,
                        filenames,
                        progress_callback,
                        base_path,
-                       extra_include_paths):
+                       extra_include_paths,
+                       cache=None):
     """
     Retrieves matrices holding count vectors for all variables for all
     functions in the given file.
@@ -52,6 +148,8 @@ def get_count_matrices(count_vector_creator,
                                  called after processing each file with the
                                  progress percentage (float) as an argument.
     :param extra_include_paths:  A list containing additional include paths.
+    :param cache:                An optional ``CountMatrixCache`` to take the
+                                 count vectors of unchanged files from.
     :return:                     A dict holding a tuple of (file, line,
                                  function) as key and as value a dict with
                                  variable names as key and count vector
@@ -64,8 +162,16 @@ def get_count_matrices(count_vector_creator,
 
     for i, filename in enumerate(filenames):
         progress_callback(100*(i/maxlen))
-        count_dict = count_vector_creator.get_vectors_for_file(filename,
-                                                               include_paths)
+        count_dict = None
+        if cache is not None:
+            key = cache.get_key(filename, include_paths, count_vector_creator)
+            count_dict = cache.get(filename, key, count_vector_creator)
+        if count_dict is None:
+            count_dict = count_vector_creator.get_vectors_for_file(
+                filename, include_paths)
+            if cache is not None:
+                cache.set(filename, key, count_dict)
+
         for function in count_dict:
             if not exclude_function(count_dict[function]):
                 result[(filename,
@@ -163,6 +269,174 @@ def get_difference(matching_iterator,
     return difference
 
 
+def get_count_array(count_matrix):
+    """
+    Converts a count matrix into an array to compare it with others.
+
+    :param count_matrix: A dictionary with count vectors representing all
+                         variables for a function.
+    :return:             A two dimensional numpy array holding one row with
+                         the (weighted) counts of each variable.
+    """
+    # numpy and scipy are imported where they are used, so collecting bears
+    # doesn't load them.
+    import numpy
+
+    return numpy.array([list(count_vector)
+                        for count_vector in count_matrix.values()],
+                       dtype=float)
+
+
+def compare_count_arrays(array1,
+                         array2,
+                         average_calculation=False,
+                         poly_postprocessing=True,
+                         exp_postprocessing=False):
+    """
+    Compares the functions represented by the given count arrays.
+
+    The differences between all pairs of variables are calculated at once.
+    The smaller array is padded with zeroed rows like ``pad_count_vectors``
+    does, so this yields the same values as comparing the count matrices
+    themselves.
+
+    :param array1:              Count array (see ``get_count_array``) for the
+                                first function.
+    :param array2:              Count array for the second function.
+    :param average_calculation: If set to true the difference calculation
+                                function will take the average of all variable
+                                differences as the difference, else it will
+                                normalize the function as a whole and thus
+                                weighting in variables dependent on their size.
+    :param poly_postprocessing: If set to true, the difference value of big
+                                function pairs will be reduced using a
+                                polynomial approach.
+    :param exp_postprocessing:  If set to true, the difference value of big
+                                function pairs will be reduced using an
+                                exponential approach.
+    :return:                    The difference between these functions, 0 is
+                                identical and 1 is not similar at all.
+    """
+    import numpy
+    from scipy.optimize import linear_sum_assignment
+
+    assert 0 not in (len(array1), len(array2))
+
+    if len(array1) < len(array2):
+        array1, array2 = array2, array1
+    if len(array1) != len(array2):
+        array2 = numpy.concatenate(
+            (array2, numpy.zeros((len(array1) - len(array2),
+                                  array2.shape[1]))))
+
+    rows = array1[:, numpy.newaxis, :]
+    columns = array2[numpy.newaxis, :, :]
+    differences = numpy.sqrt(numpy.square(rows - columns).sum(axis=2))
+    maxabs = numpy.sqrt(numpy.square(numpy.maximum(rows, columns))
+                        .sum(axis=2))
+
+    # The cost matrix holds the relative difference between the variables i
+    # and j in the i/j field, see compare_functions.
+    cost_matrix = numpy.ones_like(differences)
+    numpy.divide(differences, maxabs, out=cost_matrix, where=maxabs != 0)
+
+    matching = linear_sum_assignment(cost_matrix)
+
+    return get_difference(list(zip(differences[matching].tolist(),
+                                   maxabs[matching].tolist())),
+                          average_calculation,
+                          poly_postprocessing,
+                          exp_postprocessing)
+
+
+def get_function_size(count_array, average_calculation=False):
+    """
+    Retrieves a size of the function represented by the given count array
+    that bounds its difference to other functions, see
+    ``get_clone_candidates``.
+
+    :param count_array:         A count array, see ``get_count_array``.
+    :param average_calculation: Whether the difference is calculated as the
+                                average of all variable differences.
+    :return:                    The number of variables if
+                                ``average_calculation`` is set, else the sum
+                                of the absolute values of all count vectors.
+    """
+    import numpy
+
+    if average_calculation:
+        return len(count_array)
+    return float(numpy.sqrt(numpy.square(count_array).sum(axis=1)).sum())
+
+
+def get_clone_candidates(sizes,
+                         max_difference,
+                         average_calculation=False,
+                         poly_postprocessing=True,
+                         exp_postprocessing=False):
+    """
+    Finds all pairs of functions whose difference may be smaller than
+    ``max_difference``, using only their sizes (see ``get_function_size``).
+    The counts must not be negative.
+
+    Every matching pairs the (zero padded) count vectors of both functions,
+    so for sizes ``a <= b``:
+
+    - The average of the relative variable differences is at least
+      ``(b - a) / b`` as every padding vector adds a relative difference of
+      1.
+    - The sum of the absolute differences is at least ``b - a`` and the sum
+      of the norms is at most ``a + b``, so the difference is at least
+      ``(b - a) / (a + b)``.
+
+    The postprocessing reduces the difference by a factor of at most 0.75
+    each.
+
+    >>> get_clone_candidates([10, 1, 11, 0.7], 0.2)
+    [[2], [3], [], []]
+    >>> get_clone_candidates([2, 3, 4], 0.4, average_calculation=True,
+    ...                      poly_postprocessing=False)
+    [[1], [2], []]
+
+    :param sizes:               A list holding the size of every function.
+    :param max_difference:      Pairs of functions that certainly differ by at
+                                least this value are left out.
+    :param average_calculation: Whether the difference is calculated as the
+                                average of all variable differences.
+    :param poly_postprocessing: Whether the difference is reduced using a
+                                polynomial approach.
+    :param exp_postprocessing:  Whether the difference is reduced using an
+                                exponential approach.
+    :return:                    A list holding for every function the sorted
+                                indices of the following functions it may be
+                                a clone of.
+    """
+    factor = ((0.75 if poly_postprocessing else 1) *
+              (0.75 if exp_postprocessing else 1))
+    if max_difference >= factor:
+        return [list(range(index + 1, len(sizes)))
+                for index in range(len(sizes))]
+
+    bound = max_difference / factor
+    if average_calculation:
+        max_ratio = 1 / (1 - bound)
+    else:
+        max_ratio = (1 + bound) / (1 - bound)
+    # Leave some room for rounding errors
+    max_ratio *= 1 + 1e-9
+
+    order = sorted(range(len(sizes)), key=sizes.__getitem__)
+    sorted_sizes = [sizes[index] for index in order]
+    candidates = []
+    for index, size in enumerate(sizes):
+        first = bisect_left(sorted_sizes, size / max_ratio)
+        last = bisect_right(sorted_sizes, size * max_ratio)
+        candidates.append(sorted(other for other in order[first:last]
+                                 if other > index))
+
+    return candidates
+
+
 def compare_functions(cm1,
                       cm2,
                       average_calculation=False,
@@ -175,6 +449,9 @@ def compare_functions(cm1,
     clones at the same difference value than big functions which may provide a
     better refactoring opportunity for the user.
 
+    When comparing many functions, convert the count matrices once with
+    ``get_count_array`` and use ``compare_count_arrays`` instead.
+
     :param cm1:                 Count vector dict for the first function.
     :param cm2:                 Count vector dict for the second function.
     :param average_calculation: If set to true the difference calculation
@@ -191,32 +468,8 @@ def compare_functions(cm1,
     :return:                    The difference between these functions, 0 is
                                 identical and 1 is not similar at all.
     """
-    assert 0 not in (len(cm1), len(cm2))
-
-    cm1, cm2 = pad_count_vectors(cm1, cm2)
-
-    diff_table = [(cv1,
-                   [(cv2, cv1.difference(cv2), cv1.maxabs(cv2))
-                    for cv2 in cm2.values()])
-                  for cv1 in cm1.values()]
-
-    # The cost matrix holds the difference between the two variables i and
-    # j in the i/j field. This is a representation of a bipartite weighted
-    # graph with nodes representing the first function on the one side
-    # (rows) and the nodes representing the second function on the other
-    #  side (columns). The fields in the matrix are the weighted nodes
-    # connecting each element from one side to the other.
-    cost_matrix = [[relative_difference(difference, maxabs)
-                    for cv2, difference, maxabs in lst]
-                   for cv1, lst in diff_table]
-
-    # The munkres algorithm will calculate a matching such that the sum of
-    # the taken fields is minimal. It thus will associate each variable
-    # from one function to one on the other function.
-    matching = munkres.compute(cost_matrix)
-
-    return get_difference([(diff_table[x][1][y][1], diff_table[x][1][y][2])
-                           for x, y in matching],
-                          average_calculation,
-                          poly_postprocessing,
-                          exp_postprocessing)
+    return compare_count_arrays(get_count_array(cm1),
+                                get_count_array(cm2),
+                                average_calculation,
+                                poly_postprocessing,
+                                exp_postprocessing)
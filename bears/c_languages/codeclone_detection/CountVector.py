@@ -55,7 +55,19 @@ class CountVector:
 
         Any arguments or kwarguments will be passed to all conditions.
         """
-        for i in range(len(self.conditions)):
+        self.count_reference_for(range(len(self.conditions)), *args, **kwargs)
+
+    def count_reference_for(self, condition_indices, *args, **kwargs):
+        """
+        Counts the reference to the variable under some of the conditions held
+        in this object. Conditions that are known to be false may be left
+        out this way.
+
+        Any arguments or kwarguments will be passed to the conditions.
+
+        :param condition_indices: The indices of the conditions to check.
+        """
+        for i in condition_indices:
             if self.conditions[i](*args, **kwargs):
                 self.count_vector[i] += self.weightings[i]
                 self.unweighted[i] += 1
@@ -1,10 +1,14 @@
+import os
+import re
+from bisect import bisect_right
+from functools import lru_cache
+from itertools import accumulate
+
 from coalib.bearlib.languages.LanguageDefinition import LanguageDefinition
 from coalib.bears.LocalBear import LocalBear
 from coalib.results.HiddenResult import HiddenResult
 from coalib.results.Result import Result, RESULT_SEVERITY
 from coalib.results.SourceRange import SourceRange
-from coalib.results.AbsolutePosition import AbsolutePosition
-from coala_utils.string_processing.Core import unescaped_search_for
 
 
 class AnnotationBear(LocalBear):
@@ -31,28 +35,17 @@ class AnnotationBear(LocalBear):
             ``u"string"``, the ``u`` will not be in the source range).
         """
         try:
-            lang_dict = LanguageDefinition(language, coalang_dir=coalang_dir)
+            lang_dict = get_language_definition(language, coalang_dir)
         except FileNotFoundError:
             content = ('coalang specification for ' + language +
                        ' not found.')
             yield HiddenResult(self, content)
             return
 
-        string_delimiters = dict(lang_dict['string_delimiters'])
-        multiline_string_delimiters = dict(
-            lang_dict['multiline_string_delimiters'])
-        multiline_comment_delimiters = dict(
-            lang_dict['multiline_comment_delimiters'])
-        comment_delimiter = dict(lang_dict['comment_delimiters'])
         string_ranges = comment_ranges = ()
         try:
-            string_ranges, comment_ranges = self.find_annotation_ranges(
-                file,
-                filename,
-                string_delimiters,
-                multiline_string_delimiters,
-                comment_delimiter,
-                multiline_comment_delimiters)
+            string_ranges, comment_ranges = lang_dict.annotation_scanner.scan(
+                file, filename)
 
         except NoCloseError as e:
             yield Result(self, str(e), severity=RESULT_SEVERITY.MAJOR,
@@ -71,6 +64,9 @@ class AnnotationBear(LocalBear):
         """
         Finds ranges of all annotations.
 
+        The delimiters are compiled into an ``AnnotationScanner`` which is
+        cached, so the compilation only happens once per set of delimiters.
+
         :param file:
             A tuple of strings, with each string being a line in the file.
         :param filename:
@@ -91,215 +87,286 @@ class AnnotationBear(LocalBear):
             Two tuples first containing a tuple of strings, the second a tuple
             of comments.
         """
-        text = ''.join(file)
-        strings_range = []
-        comments_range = []
-        position = 0
-        while position <= len(text):
-
-            def get_new_position():
-                _range, end_position = self.get_range_end_position(
-                    file,
-                    filename,
-                    text,
-                    multiline_string_delimiters,
-                    position,
-                    self.get_multiline)
-                if end_position and _range:
-                    strings_range.append(_range)
-                    return end_position + 1
-
-                _range, end_position = self.get_range_end_position(
-                    file,
-                    filename,
-                    text,
-                    string_delimiters,
-                    position,
-                    self.get_singleline_strings)
-                if end_position and _range:
-                    strings_range.append(_range)
-                    return end_position + 1
-
-                _range, end_position = self.get_range_end_position(
-                    file,
-                    filename,
-                    text,
-                    multiline_comment_delimiters,
-                    position,
-                    self.get_multiline)
-                if end_position and _range:
-                    comments_range.append(_range)
-                    return end_position + 1
-
-                _range, end_position = self.get_range_end_position(
-                    file,
-                    filename,
-                    text,
-                    comment_delimiter,
-                    position,
-                    self.get_singleline_comment,
-                    single_comment=True)
-                if end_position and _range:
-                    comments_range.append(_range)
-                    return end_position + 1
-
-                return position + 1
-
-            position = get_new_position()
-
-        return tuple(strings_range), tuple(comments_range)
-
-    @staticmethod
-    def get_range_end_position(file,
-                               filename,
-                               text,
-                               annotations,
-                               position,
-                               func,
-                               single_comment=False):
-        _range = end_position = None
-        for annotation in annotations.keys():
-            if text[position:].startswith(annotation):
-                if not single_comment:
-                    ret_val = func(file,
-                                   filename,
-                                   text,
-                                   annotation,
-                                   annotations[annotation],
-                                   position)
-                else:
-                    ret_val = func(file,
-                                   filename,
-                                   text,
-                                   annotation,
-                                   position)
-                if ret_val:
-                    _range, end_position = ret_val[0], ret_val[1]
-
-        return _range, end_position
-
-    @staticmethod
-    def get_multiline(file,
-                      filename,
-                      text,
-                      annotation_start,
-                      annotation_end,
-                      position):
-        """
-        Gets sourcerange and end position of an annotation that can span
-        multiple lines.
+        scanner = get_annotation_scanner(
+            tuple(string_delimiters.items()),
+            tuple(multiline_string_delimiters.items()),
+            tuple(comment_delimiter.items()),
+            tuple(multiline_comment_delimiters.items()))
+        return scanner.scan(file, filename)
 
-        :param file:
-            A tuple of strings, with each string being a line in the file.
-        :param filename:
-            The name of the file.
-        :param annotation_start:
-            The string specifying the start of the annotation.
-        :param annotation_end:
-            The string specifying the end of the annotation.
-        :param position:
-            An integer identifying the position where the annotation started.
-        :return:
-            A SourceRange object holding the range of the multi-line annotation
-            and the end_position of the annotation as an integer.
+
+class AnnotationScanner:
+    """
+    Finds all strings and comments of a file in a single pass.
+
+    All annotation start delimiters are compiled into one alternation regex,
+    which is used to jump straight to the next position where an annotation
+    may start instead of probing every delimiter at every position.
+
+    >>> scanner = AnnotationScanner(string_delimiters=(('"', '"'),),
+    ...                             comment_delimiters=(('#', ''),))
+    >>> strings, comments = scanner.scan(['a = "#" # comment\\n'], 'F')
+    >>> strings[0].start.column, strings[0].end.column
+    (5, 7)
+    >>> comments[0].start.column, comments[0].end.column
+    (9, 18)
+    """
+
+    def __init__(self,
+                 string_delimiters=(),
+                 multiline_string_delimiters=(),
+                 comment_delimiters=(),
+                 multiline_comment_delimiters=()):
         """
-        end_end = get_end_position(annotation_end,
-                                   text,
-                                   position + len(annotation_start) - 1)
-        if end_end == -1:
-            _range = SourceRange.from_absolute_position(
-                filename,
-                AbsolutePosition(file, position))
-            raise NoCloseError(annotation_start, _range)
-
-        return (SourceRange.from_absolute_position(
-                    filename,
-                    AbsolutePosition(file, position),
-                    AbsolutePosition(file, end_end)),
-                end_end)
-
-    @staticmethod
-    def get_singleline_strings(file,
-                               filename,
-                               text,
-                               string_start,
-                               string_end,
-                               position):
+        :param string_delimiters:
+            A tuple of ``(start, end)`` pairs defining single-line strings.
+        :param multiline_string_delimiters:
+            A tuple of ``(start, end)`` pairs defining multi-line strings.
+        :param comment_delimiters:
+            A tuple of ``(start, end)`` pairs defining single-line comments,
+            the end is ignored as these comments end with the line.
+        :param multiline_comment_delimiters:
+            A tuple of ``(start, end)`` pairs defining multi-line comments.
         """
-        Gets sourcerange of a single-line string and its end position.
+        # At each position the kinds are tried in this order and the first
+        # one yielding a range wins.
+        self.kinds = ((multiline_string_delimiters, get_multiline_end, False),
+                      (string_delimiters, get_singleline_string_end, False),
+                      (multiline_comment_delimiters, get_multiline_end, True),
+                      (comment_delimiters, get_singleline_comment_end, True))
 
-        :param file:
-            A tuple of strings, with each string being a line in the file.
-        :param filename:
-            The name of the file.
-        :param string_start:
-            The string which specifies how a string starts.
-        :param string_end:
-            The string which specifies how a string ends.
-        :position:
-            An integer identifying the position where the string started.
-        :return:
-            A SourceRange object identifying the range of the single-line
-            string and the end_position of the string as an integer.
-        """
-        end_position = get_end_position(string_end,
-                                        text,
-                                        position + len(string_start) - 1)
-        newline = get_end_position('\n', text, position)
-        if newline == -1:
-            newline = len(text)
-        if end_position == -1:
-            _range = SourceRange.from_absolute_position(
-                filename,
-                AbsolutePosition(file, position))
-            raise NoCloseError(string_start, _range)
-        if newline > end_position:
-            return (SourceRange.from_absolute_position(
-                        filename,
-                        AbsolutePosition(file, position),
-                        AbsolutePosition(file, end_position)),
-                    end_position)
+        starts = sorted({start
+                         for delimiters, _, _ in self.kinds
+                         for start, _ in delimiters})
+        self.start_regex = (re.compile('|'.join(map(re.escape, starts)))
+                            if starts else None)
 
-    @staticmethod
-    def get_singleline_comment(file, filename, text, comment, position):
+    def scan(self, file, filename):
         """
-        Gets Sourcerange of a single-line comment where the start is the
-        start of comment and the end is the end of line.
+        Finds ranges of all annotations in the given file.
 
         :param file:
             A tuple of strings, with each string being a line in the file.
         :param filename:
             The name of the file.
-        :param comment:
-            The string which specifies the comment.
-        :position:
-            An integer identifying the position where the string started.
+        :raises NoCloseError:
+            If an annotation is opened but never closed.
         :return:
-            A SourceRange object identifying the range of the single-line
-            comment and the end_position of the comment as an integer.
+            Two tuples first containing a tuple of strings, the second a tuple
+            of comments.
         """
-        end_position = get_end_position('\n',
-                                        text,
-                                        position + len(comment) - 1)
-        if end_position == -1:
-            end_position = len(text) - 1
-        return (SourceRange.from_absolute_position(
-                    filename,
-                    AbsolutePosition(file, position),
-                    AbsolutePosition(file, end_position)),
-                end_position)
+        text = ''.join(file)
+        line_starts = [0]
+        line_starts.extend(accumulate(map(len, file)))
 
+        def to_line_column(position):
+            line = bisect_right(line_starts, position)
+            return line, position - line_starts[line - 1] + 1
 
-def get_end_position(end_marker, text, position):
-    try:
-        end_match = next(unescaped_search_for(end_marker, text[position + 1:]))
-        end_position = position + end_match.span()[1]
-    except StopIteration:
-        end_position = -1
+        ranges = ([], [])
+        position = 0
+        while self.start_regex:
+            match = self.start_regex.search(text, position)
+            if match is None:
+                break
+            position = match.start()
+
+            for delimiters, get_end, is_comment in self.kinds:
+                end_position = None
+                for start, end in delimiters:
+                    if not text.startswith(start, position):
+                        continue
+
+                    found_end = get_end(text, start, end, position)
+                    if found_end == -1:
+                        raise NoCloseError(
+                            start,
+                            SourceRange.from_values(
+                                filename, *to_line_column(position)))
+                    if found_end is not None:
+                        end_position = found_end
+
+                if end_position:
+                    ranges[is_comment].append(SourceRange.from_values(
+                        filename,
+                        *(to_line_column(position) +
+                          to_line_column(end_position))))
+                    position = end_position + 1
+                    break
+            else:
+                position += 1
+
+        return tuple(ranges[False]), tuple(ranges[True])
 
+
+class CompiledLanguageDefinition:
+    """
+    Wraps a ``LanguageDefinition`` and keeps its delimiters converted to
+    dictionaries and compiled into an ``AnnotationScanner``.
+
+    Items which are not precomputed are looked up in the wrapped definition:
+
+    >>> python = CompiledLanguageDefinition(LanguageDefinition('python'))
+    >>> python.string_delimiters == {'"': '"', "'": "'"}
+    True
+    >>> dict(python['encapsulators'])['(']
+    ')'
+    """
+
+    def __init__(self, language_definition):
+        self.language_definition = language_definition
+        self.string_delimiters = dict(
+            language_definition['string_delimiters'])
+        self.multiline_string_delimiters = dict(
+            language_definition['multiline_string_delimiters'])
+        self.comment_delimiters = dict(
+            language_definition['comment_delimiters'])
+        self.multiline_comment_delimiters = dict(
+            language_definition['multiline_comment_delimiters'])
+        self.annotation_scanner = get_annotation_scanner(
+            tuple(self.string_delimiters.items()),
+            tuple(self.multiline_string_delimiters.items()),
+            tuple(self.comment_delimiters.items()),
+            tuple(self.multiline_comment_delimiters.items()))
+
+    def __getitem__(self, item):
+        return self.language_definition[item]
+
+    def __contains__(self, item):
+        return item in self.language_definition
+
+
+def get_language_definition(language, coalang_dir=None):
+    """
+    Returns the ``CompiledLanguageDefinition`` of a language.
+
+    The definitions are kept in a process-wide LRU cache, so they are only
+    parsed once and not once per file. The cache is keyed by the language,
+    the coalang directory and the modification time of the coalang file in
+    it, so edited custom coalang files are picked up. Use
+    ``language_definition_cache_info`` to get the hit and miss counters.
+
+    :param language:
+        The programming language, e.g. ``Python 3``.
+    :param coalang_dir:
+        External directory for coalang file.
+    :raises FileNotFoundError:
+        If there is no definition for the language.
+    """
+    coalang_mtime = None
+    if coalang_dir:
+        try:
+            coalang_mtime = os.path.getmtime(
+                os.path.join(coalang_dir, language.lower() + '.coalang'))
+        except OSError:
+            pass
+
+    return _load_language_definition(language, coalang_dir, coalang_mtime)
+
+
+@lru_cache(maxsize=32)
+def _load_language_definition(language, coalang_dir, coalang_mtime):
+    return CompiledLanguageDefinition(
+        LanguageDefinition(language, coalang_dir=coalang_dir))
+
+
+def language_definition_cache_info():
+    """
+    Returns the hits, misses, maximum size and current size of the cache
+    used by ``get_language_definition`` as a named tuple.
+    """
+    return _load_language_definition.cache_info()
+
+
+@lru_cache(maxsize=64)
+def get_annotation_scanner(string_delimiters,
+                           multiline_string_delimiters,
+                           comment_delimiters,
+                           multiline_comment_delimiters):
+    """
+    Returns a cached ``AnnotationScanner`` for the given delimiters, which
+    have to be passed as tuples of ``(start, end)`` pairs.
+    """
+    return AnnotationScanner(string_delimiters,
+                             multiline_string_delimiters,
+                             comment_delimiters,
+                             multiline_comment_delimiters)
+
+
+def get_multiline_end(text, annotation_start, annotation_end, position):
+    """
+    Gets the end position of an annotation that can span multiple lines.
+
+    :return:
+        The position of the last character of the annotation or -1 if it is
+        not closed.
+    """
+    return get_end_position(annotation_end,
+                            text,
+                            position + len(annotation_start) - 1)
+
+
+def get_singleline_string_end(text, string_start, string_end, position):
+    """
+    Gets the end position of a single-line string.
+
+    :return:
+        The position of the last character of the string, -1 if it is not
+        closed at all or None if it is only closed after the end of the line.
+    """
+    end_position = get_end_position(string_end,
+                                    text,
+                                    position + len(string_start) - 1)
+    if end_position == -1:
+        return -1
+
+    newline = get_end_position('\n', text, position)
+    if newline == -1 or newline > end_position:
+        return end_position
+
+
+def get_singleline_comment_end(text, comment, _, position):
+    """
+    Gets the end position of a single-line comment, which is the end of the
+    line.
+    """
+    end_position = get_end_position('\n',
+                                    text,
+                                    position + len(comment) - 1)
+    if end_position == -1:
+        end_position = len(text) - 1
     return end_position
 
 
+@lru_cache(maxsize=None)
+def _compile_marker(marker):
+    return re.compile(re.escape(marker))
+
+
+def get_end_position(end_marker, text, position):
+    r"""
+    Finds the first unescaped occurrence of ``end_marker`` after ``position``.
+    Backslashes at or before ``position`` are not taken into account.
+
+    >>> get_end_position("'", "'I\\'ll'", 0)
+    6
+    >>> get_end_position('"', "'I\\'ll'", 0)
+    -1
+
+    :return:
+        The position of the last character of the marker or -1 if it cannot
+        be found.
+    """
+    for match in _compile_marker(end_marker).finditer(text, position + 1):
+        escape_start = match.start()
+        while escape_start > position + 1 and text[escape_start - 1] == '\\':
+            escape_start -= 1
+        if (match.start() - escape_start) % 2 == 0:
+            return match.end() - 1
+
+    return -1
+
+
 class NoCloseError(Exception):
 
     def __init__(self, annotation, code):
@@ -1,8 +1,240 @@
-import itertools
+import hashlib
+from collections import defaultdict
+from itertools import combinations
 
 from coalib.bears.GlobalBear import GlobalBear
 from coalib.results.Result import Result
 from coalib.results.RESULT_SEVERITY import RESULT_SEVERITY
+from coalib.results.SourceRange import SourceRange
+
+
+def get_hash(text):
+    """
+    Hashes the given text. Unlike ``hash()``, the result is the same in every
+    process, so the results of the bear don't change between runs.
+
+    >>> get_hash('a\\n') == get_hash('a\\n')
+    True
+    >>> get_hash('a\\n') < 1 << 64
+    True
+
+    :param text: The text to hash.
+    :return:     A 64 bit hash.
+    """
+    digest = hashlib.sha1(text.encode('utf-8', 'surrogatepass')).digest()
+    return int.from_bytes(digest[:8], 'big')
+
+
+def get_duplicate_groups(file_dict):
+    """
+    Finds groups of files with identical contents.
+
+    Only files with the same number of lines and characters are hashed, and
+    only files with the same hash are compared, so the work is linear in the
+    total size of the files.
+
+    >>> get_duplicate_groups({'a': ('x\\n',), 'b': ('y\\n',), 'c': ('x\\n',)})
+    [['a', 'c']]
+
+    :param file_dict:
+        A dictionary mapping file names to their contents as tuple of lines.
+    :return:
+        A list of groups of identical files, each holding at least two file
+        names in the order of ``file_dict``. The groups are ordered by their
+        first file.
+    """
+    files_by_size = defaultdict(list)
+    for filename, lines in file_dict.items():
+        files_by_size[len(lines), sum(map(len, lines))].append(filename)
+
+    groups = []
+    for same_size_files in files_by_size.values():
+        if len(same_size_files) < 2:
+            continue
+
+        files_by_hash = defaultdict(list)
+        for filename in same_size_files:
+            files_by_hash[get_hash(''.join(file_dict[filename]))].append(
+                filename)
+
+        for candidates in files_by_hash.values():
+            # Files with different contents may share a hash.
+            while len(candidates) > 1:
+                contents = file_dict[candidates[0]]
+                group = [filename for filename in candidates
+                         if file_dict[filename] == contents]
+                if len(group) > 1:
+                    groups.append(group)
+                candidates = [filename for filename in candidates
+                              if file_dict[filename] != contents]
+
+    file_index = {filename: index
+                  for index, filename in enumerate(file_dict)}
+    return sorted(groups, key=lambda group: file_index[group[0]])
+
+
+SHINGLE_SIZE = 3
+SIGNATURE_SIZE = 64
+
+
+def get_shingles(lines, shingle_size=SHINGLE_SIZE):
+    """
+    Hashes every run of ``shingle_size`` consecutive non blank lines of a
+    file. Leading and trailing whitespace is ignored.
+
+    >>> len(get_shingles(('a\\n', 'b\\n', '\\n', 'c\\n', 'd\\n'), 2))
+    3
+    >>> len(get_shingles(('a\\n',), 2))
+    1
+    >>> get_shingles(('  \\n',), 2)
+    set()
+
+    :param lines:        The lines of the file.
+    :param shingle_size: The number of lines per shingle.
+    :return:             A set of 64 bit shingle hashes.
+    """
+    stripped = [line.strip() for line in lines]
+    stripped = [line for line in stripped if line]
+    if not stripped:
+        return set()
+
+    # The stripped lines don't contain line breaks, so joining them with one
+    # keeps shingles with different lines apart.
+    return {get_hash('\n'.join(stripped[index:index + shingle_size]))
+            for index in range(max(1, len(stripped) - shingle_size + 1))}
+
+
+def get_minhash_signature(shingles):
+    """
+    Computes the MinHash signature of a nonempty set of shingle hashes.
+
+    Instead of hashing every shingle once per signature entry, the hashes are
+    spread over ``SIGNATURE_SIZE`` bins and the minimum of every bin is kept
+    (one permutation hashing). Empty bins borrow the minimum of the next
+    nonempty bin, so two sets still share a signature entry with a probability
+    close to their Jaccard similarity.
+
+    >>> signature = get_minhash_signature({0, 65})
+    >>> signature[:2]
+    (0, 1)
+    >>> signature[-1] == signature[0] + (1 << 64)
+    True
+
+    :param shingles: A nonempty set of 64 bit hashes.
+    :return:         A tuple of ``SIGNATURE_SIZE`` integers.
+    """
+    empty = 1 << 64
+    bins = [empty] * SIGNATURE_SIZE
+    for shingle in shingles:
+        index = shingle % SIGNATURE_SIZE
+        value = shingle // SIGNATURE_SIZE
+        if value < bins[index]:
+            bins[index] = value
+
+    # Walking backwards around the bins twice finds the closest nonempty
+    # successor of every empty bin, the first round only determines the
+    # successors of the last bins. The distance is added so borrowed values
+    # differ from the original ones.
+    signature = list(bins)
+    distance = 0
+    for index in reversed(range(-SIGNATURE_SIZE, SIGNATURE_SIZE)):
+        if bins[index] < empty:
+            successor = bins[index]
+            distance = 0
+        else:
+            distance += 1
+            if index < 0:
+                signature[index] = successor + distance * empty
+
+    return tuple(signature)
+
+
+def get_lsh_band_size(similarity_threshold,
+                      signature_size=SIGNATURE_SIZE,
+                      detection_probability=0.99):
+    """
+    Chooses how many signature entries form one locality-sensitive hashing
+    band.
+
+    Two files become candidates if all entries of at least one band match.
+    The largest band size that still makes files with exactly the threshold
+    similarity candidates with a probability of ``detection_probability`` is
+    used, so few candidates are compared while similar files are rarely
+    missed.
+
+    >>> get_lsh_band_size(0.8)
+    4
+    >>> get_lsh_band_size(0.1)
+    1
+
+    :param similarity_threshold: The minimal similarity to detect.
+    :param signature_size:     The length of the signatures.
+    :param detection_probability:
+        The minimal probability to detect a pair of files at the threshold.
+    :return:                     The number of rows per band.
+    """
+    band_size = 1
+    for rows in range(1, signature_size + 1):
+        bands = signature_size // rows
+        if (not signature_size % rows and
+                1 - (1 - similarity_threshold ** rows) ** bands >=
+                detection_probability):
+            band_size = rows
+    return band_size
+
+
+def get_similar_pairs(file_dict, similarity_threshold):
+    """
+    Finds pairs of files whose contents are similar to each other.
+
+    The similarity is the Jaccard similarity of the files' shingles (see
+    ``get_shingles``). Only pairs that share a band of their MinHash
+    signatures are compared, so the work grows roughly linearly with the
+    number of files instead of quadratically.
+
+    >>> get_similar_pairs({'a': ('v\\n', 'w\\n', 'x\\n', 'y\\n', 'z\\n'),
+    ...                    'b': ('v\\n', 'w\\n', 'x\\n', 'y\\n', 'a\\n'),
+    ...                    'c': ('u\\n',)}, 0.4)
+    [('a', 'b', 0.5)]
+
+    :param file_dict:
+        A dictionary mapping file names to their contents as tuple of lines.
+    :param similarity_threshold:
+        The minimal Jaccard similarity of reported pairs.
+    :return:
+        A list of ``(first_file, second_file, similarity)`` tuples, ordered
+        by the files' order in ``file_dict``.
+    """
+    shingles = {}
+    for filename, lines in file_dict.items():
+        file_shingles = get_shingles(lines)
+        if file_shingles:
+            shingles[filename] = file_shingles
+
+    band_size = get_lsh_band_size(similarity_threshold)
+    buckets = defaultdict(list)
+    for filename, file_shingles in shingles.items():
+        signature = get_minhash_signature(file_shingles)
+        for band in range(0, SIGNATURE_SIZE, band_size):
+            buckets[band, signature[band:band + band_size]].append(filename)
+
+    file_index = {filename: index
+                  for index, filename in enumerate(file_dict)}
+    candidates = set()
+    for bucket in buckets.values():
+        candidates.update(combinations(bucket, 2))
+
+    pairs = []
+    for first, second in candidates:
+        first_shingles, second_shingles = shingles[first], shingles[second]
+        common = len(first_shingles & second_shingles)
+        similarity = common / (len(first_shingles) + len(second_shingles) -
+                               common)
+        if similarity >= similarity_threshold:
+            pairs.append((first, second, similarity))
+
+    return sorted(pairs, key=lambda pair: (file_index[pair[0]],
+                                           file_index[pair[1]]))
 
 
 class DuplicateFileBear(GlobalBear):
@@ -12,9 +244,15 @@ class DuplicateFileBear(GlobalBear):
     LICENSE = 'AGPL-3.0'
     CAN_DETECT = {'Duplication'}
 
-    def run(self):
+    def run(self, similarity_threshold: float = 1):
         """
         Checks for Duplicate Files
+
+        :param similarity_threshold:
+            Also reports files whose contents are at least this similar, as a
+            number between 0 and 1. The similarity is measured on runs of
+            consecutive lines, ignoring whitespace and blank lines. By default
+            only identical files are reported.
         """
         if not self.file_dict:
             yield Result(self, 'You did not add any file to compare',
@@ -22,17 +260,41 @@ class DuplicateFileBear(GlobalBear):
         elif len(self.file_dict) == 1:
             yield Result(self, 'You included only one file',
                          severity=RESULT_SEVERITY.MAJOR)
+        elif not 0 < similarity_threshold <= 1:
+            self.err('The similarity threshold must be greater than 0 and '
+                     'at most 1.')
         else:
-            unique_tuples = [file_tuple for file_tuple in
-                             itertools.combinations(self.file_dict, 2)]
-
-            for file_pair in unique_tuples:
-                if (self.file_dict[file_pair[0]] ==
-                        self.file_dict[file_pair[1]]):
-                    first_file_name = file_pair[0]
-                    second_file_name = file_pair[1]
-                    message = ('File ' + first_file_name + ' is identical'
-                               ' to File ' + second_file_name)
-                    yield Result.from_values(origin=self, message=message,
-                                             severity=RESULT_SEVERITY.INFO,
-                                             file=first_file_name)
+            duplicate_groups = get_duplicate_groups(self.file_dict)
+            for first_file_name, *other_file_names in duplicate_groups:
+                message = ('File ' + first_file_name + ' is identical'
+                           ' to ' + ', '.join('File ' + file_name
+                                              for file_name
+                                              in other_file_names))
+                yield Result(self, message,
+                             severity=RESULT_SEVERITY.INFO,
+                             affected_code=[
+                                 SourceRange.from_values(file_name)
+                                 for file_name in [first_file_name] +
+                                 other_file_names])
+
+            if similarity_threshold < 1:
+                # Only the first file of every group of identical files is
+                # compared, their copies would yield the same results.
+                copies = {file_name
+                          for _, *other_file_names in duplicate_groups
+                          for file_name in other_file_names}
+                distinct_files = {file_name: lines
+                                  for file_name, lines
+                                  in self.file_dict.items()
+                                  if file_name not in copies}
+                for first_file_name, second_file_name, similarity in (
+                        get_similar_pairs(distinct_files,
+                                          similarity_threshold)):
+                    yield Result(
+                        self,
+                        'File {} is {:.0%} similar to File {}'.format(
+                            first_file_name, similarity, second_file_name),
+                        severity=RESULT_SEVERITY.INFO,
+                        affected_code=[
+                            SourceRange.from_values(first_file_name),
+                            SourceRange.from_values(second_file_name)])
@@ -31,6 +31,9 @@ class HTTPSBear(LocalBear):
         An https link is considered valid if the server responds with a 2xx
         code.
 
+        Enable the ``probe_https`` setting of the URLHeadBear to request the
+        https links together with all other links.
+
         Warning: This bear will make HEAD requests to all URLs mentioned in
         your codebase, which can potentially be destructive. As an example,
         this bear would naively just visit the URL from a line that goes like
@@ -46,23 +49,29 @@ class HTTPSBear(LocalBear):
                                       in the dict will be the value of the key
                                       '*'.
         """
-        for result in dependency_results.get(URLHeadBear.name, []):
-            line_number, link, code, context = result.contents
-            if link.startswith(self.HTTPS_PREFIX):
-                continue
+        results = [result
+                   for result in dependency_results.get(URLHeadBear.name, [])
+                   if not result.link.startswith(self.HTTPS_PREFIX)]
 
-            https_link = self.HTTPS_PREFIX + link[len(self.HTTP_PREFIX):]
-            host = urlparse(https_link).netloc
-            network_timeout = {
-                urlparse(url).netloc if not url == '*' else '*': timeout
-                for url, timeout in network_timeout.items()}
-            https_response = URLHeadBear.get_head_response(
-                https_link,
-                network_timeout.get(host)
-                if host in network_timeout
-                else network_timeout.get('*')
-                if '*' in network_timeout
-                else HTTPSBear.DEFAULT_TIMEOUT)
+        # The https versions of the links are only requested here if the
+        # URLHeadBear did not do so already, see its ``probe_https`` setting.
+        https_links = [self.HTTPS_PREFIX + result.link[len(self.HTTP_PREFIX):]
+                       for result in results
+                       if result.https_response is None]
+        network_timeout = {
+            urlparse(url).netloc if not url == '*' else '*': timeout
+            for url, timeout in network_timeout.items()}
+        https_responses = dict(zip(
+            https_links,
+            URLHeadBear.get_head_responses(https_links, network_timeout)))
+
+        for result in results:
+            line_number, link, code, context = result.contents
+            https_response = (
+                result.https_response
+                if result.https_response is not None
+                else https_responses[
+                    self.HTTPS_PREFIX + link[len(self.HTTP_PREFIX):]])
 
             try:
                 https_code = https_response.status_code
@@ -1,7 +1,6 @@
 from coala_utils.string_processing.Core import unescaped_search_for
 from coalib.bears.LocalBear import LocalBear
 from coalib.bearlib import deprecate_settings
-from coalib.bearlib.languages.LanguageDefinition import LanguageDefinition
 from coalib.bearlib.languages.documentation.DocBaseClass import (
     DocBaseClass)
 from coalib.bearlib.spacing.SpacingHelper import SpacingHelper
@@ -10,7 +9,8 @@ from coalib.results.Result import Result, RESULT_SEVERITY
 from coalib.results.AbsolutePosition import AbsolutePosition
 from coalib.results.Diff import Diff
 
-from bears.general.AnnotationBear import AnnotationBear
+from bears.general.AnnotationBear import (
+    AnnotationBear, get_language_definition)
 
 
 class IndentationBear(DocBaseClass, LocalBear):
@@ -77,8 +77,7 @@ class IndentationBear(DocBaseClass, LocalBear):
         if docstyle:
             doc_comments = self.extract(file, language, docstyle)
 
-        lang_settings_dict = LanguageDefinition(
-            language, coalang_dir=coalang_dir)
+        lang_settings_dict = get_language_definition(language, coalang_dir)
         annotation_dict = dependency_results[AnnotationBear.name][0].contents
         # sometimes can't convert strings with ':' to dict correctly
         if ':' in dict(lang_settings_dict['indent_types']).keys():
@@ -98,9 +97,8 @@ class IndentationBear(DocBaseClass, LocalBear):
                 annotation_dict)
         encaps_pos = tuple(sorted(encaps_pos, key=lambda x: x.start.line))
 
-        comments = dict(lang_settings_dict['comment_delimiters'])
-        comments.update(
-            dict(lang_settings_dict['multiline_comment_delimiters']))
+        comments = dict(lang_settings_dict.comment_delimiters)
+        comments.update(lang_settings_dict.multiline_comment_delimiters)
 
         try:
             indent_levels = self.get_indent_levels(
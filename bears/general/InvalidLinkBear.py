@@ -1,5 +1,3 @@
-import requests
-
 from difflib import SequenceMatcher
 
 from bears.general.URLHeadBear import URLHeadBear
@@ -8,6 +6,7 @@ from coalib.bears.LocalBear import LocalBear
 from dependency_management.requirements.PipRequirement import PipRequirement
 from coalib.results.RESULT_SEVERITY import RESULT_SEVERITY
 from coalib.results.Result import Result
+from coalib.settings.Setting import typed_dict
 
 
 class InvalidLinkBear(LocalBear):
@@ -23,6 +22,7 @@ class InvalidLinkBear(LocalBear):
     def run(self, filename, file,
             dependency_results=dict(),
             follow_redirects: bool = False,
+            network_timeout: typed_dict(str, int, DEFAULT_TIMEOUT) = dict(),
             ):
         """
         Find links in any text file and check if they are valid.
@@ -40,8 +40,21 @@ class InvalidLinkBear(LocalBear):
 
         :param dependency_results: Results given by URLBear.
         :param follow_redirects: Set to true to autocorrect redirects.
+        :param network_timeout:  A dict mapping URLs and timeout to be
+                                 used for that URL. All the URLs that have
+                                 the same host as that of URLs provided
+                                 will be passed that timeout. It can also
+                                 contain a wildcard timeout entry with key
+                                 '*'. The timeout of all the websites not
+                                 in the dict will be the value of the key
+                                 '*'.
         """
-        for result in dependency_results.get(URLHeadBear.name, []):
+        url_results = dependency_results.get(URLHeadBear.name, [])
+        redirect_urls = (URLHeadBear.get_followed_redirect_urls(
+                             self.section, url_results, network_timeout)
+                         if follow_redirects else {})
+
+        for result in url_results:
             line_number, link, code, context = result.contents
             if context is context.xml_namespace:
                 if code and 200 <= code < 300:
@@ -73,9 +86,10 @@ class InvalidLinkBear(LocalBear):
                         file=filename,
                         line=line_number,
                         severity=RESULT_SEVERITY.NORMAL)
-                if follow_redirects and 300 <= code < 400:  # HTTP status 30x
-                    redirect_url = requests.head(link,
-                                                 allow_redirects=True).url
+                # HTTP status 30x
+                if (follow_redirects and 300 <= code < 400 and
+                        redirect_urls.get(link)):
+                    redirect_url = redirect_urls[link][-1]
                     matcher = SequenceMatcher(
                         None, redirect_url, link)
                     if (matcher.real_quick_ratio() > 0.7 and
@@ -1,15 +1,12 @@
-import requests
-
 from bears.general.URLHeadBear import URLHeadBear
 
 from coalib.bears.LocalBear import LocalBear
 from coalib.results.Result import Result
 from coalib.results.RESULT_SEVERITY import RESULT_SEVERITY
+from coalib.settings.Setting import typed_dict
 
 from dependency_management.requirements.PipRequirement import PipRequirement
 
-from memento_client import MementoClient
-
 
 class MementoBear(LocalBear):
     DEFAULT_TIMEOUT = 15
@@ -36,18 +33,9 @@ class MementoBear(LocalBear):
             return False
         return True
 
-    @staticmethod
-    def get_redirect_urls(link):
-        urls = []
-
-        resp = requests.head(link, allow_redirects=True)
-        for redirect in resp.history:
-            urls.append(redirect.url)
-
-        return urls
-
     def run(self, filename, file, dependency_results=dict(),
             follow_redirects: bool = True,
+            network_timeout: typed_dict(str, int, DEFAULT_TIMEOUT) = dict(),
             ):
         """
         Find links in any text file and check if they are archived.
@@ -65,10 +53,25 @@ class MementoBear(LocalBear):
 
         :param dependency_results: Results given by URLHeadBear.
         :param follow_redirects:   Set to true to check all redirect urls.
+        :param network_timeout:    A dict mapping URLs and timeout to be
+                                   used for that URL. All the URLs that have
+                                   the same host as that of URLs provided
+                                   will be passed that timeout. It can also
+                                   contain a wildcard timeout entry with key
+                                   '*'. The timeout of all the websites not
+                                   in the dict will be the value of the key
+                                   '*'.
         """
+        from memento_client import MementoClient
+
         self._mc = MementoClient()
 
-        for result in dependency_results.get(URLHeadBear.name, []):
+        url_results = dependency_results.get(URLHeadBear.name, [])
+        redirect_urls = (URLHeadBear.get_followed_redirect_urls(
+                             self.section, url_results, network_timeout)
+                         if follow_redirects else {})
+
+        for result in url_results:
             line_number, link, code, context = result.contents
 
             if not (code and 200 <= code < 400):
@@ -86,10 +89,11 @@ class MementoBear(LocalBear):
                     severity=RESULT_SEVERITY.INFO
                 )
 
-            if follow_redirects and 300 <= code < 400:  # HTTP status 30x
-                redirect_urls = MementoBear.get_redirect_urls(link)
-
-                for url in redirect_urls:
+            # HTTP status 30x
+            if (follow_redirects and 300 <= code < 400 and
+                    redirect_urls.get(link)):
+                # The last URL is the final target and not a redirect.
+                for url in redirect_urls[link][:-1]:
                     status = MementoBear.check_archive(self._mc, url)
                     if not status:
                         yield Result.from_values(
@@ -1,5 +1,15 @@
-import requests
+import os
+import sqlite3
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from itertools import zip_longest
+from threading import BoundedSemaphore
 from urllib.parse import urlparse
+from weakref import WeakKeyDictionary
+
+import requests
 
 from bears.general.URLBear import URLBear, LINK_CONTEXT
 
@@ -41,7 +51,17 @@ class URLHeadResult(HiddenResult):
     def __init__(self, origin, affected_code,
                  link: str,
                  head_response: (requests.models.Response, Exception),
-                 link_context: LINK_CONTEXT):
+                 link_context: LINK_CONTEXT,
+                 redirect_urls: (tuple, None) = None,
+                 https_response: (requests.models.Response, Exception,
+                                  None) = None):
+        """
+        :param redirect_urls:  The URLs of the redirect responses followed by
+                               the final URL when following the redirects of
+                               the link, or None if they were not followed.
+        :param https_response: The head response of the https version of an
+                               http link, or None if it was not requested.
+        """
 
         http_status_code = (head_response.status_code if
                             isinstance(head_response,
@@ -57,17 +77,246 @@ class URLHeadResult(HiddenResult):
         self.http_status_code = http_status_code
         self.link_context = link_context
         self.head_response = head_response
+        self.redirect_urls = redirect_urls
+        self.https_response = https_response
+
+
+@lru_cache(maxsize=None)
+def get_session(max_connections_per_host):
+    """
+    Returns a ``requests.Session`` which is shared by all requests made in
+    this process, so connections to a host are pooled and reused instead of
+    being opened for every link.
+
+    :param max_connections_per_host:
+        The number of connections kept open in the pool of each host.
+    """
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(
+        pool_maxsize=max_connections_per_host)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+class RequestedLinks:
+    """
+    Keeps the head responses and followed redirects of all links requested
+    with a section, so every link is requested only once for all files of a
+    run. Unlike the ``LinkStatusCache``, links which could not be connected
+    to are kept as well.
+    """
+
+    def __init__(self):
+        self.head_responses = {}
+        self.redirect_urls = {}
+
+
+_requested_links = WeakKeyDictionary()
+
+
+def get_requested_links(section, network_timeout):
+    """
+    Returns the ``RequestedLinks`` shared by all files checked with the given
+    section and network timeouts. They are dropped together with the
+    section, i.e. at the end of the run.
+    """
+    timeouts = tuple(sorted(network_timeout.items()))
+    return _requested_links.setdefault(section, {}).setdefault(
+        timeouts, RequestedLinks())
+
+
+class LinkStatusCache:
+    """
+    Caches the status codes, redirect targets and followed redirects of links
+    in a SQLite database, so later runs only request links whose entry has
+    expired.
+
+    Links which could not be connected to are not cached.
+    """
+
+    def __init__(self, database, ttl):
+        """
+        :param database: The path of the SQLite database.
+        :param ttl:      The number of seconds an entry is valid.
+        """
+        self.ttl = ttl
+        self.entries = {}
+        self.connection = sqlite3.connect(database, timeout=30)
+        with self.connection:
+            self.connection.execute(
+                'CREATE TABLE IF NOT EXISTS link_status ('
+                'link TEXT PRIMARY KEY, status_code INTEGER, '
+                'redirect_url TEXT, redirect_urls TEXT, timestamp REAL)')
+
+    def get_entries(self, links):
+        unknown_links = [link for link in set(links)
+                         if link not in self.entries]
+        # SQLite allows at most 999 parameters in a query.
+        for i in range(0, len(unknown_links), 999):
+            chunk = unknown_links[i:i + 999]
+            rows = self.connection.execute(
+                'SELECT link, status_code, redirect_url, redirect_urls, '
+                'timestamp FROM link_status WHERE link IN (%s)'
+                % ', '.join('?' * len(chunk)), chunk)
+            for link, *entry in rows:
+                self.entries[link] = entry
+
+        oldest_valid = time.time() - self.ttl
+        return {link: self.entries[link]
+                for link in links
+                if link in self.entries and
+                self.entries[link][3] >= oldest_valid}
+
+    def get(self, links):
+        """
+        Gets the cached responses of links.
+
+        :param links: The links to look up.
+        :return:      A dict mapping the links with a valid entry to a
+                      ``requests.models.Response`` holding the cached status
+                      code and redirect target.
+        """
+        return {link: self.get_response(link, status_code, redirect_url)
+                for link, (status_code, redirect_url, _, _)
+                in self.get_entries(links).items()}
+
+    def get_redirect_urls(self, links):
+        """
+        Gets the cached redirects followed from links.
+
+        :param links: The links to look up.
+        :return:      A dict mapping the links with a valid entry holding
+                      followed redirects to the tuple of their URLs.
+        """
+        return {link: tuple(redirect_urls.split('\n'))
+                for link, (_, _, redirect_urls, _)
+                in self.get_entries(links).items()
+                if redirect_urls is not None}
+
+    def add(self, responses):
+        """
+        Adds the status codes and redirect targets of responses to the cache.
+
+        :param responses: A dict mapping links to their head response or the
+                          exception raised when requesting it.
+        """
+        timestamp = time.time()
+        entries = {link: [response.status_code,
+                          response.headers.get('Location'),
+                          None,
+                          timestamp]
+                   for link, response in responses.items()
+                   if isinstance(response, requests.models.Response)}
+        self.entries.update(entries)
+        with self.connection:
+            self.connection.executemany(
+                'INSERT OR REPLACE INTO link_status VALUES (?, ?, ?, ?, ?)',
+                ([link] + entry for link, entry in entries.items()))
+
+    def add_redirect_urls(self, redirect_urls):
+        """
+        Adds followed redirects to the entries of their links.
+
+        :param redirect_urls: A dict mapping links to the tuple of URLs
+                              visited when following their redirects, or None
+                              if they could not be followed.
+        """
+        redirect_urls = {link: '\n'.join(urls)
+                         for link, urls in redirect_urls.items()
+                         if urls is not None and link in self.entries}
+        for link, urls in redirect_urls.items():
+            self.entries[link][2] = urls
+        with self.connection:
+            self.connection.executemany(
+                'UPDATE link_status SET redirect_urls = ? WHERE link = ?',
+                ((urls, link) for link, urls in redirect_urls.items()))
+
+    @staticmethod
+    def get_response(link, status_code, redirect_url):
+        response = requests.models.Response()
+        response.url = link
+        response.status_code = status_code
+        if redirect_url is not None:
+            response.headers['Location'] = redirect_url
+        return response
+
+
+@lru_cache(maxsize=None)
+def get_link_status_cache(database, ttl):
+    """
+    Returns the ``LinkStatusCache`` of a database shared by all files checked
+    in this process.
+    """
+    return LinkStatusCache(database, ttl)
+
+
+def request_concurrently(request, links, network_timeout,
+                         max_concurrency, max_concurrency_per_host):
+    """
+    Makes requests for many links concurrently.
+
+    The requests are made by a pool of ``max_concurrency`` threads using a
+    shared session. At most ``max_concurrency_per_host`` requests are made to
+    the same host at a time, and the links are scheduled round-robin over
+    their hosts so a host with many links does not block the others. Every
+    distinct link is only requested once.
+
+    :param request:
+        A function taking the session, a link and the timeout to use, which
+        makes the request and returns its result.
+    :param links:
+        The links to make the requests for.
+    :param network_timeout:
+        A dict mapping hosts to the timeout used for them. The timeout of all
+        other hosts is the value of the key ``'*'``.
+    :param max_concurrency:
+        The maximum number of requests made at the same time.
+    :param max_concurrency_per_host:
+        The maximum number of requests made to one host at the same time.
+    :return:
+        A dict mapping the links to the results of their requests.
+    """
+    session = get_session(max_concurrency_per_host)
+    hosts = OrderedDict((link, urlparse(link).netloc) for link in links)
+    links_by_host = OrderedDict()
+    for link, host in hosts.items():
+        links_by_host.setdefault(host, []).append(link)
+    host_semaphores = {host: BoundedSemaphore(max_concurrency_per_host)
+                       for host in links_by_host}
+
+    def request_link(link):
+        host = hosts[link]
+        timeout = (network_timeout.get(host)
+                   if host in network_timeout
+                   else network_timeout.get('*')
+                   if '*' in network_timeout
+                   else URLHeadBear.DEFAULT_TIMEOUT)
+        with host_semaphores[host]:
+            return request(session, link, timeout)
+
+    with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+        futures = {link: executor.submit(request_link, link)
+                   for links_round in zip_longest(*links_by_host.values())
+                   for link in links_round
+                   if link is not None}
+
+    return {link: future.result() for link, future in futures.items()}
 
 
 class URLHeadBear(LocalBear):
     BEAR_DEPS = {URLBear}
     DEFAULT_TIMEOUT = 15
+    DEFAULT_MAX_CONCURRENCY = 16
+    DEFAULT_MAX_CONCURRENCY_PER_HOST = 4
     LANGUAGES = {'All'}
     REQUIREMENTS = {PipRequirement('requests', '2.12')}
     AUTHORS = {'The coala developers'}
     AUTHORS_EMAILS = {'coala-devel@googlegroups.com'}
     LICENSE = 'AGPL-3.0'
     CAN_DETECT = {'Documentation'}
+    HTTPS_PREFIX = 'https'
+    HTTP_PREFIX = 'http'
 
     # DNS IP by Cloudfare
     check_connection_url = 'https://1.1.1.1/'
@@ -80,22 +329,147 @@ class URLHeadBear(LocalBear):
                 if isinstance(head_resp, Exception) else True)
 
     @staticmethod
-    def get_head_response(url, timeout):
+    def get_head_response(url, timeout, session=requests):
         try:
-            head_resp = requests.head(url, allow_redirects=False,
-                                      timeout=timeout)
+            head_resp = session.head(url, allow_redirects=False,
+                                     timeout=timeout)
             return head_resp
         except requests.exceptions.RequestException as exc:
             return exc
 
+    @staticmethod
+    def get_redirect_urls(url, timeout, session=requests):
+        try:
+            head_resp = session.head(url, allow_redirects=True,
+                                     timeout=timeout)
+        except requests.exceptions.RequestException:
+            return None
+        return (tuple(redirect.url for redirect in head_resp.history) +
+                (head_resp.url,))
+
+    @staticmethod
+    def get_head_responses(links, network_timeout,
+                           max_concurrency=DEFAULT_MAX_CONCURRENCY,
+                           max_concurrency_per_host=(
+                               DEFAULT_MAX_CONCURRENCY_PER_HOST),
+                           cache=None,
+                           requested_links=None):
+        """
+        Gets the head responses of many links concurrently, see
+        ``request_concurrently`` for the parameters.
+
+        :param cache:
+            A ``LinkStatusCache`` to take the responses from. Only the links
+            missing in it are requested, and their responses are added.
+        :param requested_links:
+            A ``RequestedLinks`` to take the responses from before looking
+            at the cache. The responses of all other links are added.
+        :return:
+            A list of the head responses (or the exceptions raised) in the
+            order of ``links``.
+        """
+        responses = ({link: requested_links.head_responses[link]
+                      for link in links
+                      if link in requested_links.head_responses}
+                     if requested_links is not None else {})
+        if cache is not None:
+            responses.update(cache.get(
+                [link for link in links if link not in responses]))
+        requested_responses = request_concurrently(
+            lambda session, link, timeout: URLHeadBear.get_head_response(
+                link, timeout, session),
+            [link for link in links if link not in responses],
+            network_timeout, max_concurrency, max_concurrency_per_host)
+        if cache is not None:
+            cache.add(requested_responses)
+        responses.update(requested_responses)
+        if requested_links is not None:
+            requested_links.head_responses.update(responses)
+        return [responses[link] for link in links]
+
+    @staticmethod
+    def get_all_redirect_urls(links, network_timeout,
+                              max_concurrency=DEFAULT_MAX_CONCURRENCY,
+                              max_concurrency_per_host=(
+                                  DEFAULT_MAX_CONCURRENCY_PER_HOST),
+                              cache=None,
+                              requested_links=None):
+        """
+        Follows the redirects of many links concurrently, see
+        ``get_head_responses`` for the parameters.
+
+        :return:
+            A dict mapping the links to the URLs of the redirect responses
+            followed by the final URL, or to None if the redirects could not
+            be followed.
+        """
+        redirect_urls = ({link: requested_links.redirect_urls[link]
+                          for link in links
+                          if link in requested_links.redirect_urls}
+                         if requested_links is not None else {})
+        if cache is not None:
+            redirect_urls.update(cache.get_redirect_urls(
+                [link for link in links if link not in redirect_urls]))
+        followed_redirect_urls = request_concurrently(
+            lambda session, link, timeout: URLHeadBear.get_redirect_urls(
+                link, timeout, session),
+            [link for link in links if link not in redirect_urls],
+            network_timeout, max_concurrency, max_concurrency_per_host)
+        if cache is not None:
+            cache.add_redirect_urls(followed_redirect_urls)
+        redirect_urls.update(followed_redirect_urls)
+        if requested_links is not None:
+            requested_links.redirect_urls.update(redirect_urls)
+        return redirect_urls
+
+    @staticmethod
+    def get_followed_redirect_urls(section, url_results, network_timeout):
+        """
+        Gets the redirects followed from the links of ``URLHeadResult``s
+        responding with a 3xx code. They are only followed here if the
+        URLHeadBear did not do so already, see its ``probe_redirects``
+        setting.
+
+        :param section:         The section the links are checked with.
+        :param url_results:     The ``URLHeadResult``s of the links.
+        :param network_timeout: The ``network_timeout`` setting of the
+                                URLHeadBear.
+        :return:                A dict mapping the links to the URLs of the
+                                redirect responses followed by the final
+                                URL, or to None if the redirects could not
+                                be followed.
+        """
+        redirect_urls = {result.link: result.redirect_urls
+                         for result in url_results
+                         if result.redirect_urls is not None}
+        links = [result.link for result in url_results
+                 if result.link not in redirect_urls and
+                 300 <= (result.http_status_code or 0) < 400]
+        network_timeout = {urlparse(url).netloc
+                           if not url == '*' else '*': timeout
+                           for url, timeout in network_timeout.items()}
+        redirect_urls.update(URLHeadBear.get_all_redirect_urls(
+            links, network_timeout,
+            requested_links=get_requested_links(section, network_timeout)))
+        return redirect_urls
+
     @deprecate_settings(network_timeout=('timeout', lambda t: {'*': t}))
     def run(self, filename, file, dependency_results=dict(),
             network_timeout: typed_dict(str, int, DEFAULT_TIMEOUT) = dict(),
+            max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+            max_concurrency_per_host: int = DEFAULT_MAX_CONCURRENCY_PER_HOST,
+            link_status_cache_ttl: int = 0,
+            probe_https: bool = False,
+            probe_redirects: bool = False,
             ):
         """
         Find links in any text file and tells its head response and
         status code.
 
+        The redirects of links responding with a 3xx code can be followed as
+        well, so bears depending on this one do not need to request them
+        again.
+
         Warning: This bear will make HEAD requests to all URLs mentioned in
         your codebase, which can potentially be destructive. As an example,
         this bear would naively just visit the URL from a line that goes like
@@ -110,6 +484,27 @@ class URLHeadBear(LocalBear):
                                 '*'. The timeout of all the websites not
                                 in the dict will be the value of the key
                                 '*'.
+        :param max_concurrency: The maximum number of HEAD requests made
+                                at the same time.
+        :param max_concurrency_per_host:
+                                The maximum number of HEAD requests made
+                                to the same host at the same time.
+        :param link_status_cache_ttl:
+                                The number of seconds the status code and
+                                redirect target of a link are cached for
+                                on disk. Cached links are not requested
+                                again by later runs until their entry
+                                expires. Set to 0 to disable the cache.
+                                Every link is only requested once for all
+                                files of a run either way.
+        :param probe_https:     Set to true to also request the https
+                                version of all http links, together with
+                                the other requests. This is used by the
+                                HTTPSBear.
+        :param probe_redirects: Set to true to also follow the redirects of
+                                links responding with a 3xx code, together
+                                with the other requests. This is used by
+                                the InvalidLinkBear and the MementoBear.
         :param link_ignore_regex: A regex for urls to ignore.
         :param link_ignore_list: Comma separated url globs to ignore
         """
@@ -117,15 +512,41 @@ class URLHeadBear(LocalBear):
                            if not url == '*' else '*': timeout
                            for url, timeout in network_timeout.items()}
 
-        for result in dependency_results.get(URLBear.name, []):
-            host = urlparse(result.link).netloc
-            head_resp = self.get_head_response(
-                result.link,
-                network_timeout.get(host)
-                if host in network_timeout
-                else network_timeout.get('*')
-                if '*' in network_timeout
-                else URLHeadBear.DEFAULT_TIMEOUT)
-
-            yield URLHeadResult(self, result.affected_code, result.link,
-                                head_resp, result.link_context)
+        cache = (get_link_status_cache(
+                     os.path.join(self.data_dir, 'link_status.sqlite3'),
+                     link_status_cache_ttl)
+                 if link_status_cache_ttl > 0 else None)
+
+        requested_links = get_requested_links(self.section, network_timeout)
+
+        url_results = dependency_results.get(URLBear.name, [])
+        links = [result.link for result in url_results]
+        https_links = {
+            link: self.HTTPS_PREFIX + link[len(self.HTTP_PREFIX):]
+            for link in links
+            if probe_https and not link.startswith(self.HTTPS_PREFIX)}
+
+        head_responses = dict(zip(
+            links + list(https_links.values()),
+            self.get_head_responses(links + list(https_links.values()),
+                                    network_timeout,
+                                    max_concurrency,
+                                    max_concurrency_per_host,
+                                    cache,
+                                    requested_links)))
+        redirect_urls = self.get_all_redirect_urls(
+            [link for link in links
+             if probe_redirects and
+             300 <= getattr(head_responses[link], 'status_code', 0) < 400],
+            network_timeout,
+            max_concurrency,
+            max_concurrency_per_host,
+            cache,
+            requested_links)
+
+        for result in url_results:
+            yield URLHeadResult(
+                self, result.affected_code, result.link,
+                head_responses[result.link], result.link_context,
+                redirect_urls.get(result.link),
+                head_responses.get(https_links.get(result.link)))
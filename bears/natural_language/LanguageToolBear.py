@@ -1,8 +1,6 @@
 import shutil
 import logging
 
-from guess_language import guess_language
-
 from coalib.bearlib import deprecate_settings
 from coalib.bears.LocalBear import LocalBear
 from dependency_management.requirements.PipRequirement import PipRequirement
@@ -55,6 +53,7 @@ class LanguageToolBear(LocalBear):
         # Defer import so the check_prerequisites can be run without
         # language_check being there.
         from language_check import LanguageTool, correct
+        from guess_language import guess_language
 
         joined_text = ''.join(file)
         natural_language = (guess_language(joined_text)
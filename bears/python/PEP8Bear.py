@@ -1,6 +1,6 @@
-import autopep8
 import sys
 
+from bears.CorrectionCache import get_corrected_lines
 from coalib.bearlib import deprecate_settings
 from coalib.bearlib.spacing.SpacingHelper import SpacingHelper
 from coalib.bears.LocalBear import LocalBear
@@ -26,6 +26,7 @@ class PEP8Bear(LocalBear):
             pep_ignore: typed_list(str) = (),
             pep_select: typed_list(str) = (),
             local_pep8_config: bool = False,
+            correction_cache_size: int = 0,
             ):
         """
         Detects and fixes PEP8 incompliant code. This bear will not change
@@ -43,6 +44,10 @@ class PEP8Bear(LocalBear):
         :param local_pep8_config:
             Set to true if autopep8 should use a config file as if run normally
             from this directory.
+        :param correction_cache_size:
+            The maximum size in MiB of the corrections cached on disk.
+            Unchanged files are not corrected again by later runs. Set to 0
+            to disable the cache.
         """
         if not max_line_length:
             max_line_length = sys.maxsize
@@ -52,9 +57,20 @@ class PEP8Bear(LocalBear):
                    'max_line_length': max_line_length,
                    'indent_size': indent_size}
 
-        corrected = autopep8.fix_code(''.join(file),
-                                      apply_config=local_pep8_config,
-                                      options=options).splitlines(True)
+        import autopep8
+
+        def fix_code():
+            return autopep8.fix_code(''.join(file),
+                                     apply_config=local_pep8_config,
+                                     options=options).splitlines(True)
+
+        if local_pep8_config:
+            # The correction depends on configuration files as well.
+            corrected = fix_code()
+        else:
+            corrected = get_corrected_lines(self, autopep8.__version__,
+                                            options, file, fix_code,
+                                            correction_cache_size)
 
         diffs = Diff.from_string_arrays(file, corrected).split_diff()
 
@@ -1,5 +1,3 @@
-import autopep8
-import nbformat
 import sys
 
 from coalib.bearlib.spacing.SpacingHelper import SpacingHelper
@@ -17,6 +15,8 @@ from coalib.settings.Setting import typed_list
 # The functions in `nbformat` work with `NotebookNode` objects, which are like
 # dictionaries, but allow attribute access. The structure of these objects
 # matches the notebook format specification.
+# Both `nbformat` and `autopep8` are imported where they are used so
+# collecting bears doesn't load them.
 
 
 def notebook_node_from_string_list(string_list):
@@ -28,6 +28,8 @@ def notebook_node_from_string_list(string_list):
                         (linewise).
     :return:            The notebook as NotebookNode.
     """
+    import nbformat
+
     return nbformat.reads(''.join(string_list), nbformat.NO_CONVERT)
 
 
@@ -38,6 +40,8 @@ def notebook_node_to_string_list(notebook_node):
     :param notebook_node: The notebook as NotebookNode to write.
     :return:              The notebook as list of strings (linewise).
     """
+    import nbformat
+
     return nbformat.writes(notebook_node, nbformat.NO_CONVERT).splitlines(True)
 
 
@@ -53,6 +57,8 @@ def autopep8_fix_code_cell(source, options=None, apply_config=None):
     For notebook code cells, this behaviour does not make sense, hence
     newline is removed if ``source`` does not end with one.
     """
+    import autopep8
+
     source_corrected = autopep8.fix_code(source,
                                          apply_config=apply_config,
                                          options=options)
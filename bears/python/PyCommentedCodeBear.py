@@ -1,5 +1,4 @@
-import eradicate
-
+from bears.CorrectionCache import get_corrected_lines
 from coalib.bears.LocalBear import LocalBear
 from dependency_management.requirements.PipRequirement import PipRequirement
 from coalib.results.Diff import Diff
@@ -14,11 +13,23 @@ class PyCommentedCodeBear(LocalBear):
     LICENSE = 'AGPL-3.0'
     CAN_DETECT = {'Commented Code'}
 
-    def run(self, filename, file):
+    def run(self, filename, file,
+            correction_cache_size: int = 0,
+            ):
         """
         Detects commented out source code in Python.
+
+        :param correction_cache_size:
+            The maximum size in MiB of the corrections cached on disk.
+            Unchanged files are not corrected again by later runs. Set to 0
+            to disable the cache.
         """
-        corrected = tuple(eradicate.filter_commented_out_code(''.join(file)))
+        import eradicate
+
+        corrected = get_corrected_lines(
+            self, eradicate.__version__, {}, file,
+            lambda: eradicate.filter_commented_out_code(''.join(file)),
+            correction_cache_size)
 
         for diff in Diff.from_string_arrays(file, corrected).split_diff():
             yield Result(self,
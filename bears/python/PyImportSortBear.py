@@ -1,5 +1,6 @@
-from isort import SortImports
+import os
 
+from bears.CorrectionCache import get_corrected_lines
 from coalib.bearlib import deprecate_settings
 from coalib.bearlib.spacing.SpacingHelper import SpacingHelper
 from coalib.bears.LocalBear import LocalBear
@@ -8,6 +9,9 @@ from coalib.results.Diff import Diff
 from coalib.results.Result import Result
 from coalib.settings.Setting import typed_list
 
+UNORDERED_OPTIONS = {'add_imports', 'no_lines_before', 'remove_imports',
+                     'skip', 'skip_glob'}
+
 
 class PyImportSortBear(LocalBear):
 
@@ -46,15 +50,43 @@ class PyImportSortBear(LocalBear):
             tmp = []
         return import_stmts
 
+    @staticmethod
+    def _get_cache_settings(isort_settings):
+        """
+        Retrieves the settings a cached correction depends on.
+
+        isort also reads its configuration files found from the working
+        directory, so the resulting configuration is part of the cache key.
+        Where isort places modules it doesn't know depends on the installed
+        packages as well, which the cache doesn't cover.
+        """
+        import isort.settings
+
+        # isort builds these lists from sets and only checks whether a
+        # module is in them, the order of the others matters.
+        config = {name: sorted(value)
+                  if name.startswith('known_') or name in UNORDERED_OPTIONS
+                  else value
+                  for name, value in isort.settings.from_path(
+                      os.getcwd()).items()}
+        return {'config': config, 'settings': isort_settings}
+
+    def _sort_imports(self, lines):
+        import isort
+
+        return get_corrected_lines(
+            self, isort.__version__, self.cache_settings, lines,
+            lambda: isort.SortImports(file_contents=''.join(lines),
+                                      **self.isort_settings
+                                      ).output.splitlines(True),
+            self.correction_cache_size)
+
     def _get_diff(self):
         if self.treat_seperated_imports_independently:
             import_stmts = PyImportSortBear._seperate_imports(self.file)
             sorted_imps = []
             for units in import_stmts:
-                sort_imports = SortImports(file_contents=''.
-                                           join([x[1] for x in units]),
-                                           **self.isort_settings)
-                sort_imports = sort_imports.output.splitlines(True)
+                sort_imports = self._sort_imports([x[1] for x in units])
                 sorted_imps.append((units, sort_imports))
 
             diff = Diff(self.file)
@@ -68,10 +100,7 @@ class PyImportSortBear(LocalBear):
             if diff.modified != diff._file:
                 return diff
         else:
-            sort_imports = SortImports(file_contents=''.join(self.file),
-                                       **self.isort_settings)
-
-            new_file = tuple(sort_imports.output.splitlines(True))
+            new_file = tuple(self._sort_imports(self.file))
             if new_file != tuple(self.file):
                 diff = Diff.from_string_arrays(self.file, new_file)
                 return diff
@@ -108,6 +137,7 @@ class PyImportSortBear(LocalBear):
             max_line_length: int = 79,
             imports_forced_to_top: typed_list(str) = (),
             treat_seperated_imports_independently: bool = False,
+            correction_cache_size: int = 0,
             ):
         """
         Raise issues related to sorting imports, segregating imports into
@@ -209,6 +239,10 @@ class PyImportSortBear(LocalBear):
         :param treat_seperated_imports_independently:
             Treat import statements seperated by one or more blank line or any
             statement other than an import statement as an independent bunch.
+        :param correction_cache_size:
+            The maximum size in MiB of the corrections cached on disk.
+            Unchanged files are not corrected again by later runs. Set to 0
+            to disable the cache.
         """
         isort_settings = dict(
             use_parentheses=use_parentheses_in_import,
@@ -242,6 +276,9 @@ class PyImportSortBear(LocalBear):
                 known_standard_library_imports)
 
         self.isort_settings = isort_settings
+        self.correction_cache_size = correction_cache_size
+        self.cache_settings = (self._get_cache_settings(isort_settings)
+                               if correction_cache_size > 0 else None)
         self.file = file
         self.filename = filename
         self.treat_seperated_imports_independently = \
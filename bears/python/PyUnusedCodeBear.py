@@ -1,5 +1,4 @@
-import autoflake
-
+from bears.CorrectionCache import get_corrected_lines
 from coalib.bears.LocalBear import LocalBear
 from dependency_management.requirements.PipRequirement import PipRequirement
 from coalib.results.Diff import Diff
@@ -34,6 +33,7 @@ class PyUnusedCodeBear(
     def run(self, filename, file,
             remove_all_unused_imports: bool = True,
             remove_unused_variables: bool = True,
+            correction_cache_size: int = 0,
             ):
         """
         Detects unused code. By default this functionality is limited to:
@@ -46,13 +46,21 @@ class PyUnusedCodeBear(
             ``False`` removes only unused builtin imports
         :param remove_unused_variables:
             ``False`` keeps unused variables
+        :param correction_cache_size:
+            The maximum size in MiB of the corrections cached on disk.
+            Unchanged files are not corrected again by later runs. Set to 0
+            to disable the cache.
         """
-        corrected = autoflake.fix_code(
-                       ''.join(file),
-                       additional_imports=None,
-                       remove_all_unused_imports=remove_all_unused_imports,
-                       remove_unused_variables=remove_unused_variables
-                       ).splitlines(True)
+        import autoflake
+
+        options = {'remove_all_unused_imports': remove_all_unused_imports,
+                   'remove_unused_variables': remove_unused_variables}
+        corrected = get_corrected_lines(
+            self, autoflake.__version__, options, file,
+            lambda: autoflake.fix_code(''.join(file),
+                                       additional_imports=None,
+                                       **options).splitlines(True),
+            correction_cache_size)
 
         for diff in Diff.from_string_arrays(file, corrected).split_diff():
             yield Result(self,
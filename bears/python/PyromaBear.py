@@ -1,5 +1,4 @@
 import os.path
-import pyroma
 
 from coalib.bears.GlobalBear import GlobalBear
 from dependency_management.requirements.PipRequirement import PipRequirement
@@ -32,6 +31,8 @@ class PyromaBear(GlobalBear):
             yield Result(self, 'Your package does'
                          ' not contain a setup file.')
         else:
+            import pyroma
+
             for setup_file in setup_files:
                 data = pyroma.projectdata.get_data(os.path.dirname(setup_file))
                 rating = pyroma.ratings.rate(data)
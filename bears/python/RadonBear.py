@@ -1,6 +1,4 @@
 import logging
-import radon.complexity
-import radon.visitors
 
 from coalib.bears.LocalBear import LocalBear
 from dependency_management.requirements.PipRequirement import PipRequirement
@@ -48,6 +46,8 @@ class RadonBear(LocalBear):
                             ' are deprecated. Please use '
                             '`cyclomatic_complexity` instead.')
 
+        import radon.complexity
+
         for visitor in radon.complexity.cc_visit(''.join(file)):
             rank = radon.complexity.cc_rank(visitor.complexity)
             severity = None
@@ -1,20 +1,117 @@
+import hashlib
+import os
+from multiprocessing import Pool
+
 from coalib.bears.GlobalBear import GlobalBear
+from coalib.misc.CachingUtilities import pickle_dump, pickle_load
 from coalib.results.Result import Result
 from dependency_management.requirements.PipRequirement import PipRequirement
-from vulture import Vulture
 
 
-def _find_unused_code(filenames):
+def _is_table(name):
+    """
+    Vulture collects the defined code of all scanned files in lists named
+    ``defined_*`` and ``unreachable_code`` and the used names in sets named
+    ``used_*``.
+    """
+    return name.startswith(('defined_', 'used_')) or name == 'unreachable_code'
+
+
+def _scan_file(filename, code):
+    """
+    Scans a single file.
+
+    :param filename: The name of the file.
+    :param code:     The contents of the file.
+    :return:         A dictionary of the tables of the ``Vulture`` object.
+                     Defined code is stored as
+                     ``(name, typ, first_lineno, last_lineno, message,
+                     confidence)`` tuples without the filename, used names
+                     as sets.
+    """
+    from vulture import Vulture
+
+    vulture = Vulture()
+    vulture.scan(code, filename=filename)
+    table = {}
+    for name, value in vars(vulture).items():
+        if not _is_table(name):
+            continue
+        if name.startswith('used_'):
+            table[name] = set(value)
+        else:
+            table[name] = [(item.name, item.typ, item.first_lineno,
+                            item.last_lineno, item.message, item.confidence)
+                           for item in value]
+    return table
+
+
+def _merge_table(vulture, filename, table):
+    """
+    Adds the table of a file, see ``_scan_file``, to the ``Vulture`` object.
+    """
+    from vulture.core import Item
+
+    for name, entries in table.items():
+        if name.startswith('used_'):
+            getattr(vulture, name).update(entries)
+        else:
+            getattr(vulture, name).extend(
+                Item(item_name, typ, filename, first_lineno, last_lineno,
+                     message, confidence)
+                for (item_name, typ, first_lineno, last_lineno, message,
+                     confidence) in entries)
+
+
+def _find_unused_code(files, tables=None, jobs=1):
     """
-    :param filenames: List of filenames to check.
-    :return: Generator of Result objects.
+    :param files:  A dictionary of filenames and their contents to check.
+    :param tables: A dictionary of filenames and ``(content hash, table)``
+                   tuples of previous scans. Only files that changed since
+                   are scanned again. The dictionary is updated to the
+                   given files.
+    :param jobs:   The number of processes to scan the files with. If set
+                   to 0, one process per CPU is used.
+    :return:       Generator of Result objects.
     """
+    from vulture import Vulture
+
+    if tables is None:
+        tables = {}
+    for filename in set(tables) - set(files):
+        del tables[filename]
+
+    changed_files = []
+    content_hashes = {}
+    for filename, code in files.items():
+        content_hashes[filename] = hashlib.sha1(
+            code.encode('utf-8', 'surrogatepass')).hexdigest()
+        if tables.get(filename, (None,))[0] != content_hashes[filename]:
+            changed_files.append((filename, code))
+
+    # Workers only send back the compact tables, the parent merges them.
+    if jobs == 1 or len(changed_files) < 2:
+        scanned_tables = [_scan_file(filename, code)
+                          for filename, code in changed_files]
+    else:
+        with Pool(jobs or None) as pool:
+            scanned_tables = pool.starmap(_scan_file, changed_files)
+
+    for (filename, _), table in zip(changed_files, scanned_tables):
+        tables[filename] = content_hashes[filename], table
+
     vulture = Vulture()
-    vulture.scavenge(filenames)
+    for filename in files:
+        _merge_table(vulture, filename, tables[filename][1])
+
+    # Without paths only the whitelists of the imported modules are scanned,
+    # they depend on all files and can't be cached per file.
+    vulture.scavenge([])
+
     for item in vulture.get_unused_code():
         yield Result.from_values(origin='VultureBear',
                                  message=item.message,
-                                 file=item.filename,
+                                 file=str(item.filename),
                                  line=item.first_lineno,
                                  end_line=item.last_lineno,
                                  confidence=item.confidence)
@@ -30,9 +127,32 @@ class VultureBear(GlobalBear):
     CAN_DETECT = {'Unused Code'}
     SEE_MORE = 'https://github.com/jendrikseipp/vulture'
 
-    def run(self):
+    def get_cache_identifier(self):
+        return 'VultureBear:{}:{}'.format(
+            self.get_config_dir() or os.getcwd(), self.section.name)
+
+    def run(self, use_cache: bool = True, jobs: int = 1):
         """
         Check Python code for unused variables and functions using `vulture`.
+
+        :param use_cache: Remember the names every file defines and uses
+                          between runs, so only changed files are parsed
+                          again.
+        :param jobs:      The number of processes to parse the files with. If
+                          set to 0, one process per CPU is used.
         """
-        filenames = list(self.file_dict.keys())
-        return _find_unused_code(filenames)
+        from vulture import __version__ as vulture_version
+
+        files = {filename: ''.join(lines)
+                 for filename, lines in self.file_dict.items()}
+        if not use_cache:
+            yield from _find_unused_code(files, jobs=jobs)
+            return
+
+        identifier = self.get_cache_identifier()
+        cache = pickle_load(None, identifier, {})
+        tables = (cache.get('tables', {})
+                  if cache.get('vulture_version') == vulture_version else {})
+        yield from _find_unused_code(files, tables, jobs)
+        pickle_dump(None, identifier, {'vulture_version': vulture_version,
+                                       'tables': tables})
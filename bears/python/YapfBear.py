@@ -1,5 +1,4 @@
-from yapf.yapflib.yapf_api import FormatCode
-
+from bears.CorrectionCache import get_corrected_lines
 from coalib.bearlib import deprecate_settings
 from coalib.bearlib.spacing.SpacingHelper import SpacingHelper
 from coalib.bears.LocalBear import LocalBear
@@ -40,6 +39,7 @@ class YapfBear(LocalBear):
             use_spaces: bool = True,
             based_on_style: str = 'pep8',
             prefer_line_break_after_opening_bracket: bool = True,
+            correction_cache_size: int = 0,
             ):
         """
         Check and correct formatting of Python code using ``yapf`` utility.
@@ -114,6 +114,10 @@ class YapfBear(LocalBear):
         :param prefer_line_break_after_opening_bracket:
             If True, splitting right after a open bracket will not be
             preferred.
+        :param correction_cache_size:
+            The maximum size in MiB of the corrections cached on disk.
+            Unchanged files are not corrected again by later runs. Set to 0
+            to disable the cache.
         """
         if not file:
             # Yapf cannot handle zero-byte files well, and adds a redundent
@@ -149,11 +153,20 @@ space_between_ending_comma_and_closing_bracket= \
                      else '0') + '\n')
         options = options.format(**locals())
 
-        try:
+        import yapf
+        from yapf.yapflib.yapf_api import FormatCode
+
+        def format_code():
             with prepare_file(options.splitlines(keepends=True),
                               None) as (file_, fname):
-                corrected = FormatCode(
+                return FormatCode(
                     ''.join(file), style_config=fname)[0].splitlines(True)
+
+        try:
+            corrected = get_corrected_lines(self, yapf.__version__,
+                                            {'style': options}, file,
+                                            format_code,
+                                            correction_cache_size)
         except SyntaxError as err:
             if isinstance(err, IndentationError):
                 error_type = 'indentation errors (' + err.args[0] + ')'
@@ -1,5 +1,3 @@
-from restructuredtext_lint import lint
-
 from coalib.bears.LocalBear import LocalBear
 from dependency_management.requirements.PipRequirement import PipRequirement
 from coalib.results.Result import Result
@@ -18,6 +16,8 @@ class reSTLintBear(LocalBear):
         """
         Lints reStructuredText.
         """
+        from restructuredtext_lint import lint
+
         content = ''.join(file)
         errors = lint(content)
 
@@ -1,5 +1,3 @@
-import sqlparse
-
 from coalib.bears.LocalBear import LocalBear
 from coalib.results.Diff import Diff
 from coalib.results.Result import Result
@@ -42,6 +40,8 @@ class SQLFormatBear(LocalBear):
         :param indent_width:
             The width of the indentation.
         """
+        import sqlparse
+
         corrected = sqlparse.format(''.join(file),
                                     keyword_case=keyword_case,
                                     identifier_case=identifier_case,
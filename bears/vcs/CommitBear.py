@@ -2,7 +2,6 @@ import abc
 import logging
 import sys
 
-import nltk
 import re
 from contextlib import redirect_stdout
 
@@ -14,6 +13,53 @@ from coalib.settings.Setting import typed_list
 from coalib.settings.FunctionMetadata import FunctionMetadata
 from dependency_management.requirements.PipRequirement import PipRequirement
 
+# The nltk data needed by the imperative check, mapped to the path it is
+# looked up at.
+NLTK_DATA = {
+    'punkt': 'tokenizers/punkt',
+    'averaged_perceptron_tagger': 'taggers/averaged_perceptron_tagger',
+}
+
+# Forms of verbs commonly starting a shortlog: the imperative, the 3rd person
+# singular present, the past tense and the present participle. Shortlogs
+# starting with one of them are checked without the part of speech tagger.
+VERB_FORMS = (
+    ('add', 'adds', 'added', 'adding'),
+    ('allow', 'allows', 'allowed', 'allowing'),
+    ('avoid', 'avoids', 'avoided', 'avoiding'),
+    ('bump', 'bumps', 'bumped', 'bumping'),
+    ('change', 'changes', 'changed', 'changing'),
+    ('convert', 'converts', 'converted', 'converting'),
+    ('create', 'creates', 'created', 'creating'),
+    ('delete', 'deletes', 'deleted', 'deleting'),
+    ('disable', 'disables', 'disabled', 'disabling'),
+    ('drop', 'drops', 'dropped', 'dropping'),
+    ('enable', 'enables', 'enabled', 'enabling'),
+    ('fix', 'fixes', 'fixed', 'fixing'),
+    ('handle', 'handles', 'handled', 'handling'),
+    ('implement', 'implements', 'implemented', 'implementing'),
+    ('improve', 'improves', 'improved', 'improving'),
+    ('make', 'makes', 'made', 'making'),
+    ('move', 'moves', 'moved', 'moving'),
+    ('prevent', 'prevents', 'prevented', 'preventing'),
+    ('refactor', 'refactors', 'refactored', 'refactoring'),
+    ('remove', 'removes', 'removed', 'removing'),
+    ('rename', 'renames', 'renamed', 'renaming'),
+    ('replace', 'replaces', 'replaced', 'replacing'),
+    ('simplify', 'simplifies', 'simplified', 'simplifying'),
+    ('update', 'updates', 'updated', 'updating'),
+    ('use', 'uses', 'used', 'using'),
+)
+
+IMPERATIVE_WORDS = frozenset(forms[0] for forms in VERB_FORMS)
+
+NON_IMPERATIVE_WORDS = dict(
+    [(forms[1], 'VBZ') for forms in VERB_FORMS] +
+    [(forms[2], 'VBD') for forms in VERB_FORMS] +
+    [(forms[3], 'VBG') for forms in VERB_FORMS])
+
+FIRST_WORD_REGEX = re.compile(r'\s*([A-Za-z]+)(?:\s|$)')
+
 
 class _CommitBear(GlobalBear):
     __metaclass__ = abc.ABCMeta
@@ -52,6 +98,8 @@ class _CommitBear(GlobalBear):
     CONCATENATION_KEYWORDS = [r',', r'\sand\s']
 
     _nltk_data_downloaded = False
+    _pos_tagger = None
+    _imperative_results = {}
 
     @abc.abstractmethod
     def get_remotes():
@@ -65,36 +113,65 @@ class _CommitBear(GlobalBear):
         Return the commit message from the head commit
         """
 
+    @abc.abstractmethod
+    def get_commits(self, commit_range):
+        """
+        Return the SHAs and messages of all commits in the given range,
+        oldest commit first, and the error output.
+        """
+
     def setup_dependencies(self):
         if not self._nltk_data_downloaded and bool(
                 self.section.get('shortlog_imperative_check', True)):
+            # Defer import, nltk takes long to load and is only needed for
+            # the imperative check.
+            import nltk
+
+            # Only download what isn't there yet, so new processes don't
+            # need to ask the nltk servers.
+            missing_data = []
+            for package, path in sorted(NLTK_DATA.items()):
+                try:
+                    nltk.data.find(path)
+                except LookupError:
+                    missing_data.append(package)
+
             logger = logging.getLogger()
             logger.write = lambda msg: logger.debug(
                 msg) if msg != '\n' else None
             with redirect_stdout(logger):
-                nltk.download([
-                    'punkt',
-                    'averaged_perceptron_tagger'
-                ], print_error_to=sys.stdout)
+                if missing_data:
+                    nltk.download(missing_data, print_error_to=sys.stdout)
                 type(self)._nltk_data_downloaded = True
 
+    @staticmethod
+    def get_pos_tagger():
+        """
+        Return the part of speech tagger, it is only loaded once per process.
+        """
+        if _CommitBear._pos_tagger is None:
+            from nltk.tag.perceptron import PerceptronTagger
+
+            _CommitBear._pos_tagger = PerceptronTagger()
+        return _CommitBear._pos_tagger
+
     @classmethod
     def get_shortlog_checks_metadata(cls):
         return FunctionMetadata.from_function(
             cls.check_shortlog,
-            omit={'self', 'shortlog'})
+            omit={'self', 'shortlog', 'commit_sha'})
 
     @classmethod
     def get_body_checks_metadata(cls):
         return FunctionMetadata.from_function(
             cls.check_body,
-            omit={'self', 'body'})
+            omit={'self', 'body', 'commit_sha'})
 
     @classmethod
     def get_issue_checks_metadata(cls):
         return FunctionMetadata.from_function(
             cls.check_issue_reference,
-            omit={'self', 'body'})
+            omit={'self', 'body', 'commit_sha'})
 
     @classmethod
     def get_metadata(cls):
@@ -124,6 +201,7 @@ class _CommitBear(GlobalBear):
 
     def run(self,
             allow_empty_commit_message: bool = False,
+            commit_range: str = '',
             **kwargs):
         """
         Check the current git commit message at HEAD.
@@ -133,35 +211,80 @@ class _CommitBear(GlobalBear):
 
         :param allow_empty_commit_message: Whether empty commit messages are
                                            allowed or not.
+        :param commit_range:               A range of commits to check
+                                           instead of the HEAD commit, e.g.
+                                           ``origin/master..HEAD``.
         """
-        (stdout, stderr) = self.get_head_commit()
+        if commit_range:
+            (commits, stderr) = self.get_commits(commit_range)
+        else:
+            (stdout, stderr) = self.get_head_commit()
+            commits = [(None, stdout)]
 
         if stderr:
             vcs_name = list(self.LANGUAGES)[0].lower()+':'
             self.err(vcs_name, repr(stderr))
             return
 
-        stdout = stdout.rstrip('\n')
-        pos = stdout.find('\n')
-        shortlog = stdout[:pos] if pos != -1 else stdout
-        body = stdout[pos+1:] if pos != -1 else ''
+        if commit_range and kwargs.get('shortlog_imperative_check', True):
+            # Check the shortlogs of all commits at once, the part of speech
+            # tagger is a lot faster on many sentences.
+            shortlogs = [message.rstrip('\n').split('\n', 1)[0]
+                         for _, message in commits]
+            paragraphs = [shortlog[shortlog.find(':') + 1:]
+                          for shortlog in shortlogs if shortlog]
+            self._imperative_results = dict(
+                zip(paragraphs, self.check_imperative_batch(paragraphs)))
+
+        for commit_sha, message in commits:
+            yield from self.check_commit_message(
+                message, allow_empty_commit_message, commit_sha, **kwargs)
+
+    @staticmethod
+    def get_commit_name(commit_sha, head_name='HEAD commit'):
+        """
+        Return the name of the checked commit used in result messages.
+
+        :param commit_sha: The SHA of the commit or ``None`` for HEAD.
+        :param head_name:  The name to use for HEAD.
+        """
+        return head_name if commit_sha is None else 'commit ' + commit_sha[:7]
+
+    def check_commit_message(self, message, allow_empty_commit_message,
+                             commit_sha=None, **kwargs):
+        """
+        Runs all checks on the given commit message.
 
-        if len(stdout) == 0:
+        :param message:                    The raw commit message.
+        :param allow_empty_commit_message: Whether empty commit messages are
+                                           allowed or not.
+        :param commit_sha:                 The SHA of the checked commit or
+                                           ``None`` for HEAD.
+        :param kwargs:                     The settings of the checks.
+        """
+        message = message.rstrip('\n')
+        pos = message.find('\n')
+        shortlog = message[:pos] if pos != -1 else message
+        body = message[pos+1:] if pos != -1 else ''
+
+        if len(message) == 0:
             if not allow_empty_commit_message:
-                yield Result(self, 'HEAD commit has no message.')
+                commit_name = self.get_commit_name(commit_sha)
+                yield Result(self, '{} has no message.'.format(
+                    commit_name[0].upper() + commit_name[1:]))
             return
 
         yield from self.check_shortlog(
-            shortlog,
+            shortlog, commit_sha,
             **self.get_shortlog_checks_metadata().filter_parameters(kwargs))
         yield from self.check_body(
-            body,
+            body, commit_sha,
             **self.get_body_checks_metadata().filter_parameters(kwargs))
         yield from self.check_issue_reference(
-            body,
+            body, commit_sha,
             **self.get_issue_checks_metadata().filter_parameters(kwargs))
 
-    def check_shortlog(self, shortlog,
+    def check_shortlog(self, shortlog, commit_sha=None,
                        shortlog_length: int = 50,
                        shortlog_regex: str = '',
                        shortlog_trailing_period: bool = None,
@@ -172,6 +295,8 @@ class _CommitBear(GlobalBear):
         Checks the given shortlog.
 
         :param shortlog:                 The shortlog message string.
+        :param commit_sha:               The SHA of the checked commit or
+                                         ``None`` for HEAD.
         :param shortlog_length:          The maximum length of the shortlog.
                                          The newline character at end does not
                                          count to the length.
@@ -181,28 +306,32 @@ class _CommitBear(GlobalBear):
         :param shortlog_wip_check:       Whether a "WIP" in the shortlog text
                                          should yield a result or not.
         """
+        commit_name = self.get_commit_name(commit_sha)
         diff = len(shortlog) - shortlog_length
         if diff > 0:
             yield Result(self,
-                         'Shortlog of the HEAD commit contains {} '
+                         'Shortlog of the {} contains {} '
                          'character(s). This is {} character(s) longer than '
                          'the limit ({} > {}).'.format(
-                              len(shortlog), diff,
+                              commit_name, len(shortlog), diff,
                               len(shortlog), shortlog_length))
 
         if (shortlog[-1] != '.') == shortlog_trailing_period:
             yield Result(self,
-                         'Shortlog of HEAD commit contains no period at end.'
+                         'Shortlog of {} contains no period at end.'.format(
+                             commit_name)
                          if shortlog_trailing_period else
-                         'Shortlog of HEAD commit contains a period at end.')
+                         'Shortlog of {} contains a period at end.'.format(
+                             commit_name))
 
         if shortlog_regex:
             match = re.fullmatch(shortlog_regex, shortlog)
             if not match:
                 yield Result(
                     self,
-                    'Shortlog of HEAD commit does not match given regex:'
-                    ' {regex}'.format(regex=shortlog_regex))
+                    'Shortlog of {commit} does not match given regex:'
+                    ' {regex}'.format(commit=commit_name,
+                                      regex=shortlog_regex))
 
         if shortlog_imperative_check:
             colon_pos = shortlog.find(':')
@@ -213,8 +342,9 @@ class _CommitBear(GlobalBear):
             if has_flaws:
                 bad_word = has_flaws[0]
                 yield Result(self,
-                             "Shortlog of HEAD commit isn't in imperative "
-                             "mood! Bad words are '{}'".format(bad_word))
+                             "Shortlog of {} isn't in imperative "
+                             "mood! Bad words are '{}'".format(commit_name,
+                                                               bad_word))
         if shortlog_wip_check:
             if 'wip' in shortlog.lower()[:4]:
                 yield Result(
@@ -232,21 +362,63 @@ class _CommitBear(GlobalBear):
             A list of tuples having 2 elements (invalid word, parts of speech)
             or an empty list if no invalid words are found.
         """
-        words = nltk.word_tokenize(nltk.sent_tokenize(paragraph)[0])
-        # VBZ : Verb, 3rd person singular present, like 'adds', 'writes'
-        #       etc
-        # VBD : Verb, Past tense , like 'added', 'wrote' etc
-        # VBG : Verb, Present participle, like 'adding', 'writing'
-        word, tag = nltk.pos_tag(['I'] + words)[1:2][0]
-        if(tag.startswith('VBZ') or
-           tag.startswith('VBD') or
-           tag.startswith('VBG') or
-           word.endswith('ing')):  # Handle special case for VBG
-            return (word, tag)
-        else:
-            return None
+        if paragraph in self._imperative_results:
+            return self._imperative_results[paragraph]
+
+        return self.check_imperative_batch([paragraph])[0]
+
+    def check_imperative_batch(self, paragraphs):
+        """
+        Check the first sentence of the given paragraphs for Imperatives.
 
-    def check_body(self, body,
+        Paragraphs starting with a word of ``VERB_FORMS`` are checked right
+        away, all others are tagged by the part of speech tagger at once.
+
+        :param paragraphs:
+            The input paragraphs to be tested.
+        :return:
+            A list holding the result of ``check_imperative`` for every
+            paragraph.
+        """
+        results = [None] * len(paragraphs)
+        sentences = []
+        for index, paragraph in enumerate(paragraphs):
+            match = FIRST_WORD_REGEX.match(paragraph)
+            word = match.group(1) if match else ''
+            if word.lower() in IMPERATIVE_WORDS:
+                continue
+            if word.lower() in NON_IMPERATIVE_WORDS:
+                results[index] = (word, NON_IMPERATIVE_WORDS[word.lower()])
+                continue
+
+            import nltk
+
+            first_sentence = nltk.sent_tokenize(paragraph)[:1]
+            words = [word for sentence in first_sentence
+                     for word in nltk.word_tokenize(sentence)]
+            if words:
+                sentences.append((index, ['I'] + words))
+
+        if not sentences:
+            return results
+
+        tagged_sentences = self.get_pos_tagger().tag_sents(
+            words for _, words in sentences)
+        for (index, _), tagged_words in zip(sentences, tagged_sentences):
+            # VBZ : Verb, 3rd person singular present, like 'adds', 'writes'
+            #       etc
+            # VBD : Verb, Past tense , like 'added', 'wrote' etc
+            # VBG : Verb, Present participle, like 'adding', 'writing'
+            word, tag = tagged_words[1]
+            if(tag.startswith('VBZ') or
+               tag.startswith('VBD') or
+               tag.startswith('VBG') or
+               word.endswith('ing')):  # Handle special case for VBG
+                results[index] = (word, tag)
+
+        return results
+
+    def check_body(self, body, commit_sha=None,
                    body_line_length: int = 72,
                    force_body: bool = False,
                    ignore_length_regex: typed_list(str) = (),
@@ -256,6 +428,8 @@ class _CommitBear(GlobalBear):
         Checks the given commit body.
 
         :param body:                The body of the commit message of HEAD.
+        :param commit_sha:          The SHA of the checked commit or ``None``
+                                    for HEAD.
         :param body_line_length:    The maximum line-length of the body. The
                                     newline character at each line end does not
                                     count to the length.
@@ -265,14 +439,16 @@ class _CommitBear(GlobalBear):
         :param body_regex:          If provided, checks the presence of regex
                                     in the commit body.
         """
+        commit_name = self.get_commit_name(commit_sha)
         if len(body) == 0:
             if force_body:
-                yield Result(self, 'No commit message body at HEAD.')
+                yield Result(self, 'No commit message body at {}.'.format(
+                    self.get_commit_name(commit_sha, 'HEAD')))
             return
 
         if body[0] != '\n':
             yield Result(self, 'No newline found between shortlog and body at '
-                               'HEAD commit. Please add one.')
+                               '{}. Please add one.'.format(commit_name))
             return
 
         if body_regex and not re.fullmatch(body_regex, body.strip()):
@@ -284,11 +460,12 @@ class _CommitBear(GlobalBear):
         if any((len(line) > body_line_length and
                 not any(regex.search(line) for regex in ignore_regexes))
                for line in body[1:]):
-            yield Result(self, 'Body of HEAD commit contains too long lines. '
+            yield Result(self, 'Body of {} contains too long lines. '
                                'Commit body lines should not exceed {} '
-                               'characters.'.format(body_line_length))
+                               'characters.'.format(commit_name,
+                                                    body_line_length))
 
-    def check_issue_reference(self, body,
+    def check_issue_reference(self, body, commit_sha=None,
                               body_close_issue: bool = False,
                               body_close_issue_full_url: bool = False,
                               body_close_issue_on_last_line: bool = False,
@@ -299,6 +476,8 @@ class _CommitBear(GlobalBear):
 
         :param body:
             Body of the commit message of HEAD.
+        :param commit_sha:
+            The SHA of the checked commit or ``None`` for HEAD.
         :param body_close_issue:
             GitHub, GitLab and BitBucket support auto closing issues with
             commit messages. When enabled, this checks for matching keywords
@@ -345,13 +524,14 @@ class _CommitBear(GlobalBear):
         if body_close_issue_on_last_line:
             if body:
                 body = body.splitlines()[-1]
-            result_message = ('Body of HEAD commit does not contain any {} '
+            result_message = ('Body of {} does not contain any {} '
                               'reference in the last line.')
         else:
-            result_message = ('Body of HEAD commit does not contain any {} '
+            result_message = ('Body of {} does not contain any {} '
                               'reference.')
 
-        result_message = result_message.format(self.issue_type)
+        result_message = result_message.format(
+            self.get_commit_name(commit_sha), self.issue_type)
 
         concat_regex = '|'.join(kw for kw in self.CONCATENATION_KEYWORDS)
         compiled_joint_regex = re.compile(
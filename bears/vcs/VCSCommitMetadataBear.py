@@ -90,22 +90,43 @@ class VCSCommitMetadataBear(GlobalBear):
                                 added and deleted files.
         """
 
-    def run(self, **kwargs):
+    @abc.abstractmethod
+    def analyze_commit_range(self, commit_range):
+        """
+        Check all commits in the given range.
+
+        Yield the same commit information as ``analyze_commit``
+        for every commit, oldest commit first.
+
+        :param commit_range: The range of commits to check,
+                             e.g. ``origin/master..HEAD``.
+        :return:             An iterable of tuples as
+                             yielded by ``analyze_commit``.
+        """
+
+    def run(self, commit_range: str = '', **kwargs):
         """
         This bear returns information about the HEAD commit
         as HiddenResult which can be used for inspection by
         other bears.
+
+        :param commit_range: A range of commits to inspect instead of
+                             the HEAD commit, e.g. ``origin/master..HEAD``.
         """
-        try:
-            head_commit_sha = self.get_head_commit_sha()
+        if commit_range:
+            commits = self.analyze_commit_range(commit_range)
+        else:
+            try:
+                head_commit_sha = self.get_head_commit_sha()
+
+            except RuntimeError:
+                return
 
-        except RuntimeError:
-            return
+            commits = self.analyze_commit(head_commit_sha)
 
         for (raw_commit_message, commit_sha, parent_commits,
              commit_type, modified_files, added_files,
-             deleted_files) in self.analyze_commit(
-                head_commit_sha):
+             deleted_files) in commits:
 
             yield CommitResult(self, raw_commit_message, commit_sha,
                                parent_commits, commit_type, modified_files,
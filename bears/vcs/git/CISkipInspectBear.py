@@ -1,11 +1,52 @@
-import glob
+import os
 import re
 
 from bears.vcs.git.GitCommitMetadataBear import GitCommitMetadataBear
 from coalib.bears.GlobalBear import GlobalBear
+from coalib.parsing.Globbing import translate
 from coalib.results.Result import Result
 
 
+def get_glob_matcher(patterns):
+    """
+    Compiles the given glob patterns once, so paths can be matched without
+    looking at the file system.
+
+    All patterns are combined into a single regular expression which rejects
+    most paths in one go, only paths it matches are matched against every
+    pattern.
+
+    >>> matcher = get_glob_matcher(['*Test.py', 'tests/**', '*.py'])
+    >>> matcher('BearTest.py')
+    ['*Test.py', '*.py']
+    >>> matcher('tests/vcs/BearTest.py')
+    ['tests/**']
+    >>> matcher('README.md')
+    []
+
+    :param patterns: The glob patterns. ``*`` doesn't match path
+                     separators, ``**`` matches everything.
+    :return:         A function returning the patterns matching the given
+                     path, in the order of ``patterns``.
+    """
+    # Strip the global flags of every translated pattern, they may only be
+    # given once at the start of the combined expression.
+    regexes = [translate(pattern)[len('(?ms)'):] for pattern in patterns]
+    combined_regex = re.compile(
+        '(?ms)' + '|'.join('(?:' + regex + ')' for regex in regexes))
+    pattern_regexes = [(pattern, re.compile('(?ms)' + regex))
+                       for pattern, regex in zip(patterns, regexes)]
+
+    def matcher(path):
+        if not patterns or not combined_regex.match(path):
+            return []
+
+        return [pattern for pattern, regex in pattern_regexes
+                if regex.match(path)]
+
+    return matcher
+
+
 class CISkipInspectBear(GlobalBear):
     LANGUAGES = {'Git'}
     AUTHORS = {'The coala developers'}
@@ -35,6 +76,11 @@ class CISkipInspectBear(GlobalBear):
         if appveyor_ci:
             self.SKIP_CI_REGEX += r'|\[skip appveyor\]'
 
+        patterns = list(self.section['files'])
+        matcher = get_glob_matcher(patterns)
+        # Absolute patterns are matched against the absolute paths.
+        match_absolute = any(os.path.isabs(pattern) for pattern in patterns)
+
         for result in dependency_results[GitCommitMetadataBear.name]:
 
             if appveyor_ci:
@@ -53,9 +99,13 @@ class CISkipInspectBear(GlobalBear):
                          result.added_files + result.deleted_files)
 
             for file in all_files:
-                for pattern in self.section['files']:
-                    if file not in glob.glob(pattern):
-                        continue
+                matching_patterns = matcher(file)
+                if match_absolute:
+                    matching_patterns += [
+                        pattern for pattern in matcher(os.path.abspath(file))
+                        if pattern not in matching_patterns]
+
+                for pattern in matching_patterns:
                     yield Result(
                         self,
                         'This commit modifies a file that has '
@@ -31,6 +31,17 @@ class GitCommitBear(_CommitBear):
 
             return run_shell_command('git log -1 --pretty=%B')
 
+    def get_commits(self, commit_range):
+        with change_directory(self.get_config_dir() or os.getcwd()):
+            stdout, stderr = run_shell_command(
+                ['git', 'log', '-z', '--reverse', '--topo-order',
+                 '--format=%H%x00%B', commit_range])
+
+        # -z terminates every commit with \0, so the SHAs and messages
+        # alternate.
+        fields = stdout.split('\0')[:-1]
+        return list(zip(fields[::2], fields[1::2])), stderr
+
     def check_github_pull_request_temporary_merge_commit(self):
         """
         This function creates a git command to fetch the
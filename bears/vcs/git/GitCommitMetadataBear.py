@@ -3,7 +3,31 @@ import shutil
 
 from bears.vcs.VCSCommitMetadataBear import VCSCommitMetadataBear, COMMIT_TYPE
 from coala_utils.ContextManagers import change_directory
-from coalib.misc.Shell import run_shell_command
+from coalib.misc.Shell import (run_interactive_shell_command,
+                               run_shell_command)
+
+
+def split_stream(stream, separator=b'\0', chunk_size=65536):
+    """
+    Reads the given binary stream chunk by chunk and yields the parts
+    between the separators as soon as they are complete.
+
+    >>> from io import BytesIO
+    >>> list(split_stream(BytesIO(b'a\\0bc\\0\\0d'), chunk_size=2))
+    [b'a', b'bc', b'', b'd']
+
+    :param stream:     The binary stream to read.
+    :param separator:  The bytes separating the parts.
+    :param chunk_size: The number of bytes to read at once.
+    :return:           An iterator over the parts as bytes.
+    """
+    rest = b''
+    for chunk in iter(lambda: stream.read(chunk_size), b''):
+        *parts, rest = (rest + chunk).split(separator)
+        yield from parts
+
+    if rest:
+        yield rest
 
 
 class GitCommitMetadataBear(VCSCommitMetadataBear):
@@ -63,3 +87,58 @@ class GitCommitMetadataBear(VCSCommitMetadataBear):
         yield (head_commit, head_commit_sha, parent_commits_list,
                commit_type, modified_files_list, added_files_list,
                deleted_files_list)
+
+    def analyze_commit_range(self, commit_range):
+        # All commits are retrieved with a single git call, every commit
+        # starts with \1 followed by the SHA, the parents and the message,
+        # the name-status lines follow as status and path(s). With -z all
+        # fields are separated by \0 and paths are not quoted.
+        command = ['git', 'log', '-z', '--reverse', '--topo-order',
+                   '--name-status', '--format=%x01%H%x00%P%x00%B',
+                   commit_range]
+        with run_interactive_shell_command(
+                command,
+                cwd=self.get_config_dir() or os.getcwd(),
+                universal_newlines=False) as process:
+            fields = split_stream(process.stdout)
+            commit = None
+            for field in fields:
+                if field.startswith(b'\1'):
+                    if commit:
+                        yield commit
+
+                    commit_sha = field[1:].decode()
+                    parent_commits = next(fields).decode().split()
+                    raw_commit_message = next(fields).decode(
+                        'utf-8', 'replace') + '\n'
+                    commit_type = COMMIT_TYPE.simple_commit
+                    if len(parent_commits) >= 2:
+                        commit_type |= COMMIT_TYPE.merge_commit
+
+                    commit = (raw_commit_message, commit_sha, parent_commits,
+                              commit_type, [], [], [])
+                    continue
+
+                change = field.decode().strip('\n')
+                if not change:
+                    continue
+
+                file_path = os.fsdecode(next(fields))
+                if change == 'M':
+                    commit[4].append(file_path)
+                elif change == 'A':
+                    commit[5].append(file_path)
+                elif change == 'D':
+                    commit[6].append(file_path)
+                elif change[0] in 'RC':
+                    # Renames and copies are followed by the new path.
+                    next(fields)
+
+            if commit:
+                yield commit
+
+            stderr = process.stderr.read()
+
+        if stderr:
+            vcs_name = list(self.LANGUAGES)[0].lower()+':'
+            self.err(vcs_name, repr(stderr.decode(errors='replace')))
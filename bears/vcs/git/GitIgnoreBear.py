@@ -1,3 +1,4 @@
+import os
 import shutil
 
 from coalib.bears.GlobalBear import GlobalBear
@@ -26,23 +27,30 @@ class GitIgnoreBear(GlobalBear):
         Visit https://github.com/coala/coala-bears/issues/2610
         for more details.
 
+        All tracked files are checked by a single ``git check-ignore``
+        process. The file names are separated by NUL characters, so any file
+        name works.
+
         :return:
-            A list of details of tracked files that are
-            ignored in .gitignore file.
+            A list of tuples holding the ignore file, the line number and
+            the pattern that ignores a tracked file, and the tracked file.
         """
-        files, _ = run_shell_command('git ls-files')
-        files = files.strip().split('\n')
-        ignored = list(map(
-            lambda file: run_shell_command(
-                'git check-ignore --no-index -v {}'.format(file))[0].strip(),
-            files
-        ))
-        return list(filter(lambda f: f != '', ignored))
+        files, _ = run_shell_command('git ls-files -z',
+                                     universal_newlines=False)
+        if not files:
+            return []
+
+        output, _ = run_shell_command(
+            'git check-ignore --no-index --verbose -z --stdin',
+            stdin=files,
+            universal_newlines=False)
+        fields = [os.fsdecode(field) for field in output.split(b'\0')[:-1]]
+        return [tuple(fields[index:index + 4])
+                for index in range(0, len(fields), 4)]
 
     def run(self):
-        for line in GitIgnoreBear.get_ignored_files():
-            pattern, filename = line.split('\t')
-            ignore_filename, line_number, ignore_regex = pattern.split(':')
+        for ignore_filename, line_number, _, filename in (
+                GitIgnoreBear.get_ignored_files()):
             yield self.new_result(
                 message='File {} is being tracked which was ignored in line '
                         'number {} in file {}.'.format(
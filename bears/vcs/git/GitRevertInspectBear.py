@@ -1,6 +1,9 @@
+import os
 import re
+import shutil
 
 from difflib import SequenceMatcher
+from tempfile import mkdtemp
 
 from bears.vcs.git.GitCommitMetadataBear import GitCommitMetadataBear
 from coalib.bears.GlobalBear import GlobalBear
@@ -20,59 +23,126 @@ class GitRevertInspectBear(GlobalBear):
     GIT_REVERT_COMMIT_RE = re.compile(
         r'Revert\s\".+\"\n\nThis\sreverts\scommit\s([0-9a-f]{40})\.')
 
-    def _check_modified_file_similarity(self, file_path,
+    @staticmethod
+    def _get_file_contents(revisions):
+        """
+        Reads the contents of files from the object database with a single
+        ``git cat-file`` process.
+
+        :param revisions: A list of ``<commit>:<path>`` revisions.
+        :return:          A list of the file contents, ``None`` for files
+                          that don't exist.
+        """
+        output, _ = run_shell_command(
+            'git cat-file --batch',
+            stdin=''.join(revision + '\n' for revision in revisions).encode(),
+            universal_newlines=False)
+
+        contents = []
+        pos = 0
+        for _ in revisions:
+            header_end = output.index(b'\n', pos)
+            header = output[pos:header_end].split()
+            if header[-1] == b'missing':
+                contents.append(None)
+                pos = header_end + 1
+                continue
+
+            size = int(header[2])
+            content = output[header_end + 1:header_end + 1 + size]
+            contents.append(content.decode('utf-8', 'replace'))
+            pos = header_end + 1 + size + 1
+
+        return contents
+
+    def _get_expected_revert(self, commit_sha, reverted_commit_sha,
+                             file_paths):
+        """
+        Reverts the reverted commit onto the parent of the revert commit in
+        a temporary worktree, so the working tree and the branches of the
+        repository are left alone.
+
+        :param commit_sha:          Commit hash of the revert commit.
+        :param reverted_commit_sha: Commit hash of reverted commit.
+        :param file_paths:          Relative paths to the files to read from
+                                    the expected revert.
+        :return:                    A list of the expected file contents or
+                                    ``None`` if the reverted commit can't be
+                                    reverted cleanly.
+        """
+        tempdir = mkdtemp()
+        worktree = os.path.join(tempdir, 'worktree')
+        try:
+            _, err = run_shell_command(
+                ['git', 'worktree', 'add', '--detach', worktree,
+                 commit_sha + '^'])
+            if not os.path.isdir(worktree):
+                self.warn('Cannot create a worktree: ' + err)
+                return None
+
+            _, err = run_shell_command(
+                ['git', 'revert', '--no-commit', reverted_commit_sha],
+                cwd=worktree)
+            if err:
+                return None
+
+            expected_contents = []
+            for file_path in file_paths:
+                try:
+                    with open(os.path.join(worktree, file_path), 'rb') as f:
+                        expected_contents.append(
+                            f.read().decode('utf-8', 'replace'))
+                except OSError:
+                    expected_contents.append(None)
+
+            return expected_contents
+        finally:
+            run_shell_command(['git', 'worktree', 'remove', '--force',
+                               worktree])
+            run_shell_command('git worktree prune')
+            shutil.rmtree(tempdir, ignore_errors=True)
+
+    def _check_modified_file_similarity(self, file_paths, commit_sha,
                                         reverted_commit_sha,
                                         minimum_similarity_ratio):
         """
-        Compare the changes in file modified by the
+        Compare the changes in the files modified by the
         revert commit with the changes actually
         expected in the revert commit.
 
-        :param file_path:                   Relative path to the modified
-                                            file.
+        The expected revert is computed once per revert commit, see
+        ``_get_expected_revert``.
+
+        :param file_paths:                  Relative paths to the modified
+                                            files.
+        :param commit_sha:                  Commit hash of the revert
+                                            commit.
         :param reverted_commit_sha:         Commit hash of reverted commit.
         :param minimum_similarity_ratio:    Minimum similarity ratio
                                             required by files in revert
                                             commit.
         """
-        def clean_inspect_revert_branch():
-            run_shell_command('git checkout master')
-            run_shell_command('git branch -D inspectrevertbranch')
-
-        with open(file_path, 'r') as f:
-            revert_file_content = f.read()
-
-        create_new_branch_command = (
-            'git checkout -b inspectrevertbranch HEAD^')
-        run_shell_command(create_new_branch_command)
-
-        create_expected_revert_commit = ('git revert %s --no-'
-                                         'edit' %
-                                         reverted_commit_sha)
-        _, err = run_shell_command(create_expected_revert_commit)
-        if err:
+        expected_contents = self._get_expected_revert(
+            commit_sha, reverted_commit_sha, file_paths)
+        if expected_contents is None:
             self.warn('Cannot compare the modified files.')
-            run_shell_command('git revert --abort')
-            clean_inspect_revert_branch()
             return
 
-        expected_revert_commit_sha = run_shell_command(
-            'git rev-parse HEAD')[0].strip('\n')
-
-        with open(file_path, 'r') as f:
-            expected_revert_file_content = f.read()
-
-        matcher = SequenceMatcher(
-            None, revert_file_content, expected_revert_file_content)
-        similarity_ratio = matcher.real_quick_ratio()
-        if similarity_ratio < minimum_similarity_ratio:
-            yield Result(self, 'Changes in modified file %s of '
-                         'the revert commit are not exactly '
-                         'revert of changes in the reverted '
-                         'commit.' %
-                         file_path)
-
-        clean_inspect_revert_branch()
+        revert_contents = self._get_file_contents(
+            [commit_sha + ':' + file_path for file_path in file_paths])
+
+        for file_path, revert_file_content, expected_revert_file_content in (
+                zip(file_paths, revert_contents, expected_contents)):
+            matcher = SequenceMatcher(
+                None, revert_file_content or '',
+                expected_revert_file_content or '')
+            similarity_ratio = matcher.real_quick_ratio()
+            if similarity_ratio < minimum_similarity_ratio:
+                yield Result(self, 'Changes in modified file %s of '
+                             'the revert commit are not exactly '
+                             'revert of changes in the reverted '
+                             'commit.' %
+                             file_path)
 
     def run(self, dependency_results,
             allow_git_revert_commit: bool = True,
@@ -95,11 +165,11 @@ class GitRevertInspectBear(GlobalBear):
 
             m = self.GIT_REVERT_COMMIT_RE.match(result.raw_commit_message)
             if not m:
-                return
+                continue
 
             if not allow_git_revert_commit:
                 yield Result(self, 'Revert commit is not allowed.')
-                return
+                continue
 
             reverted_commit_sha = m.group(1)
             get_files_command = ('git show --pretty="" --name-status %s' %
@@ -132,12 +202,16 @@ class GitRevertInspectBear(GlobalBear):
                     yield Result(self, result_string.format(
                         'deleted', file_path))
 
+            similar_file_paths = []
             for file_path in result.modified_files:
                 if file_path in reverted_commit_modified_files_list:
-                    yield from self._check_modified_file_similarity(
-                        file_path, reverted_commit_sha,
-                        minimum_similarity_ratio)
+                    similar_file_paths.append(file_path)
 
                 else:
                     yield Result(self, result_string.format(
                         'modified', file_path))
+
+            if similar_file_paths:
+                yield from self._check_modified_file_similarity(
+                    similar_file_paths, result.commit_sha,
+                    reverted_commit_sha, minimum_similarity_ratio)
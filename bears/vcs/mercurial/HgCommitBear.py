@@ -25,3 +25,14 @@ class HgCommitBear(_CommitBear):
     def get_head_commit(self):
         with change_directory(self.get_config_dir() or os.getcwd()):
             return run_shell_command('hg log -l 1 --template "{desc}"')
+
+    def get_commits(self, commit_range):
+        with change_directory(self.get_config_dir() or os.getcwd()):
+            stdout, stderr = run_shell_command(
+                ['hg', 'log', '-r', commit_range,
+                 '--template', r'{node}\0{desc}\0'])
+
+        # Every commit is terminated with \0, so the hashes and messages
+        # alternate.
+        fields = stdout.split('\0')[:-1]
+        return list(zip(fields[::2], fields[1::2])), stderr
@@ -1,5 +1,3 @@
-import requests
-
 from coalib.bearlib.abstractions.Linter import linter
 
 from dependency_management.requirements.GemRequirement import GemRequirement
@@ -29,6 +27,8 @@ class TravisLintBear:
 
     @classmethod
     def check_prerequisites(cls):
+        import requests
+
         base_check = super().check_prerequisites()
         if base_check is not True:
             return base_check
@@ -48,6 +48,8 @@ class TravisLintBear:
 
     @staticmethod
     def get_url_status(url):
+        import requests
+
         try:
             return requests.head(url, allow_redirects=False)
         except requests.exceptions.RequestException:
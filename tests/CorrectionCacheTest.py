@@ -0,0 +1,72 @@
+import os
+import shutil
+import unittest
+from tempfile import mkdtemp
+
+from bears.CorrectionCache import (
+    CorrectionCache, get_corrected_lines, get_correction_cache)
+
+
+class CorrectionCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = mkdtemp()
+        self.data_dir = os.path.join(self.directory, 'data')
+        self.cache_directory = os.path.join(self.data_dir, 'corrections')
+        self.corrected = []
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def correct(self, lines):
+        self.corrected.append(lines)
+        return [line.upper() for line in lines]
+
+    def test_cache(self):
+        cache = CorrectionCache(self.cache_directory, 1024)
+        self.assertIsNone(cache.get('a'))
+
+        cache.set('a', ['x\n', '\udcff\n'])
+        self.assertEqual(cache.get('a'), ['x\n', '\udcff\n'])
+        self.assertEqual(str(cache), 'Correction cache: 1 hits, 1 misses')
+
+    def test_evict(self):
+        cache = CorrectionCache(self.cache_directory, 30)
+        cache.set('a', ['a' * 10])
+        cache.set('b', ['b' * 10])
+        os.utime(os.path.join(self.cache_directory, 'a.json'), (0, 0))
+        os.utime(os.path.join(self.cache_directory, 'b.json'), (1, 1))
+        # Reading marks a as recently used.
+        self.assertEqual(cache.get('a'), ['a' * 10])
+
+        cache.set('c', ['c' * 10])
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('a'), ['a' * 10])
+        self.assertEqual(cache.get('c'), ['c' * 10])
+        self.assertLessEqual(cache.size, 30)
+
+    def test_disabled(self):
+        for _ in range(2):
+            self.assertEqual(
+                get_corrected_lines(self, '1.0', {}, ['a\n'],
+                                    lambda: self.correct(['a\n'])),
+                ['A\n'])
+
+        self.assertEqual(self.corrected, [['a\n'], ['a\n']])
+        self.assertFalse(os.path.exists(self.data_dir))
+
+    def test_get_corrected_lines(self):
+        def get_corrected(tool_version, settings, lines):
+            return get_corrected_lines(self, tool_version, settings, lines,
+                                       lambda: self.correct(lines), 1)
+
+        self.assertEqual(get_corrected('1.0', {}, ['a\n']), ['A\n'])
+        self.assertEqual(get_corrected('1.0', {}, ('a\n',)), ['A\n'])
+        self.assertEqual(get_corrected('1.0', {'x': 1}, ['a\n']), ['A\n'])
+        self.assertEqual(get_corrected('1.1', {}, ['a\n']), ['A\n'])
+        self.assertEqual(get_corrected('1.0', {}, ['b\n']), ['B\n'])
+
+        self.assertEqual(self.corrected,
+                         [['a\n'], ['a\n'], ['a\n'], ['b\n']])
+        cache = get_correction_cache(self.cache_directory, 1024 * 1024)
+        self.assertEqual(cache.hits, 1)
@@ -0,0 +1,91 @@
+import unittest
+from unittest.mock import patch
+
+from coalib.bears.LocalBear import LocalBear
+from dependency_management.requirements.PackageRequirement import (
+    PackageRequirement)
+from dependency_management.requirements.PipRequirement import PipRequirement
+
+from bears.RequirementCache import (
+    cache_requirement_checks, RequirementCache)
+
+
+class RequirementCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        checked = self.checked = []
+
+        class RequirementStub(PackageRequirement):
+
+            def __init__(self, package):
+                PackageRequirement.__init__(self, 'stub', package)
+
+            def is_installed(self):
+                checked.append(self.package)
+                return self.package == 'installed'
+
+        class PipRequirementStub(PipRequirement):
+
+            def is_installed(self):
+                checked.append(self.package)
+                return False
+
+        class TestBear(LocalBear):
+            REQUIREMENTS = {RequirementStub('installed'),
+                            RequirementStub('missing'),
+                            PipRequirementStub('pip'),
+                            PipRequirementStub(
+                                'coala-bears-not-existing-package')}
+
+        class OtherTestBear(LocalBear):
+            REQUIREMENTS = {RequirementStub('installed')}
+
+        self.bears = TestBear, OtherTestBear
+        self.requirements = {str(requirement): requirement
+                             for bear in self.bears
+                             for requirement in bear.REQUIREMENTS}
+        self.cache = RequirementCache()
+        cache_requirement_checks(self.bears, self.cache)
+
+    def is_installed(self, package):
+        return self.requirements[package].is_installed()
+
+    def test_opt_in(self):
+        import bears
+
+        self.assertTrue(hasattr(bears, 'cache_requirement_checks'))
+        self.assertFalse(hasattr(PipRequirement.is_installed,
+                                 'requirement_cache'))
+        self.assertFalse(hasattr(PipRequirement('pip').is_installed,
+                                 'requirement_cache'))
+
+    def test_cache(self):
+        self.assertTrue(self.is_installed('installed'))
+        self.assertFalse(self.is_installed('missing'))
+        self.assertTrue(self.is_installed('installed'))
+        self.assertFalse(self.is_installed('missing'))
+        other_requirement, = self.bears[1].REQUIREMENTS
+        self.assertTrue(other_requirement.is_installed())
+        self.assertEqual(self.checked, ['installed', 'missing'])
+        self.assertEqual(str(self.cache),
+                         'Requirement cache: 2 checks, 3 hits')
+
+        # Requirements are only wrapped once
+        cache_requirement_checks(self.bears, RequirementCache())
+        self.assertTrue(self.is_installed('installed'))
+        self.assertEqual(self.cache.hits, 4)
+
+    def test_environment_change(self):
+        with patch('bears.RequirementCache.get_environment_fingerprint',
+                   side_effect=['before', 'before', 'after']):
+            self.assertTrue(self.is_installed('installed'))
+            self.assertTrue(self.is_installed('installed'))
+            self.assertTrue(self.is_installed('installed'))
+
+        self.assertEqual(self.checked, ['installed', 'installed'])
+
+    def test_pip_lookup(self):
+        self.assertTrue(self.is_installed('pip'))
+        self.assertFalse(self.is_installed(
+            'coala-bears-not-existing-package'))
+        self.assertEqual(self.checked, ['coala-bears-not-existing-package'])
@@ -3,7 +3,8 @@ import unittest
 from unittest.mock import patch
 
 from bears.c_languages.ClangBear import (
-    ClangBear, diff_from_clang_fixit, sourcerange_from_clang_range)
+    ClangBear, diff_from_clang_fixit, sourcerange_from_clang_range,
+    TranslationUnitCache)
 from coalib.results.SourceRange import SourceRange
 from coalib.settings.Section import Section
 from coalib.testing.LocalBearTestHelper import verify_local_bear
@@ -51,6 +52,35 @@ class ClangBearUtilitiesTest(unittest.TestCase):
         compare = SourceRange.from_values('t.c', 1, 2, 3, 4)
         self.assertEqual(uut, compare)
 
+    def test_translation_unit_cache(self):
+        valid = ['int f;\n']
+        invalid = ['struct { int f0; } x = { f0 :1 };\n']
+        try:
+            from clang.cindex import LibclangError
+            uut = TranslationUnitCache(maxsize=2)
+            first = uut.parse('t.c', valid)
+        except (ImportError, LibclangError) as err:
+            raise unittest.case.SkipTest(str(err))
+
+        self.assertIs(uut.parse('t.c', valid), first)
+        self.assertEqual((uut.parses, uut.reparses, uut.hits), (1, 0, 1))
+
+        self.assertIs(uut.parse('t.c', invalid), first)
+        self.assertEqual(len(first.diagnostics), 1)
+        self.assertEqual((uut.parses, uut.reparses, uut.hits), (1, 1, 1))
+
+        with_args = uut.parse('t.c', invalid, args=['-w'])
+        self.assertIsNot(with_args, first)
+        self.assertEqual(len(with_args.diagnostics), 0)
+        uut.parse('u.c', valid)
+        self.assertEqual((uut.parses, uut.reparses, uut.hits), (3, 1, 1))
+        self.assertEqual(str(uut), 'Translation unit cache: 3 parses, '
+                                   '1 reparses, 1 hits')
+
+        # The least recently used translation unit was dropped
+        self.assertIsNot(uut.parse('t.c', invalid), first)
+        self.assertEqual(uut.parses, 4)
+
 
 ClangBearTest = verify_local_bear(
     ClangBear,
@@ -44,6 +44,61 @@ class ClangCloneDetectionBearTest(LocalBearTestHelper):
         self.check_clone_detection_bear(self.clone_files,
                                         lambda results, msg: True)
 
+    def get_function_differences(self, file):
+        return list(ClangFunctionDifferenceBear(
+            {file: ''},
+            self.section,
+            Queue()).run_bear_from_section([], {}))[0].differences
+
+    def test_jobs(self):
+        file = os.path.join(self.base_test_path, 'non_clones',
+                            'sorting_algs.c')
+        self.section.append(Setting('max_clone_difference', '1'))
+        differences = self.get_function_differences(file)
+        self.section.append(Setting('jobs', '2'))
+        self.assertEqual(self.get_function_differences(file), differences)
+        self.assertEqual(len(differences), 10)
+
+    def test_skipped_pairs(self):
+        for file, skipped_pairs in (('clones/several_duplicates.c', 0),
+                                    ('non_clones/sorting_algs.c', 5)):
+            file = os.path.join(self.base_test_path, file)
+            self.section.append(Setting('max_clone_difference', '1'))
+            all_differences = self.get_function_differences(file)
+            self.section.append(Setting('max_clone_difference', '0.185'))
+            differences = self.get_function_differences(file)
+
+            self.assertEqual(len(all_differences) - len(differences),
+                             skipped_pairs)
+            self.assertEqual(
+                [difference for difference in differences
+                 if difference[2] < 0.185],
+                [difference for difference in all_differences
+                 if difference[2] < 0.185])
+
+    def test_only_keep_clones(self):
+        file = os.path.join(self.base_test_path, 'clones',
+                            'several_duplicates.c')
+        all_differences = self.get_function_differences(file)
+        self.section.append(Setting('only_keep_clones', 'true'))
+        result = list(ClangFunctionDifferenceBear(
+            {file: ''},
+            self.section,
+            Queue()).run_bear_from_section([], {}))[0]
+
+        self.assertEqual(list(result.differences),
+                         [difference for difference in all_differences
+                          if difference[2] < 0.308])
+        self.assertEqual(
+            set(result.count_matrices),
+            {function
+             for function_1, function_2, _ in result.differences
+             for function in (function_1, function_2)})
+
+        self.check_clone_detection_bear([file],
+                                        lambda results, msg:
+                                        self.assertNotEqual(results, [], msg))
+
     def test_non_clones(self):
         self.non_clone_files = [
             os.path.join(self.base_test_path, 'non_clones', elem)
@@ -1,6 +1,9 @@
 import os
+import sys
 import unittest
 
+from coala_utils.ContextManagers import prepare_file
+
 from clang.cindex import CursorKind
 
 from bears.c_languages.codeclone_detection.ClangCountVectorCreator import (
@@ -86,3 +89,18 @@ class ClangCountVectorCreatorTest(unittest.TestCase):
         cv_dict = self.uut.get_vectors_for_file(self.testfile)
 
         self.check_cv_dict(cv_dict, expected_results)
+
+    def test_deep_nesting(self):
+        # Every addition is nested into the previous one in the AST
+        depth = sys.getrecursionlimit() + 100
+        lines = ['int f(int a) {\n',
+                 '    return a' + ' + a' * depth + ';\n',
+                 '}\n']
+
+        self.uut = ClangCountVectorCreator([no_condition, is_call_argument])
+        with prepare_file(lines, None, tempfile_kwargs={'suffix': '.c'}) as (
+                _, filename):
+            cv_dict = self.uut.get_vectors_for_file(filename)
+
+        self.check_cv_dict(cv_dict,
+                           {(1, 'f(int)'): {'a': [depth + 2, 0]}})
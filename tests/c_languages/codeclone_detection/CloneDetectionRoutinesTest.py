@@ -1,7 +1,45 @@
+import os
 import unittest
+from tempfile import TemporaryDirectory
 
 from bears.c_languages.codeclone_detection.CloneDetectionRoutines import (
-    relative_difference)
+    CountMatrixCache, compare_count_arrays, compare_functions,
+    get_count_array, get_count_matrices, relative_difference)
+from bears.c_languages.codeclone_detection.CountVector import CountVector
+
+
+def used(stack):
+    return True
+
+
+def returned(stack):
+    return True
+
+
+class CountVectorCreatorStub:
+
+    def __init__(self, conditions, weightings):
+        self.conditions = conditions
+        self.weightings = weightings
+        self.parsed_files = []
+
+    def get_vectors_for_file(self, filename, include_paths):
+        self.parsed_files.append(filename)
+        count_vector = CountVector('x', CountVector.Category.reference,
+                                   self.conditions, self.weightings)
+        for i in range(11):
+            count_vector.count_reference([])
+        return {(1, 'f()'): {'x': count_vector,
+                             'y': count_vector.create_null_vector('y')}}
+
+
+def get_count_matrix(count_vectors):
+    count_matrix = {}
+    for name, counts in count_vectors.items():
+        count_matrix[name] = CountVector(name,
+                                         conditions=[None] * len(counts))
+        count_matrix[name].count_vector = counts
+    return count_matrix
 
 
 class CloneDetectionRoutinesTest(unittest.TestCase):
@@ -18,3 +56,60 @@ class CloneDetectionRoutinesTest(unittest.TestCase):
         self.assertEqual(relative_difference(0, 0), 1)
         self.assertEqual(relative_difference(1, 0), 1)
         self.assertEqual(relative_difference(0.5, 2), 0.25)
+
+    def test_compare_functions(self):
+        cm1 = get_count_matrix({'a': [1, 0], 'b': [0, 2]})
+        cm2 = get_count_matrix({'c': [0, 2]})
+
+        # b is matched with c, a with a zeroed count vector.
+        self.assertAlmostEqual(
+            compare_functions(cm1, cm2, poly_postprocessing=False), 1/3)
+        self.assertAlmostEqual(
+            compare_functions(cm2, cm1, poly_postprocessing=False), 1/3)
+        self.assertAlmostEqual(
+            compare_functions(cm1, cm2, average_calculation=True,
+                              poly_postprocessing=False), 0.5)
+        self.assertAlmostEqual(compare_functions(cm1, cm2), 1/3 * 10/12)
+        self.assertEqual(compare_functions(cm1, cm1), 0)
+
+    def test_compare_count_arrays(self):
+        cm1 = get_count_matrix({'a': [1, 0, 3], 'b': [0, 2, 1]})
+        cm2 = get_count_matrix({'c': [0, 2, 2], 'd': [4, 0, 0],
+                                'e': [1, 1, 1]})
+        self.assertEqual(get_count_array(cm1).tolist(),
+                         [[1, 0, 3], [0, 2, 1]])
+        self.assertEqual(compare_count_arrays(get_count_array(cm1),
+                                              get_count_array(cm2)),
+                         compare_functions(cm1, cm2))
+
+    def test_count_matrix_cache(self):
+        with TemporaryDirectory() as directory:
+            filename = os.path.join(directory, 'file.c')
+            with open(filename, 'w') as file:
+                file.write('int f() {}')
+
+            def get_count_matrices_cached(creator):
+                return get_count_matrices(
+                    creator, [filename], lambda progress: None, filename, [],
+                    CountMatrixCache(os.path.join(directory, 'cache.db')))
+
+            creator = CountVectorCreatorStub([used, returned], [1, 2])
+            self.assertEqual(list(get_count_matrices_cached(creator)),
+                             [(filename, 1, 'f()')])
+            cached = get_count_matrices_cached(creator)[filename, 1, 'f()']
+            self.assertEqual(creator.parsed_files, [filename])
+            self.assertEqual(cached['x'].count_vector, [11, 22])
+            self.assertEqual(cached['x'].unweighted, [11, 11])
+            self.assertEqual(cached['y'].count_vector, [0, 0])
+            self.assertEqual(cached['x'].category,
+                             CountVector.Category.reference)
+            self.assertEqual(cached['x'].conditions, [used, returned])
+
+            # Changing the weightings or the file invalidates the cache
+            creator = CountVectorCreatorStub([used, returned], [1, 3])
+            get_count_matrices_cached(creator)
+            get_count_matrices_cached(creator)
+            with open(filename, 'w') as file:
+                file.write('int f() { return 0; }')
+            get_count_matrices_cached(creator)
+            self.assertEqual(creator.parsed_files, [filename, filename])
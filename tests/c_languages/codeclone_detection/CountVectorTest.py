@@ -46,6 +46,19 @@ class CountVectorTest(unittest.TestCase):
         self.assertEqual(uut.count_vector, [2, 2])
         self.assertEqual(uut.unweighted, [1, 2])
 
+    def test_partial_counting(self):
+        uut = CountVector('varname',
+                          conditions=[lambda cursor: cursor,
+                                      lambda cursor: cursor],
+                          weightings=[2, 1])
+        uut.count_reference_for([1], True)
+        self.assertEqual(uut.count_vector, [0, 1])
+        uut.count_reference_for([], True)
+        self.assertEqual(uut.count_vector, [0, 1])
+        uut.count_reference_for([0, 1], True)
+        self.assertEqual(uut.count_vector, [2, 2])
+        self.assertEqual(uut.unweighted, [1, 2])
+
     def test_conversions(self):
         uut = CountVector('varname',
                           conditions=[lambda cursor, stack: cursor and stack],
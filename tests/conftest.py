@@ -8,3 +8,31 @@ except ImportError:
 if check_requirements:
     def pytest_collection_modifyitems(config, session, items):
         check_requirements(config, session, items)
+
+
+def pytest_sessionstart(session):
+    """
+    Caches the requirement checks of all bears, before the tests check them
+    to decide which ones to skip.
+    """
+    import importlib
+    import pkgutil
+
+    from coalib.bears.Bear import Bear
+    from coalib.core.Bear import Bear as CoreBear
+
+    import bears
+
+    bear_classes = set()
+    for module_info in pkgutil.walk_packages(bears.__path__, 'bears.',
+                                             onerror=lambda name: None):
+        try:
+            module = importlib.import_module(module_info.name)
+        except Exception:
+            continue
+
+        bear_classes.update(
+            value for value in vars(module).values()
+            if isinstance(value, type) and issubclass(value, (Bear, CoreBear)))
+
+    bears.cache_requirement_checks(bear_classes)
@@ -1,7 +1,8 @@
 from queue import Queue
 import unittest
 
-from bears.general.AnnotationBear import AnnotationBear
+from bears.general.AnnotationBear import (
+    AnnotationBear, get_language_definition, language_definition_cache_info)
 from coalib.results.SourceRange import SourceRange
 from coalib.results.AbsolutePosition import AbsolutePosition
 from coalib.results.HiddenResult import HiddenResult
@@ -150,3 +151,45 @@ class AnnotationBearTest(unittest.TestCase):
                 # That lead to a Result being yielded because of unclosed
                 # quotes, this asserts that no such thing happened.
                 self.assertEqual(type(result), HiddenResult)
+
+    def test_escaped_newline(self):
+        text = ['// comment \\\n', 'continued\n',
+                '"string \\\n', 'continued"\n']
+        compare = [(SourceRange.from_values('F', 3, 1, 4, 10),),
+                   (SourceRange.from_values('F', 1, 1, 2, 10),)]
+        with execute_bear(self.c_uut, 'F', text) as result:
+            self.assertEqual(result[0].contents['strings'], compare[0])
+            self.assertEqual(result[0].contents['comments'], compare[1])
+
+    def test_large_file(self):
+        text = ['def f():  # comment\n',
+                '    """docstring"""\n',
+                "    return 'a' + \"b\"\n"] * 10000
+        with execute_bear(self.python_uut, 'F', text) as result:
+            strings = result[0].contents['strings']
+            comments = result[0].contents['comments']
+            self.assertEqual(len(strings), 30000)
+            self.assertEqual(len(comments), 10000)
+            self.assertEqual(strings[-1],
+                             SourceRange.from_values('F', 30000, 18, 30000,
+                                                     20))
+            self.assertEqual(comments[-1],
+                             SourceRange.from_values('F', 29998, 11, 29998,
+                                                     20))
+
+    def test_language_definition_cache(self):
+        text = ['"string" # comment\n']
+        with execute_bear(self.c_uut, 'F', text):
+            pass
+        cache_info = language_definition_cache_info()
+        with execute_bear(self.c_uut, 'F', text):
+            pass
+        self.assertEqual(language_definition_cache_info().hits,
+                         cache_info.hits + 1)
+        self.assertEqual(language_definition_cache_info().misses,
+                         cache_info.misses)
+
+        self.assertIs(get_language_definition('c'),
+                      get_language_definition('c'))
+        self.assertIsNot(get_language_definition('c'),
+                         get_language_definition('python 3'))
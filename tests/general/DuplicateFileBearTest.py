@@ -3,7 +3,9 @@ import os
 
 from coalib.settings.Section import Section
 from coalib.results.RESULT_SEVERITY import RESULT_SEVERITY
-from bears.general.DuplicateFileBear import DuplicateFileBear
+from bears.general.DuplicateFileBear import (
+    DuplicateFileBear, get_duplicate_groups, get_shingles,
+    get_similar_pairs)
 from queue import Queue
 
 
@@ -63,3 +65,74 @@ class DuplicateFileBearTest(unittest.TestCase):
         messages = [result.message for result in results]
         self.assertEqual(messages, ['You included only one file'])
         self.assertEqual(results[0].severity, RESULT_SEVERITY.MAJOR)
+
+    def test_duplicate_group(self):
+        self.get_results(['smallFirst.txt', 'noMatch.txt',
+                          'smallSecond.txt', 'complexFirst.txt'])
+        self.file_dict['third'] = self.file_dict[
+            get_absolute_test_path('smallFirst.txt')]
+        results = list(self.uut.run())
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0].message,
+                         'File {} is identical to File {}, File third'.format(
+                             get_absolute_test_path('smallFirst.txt'),
+                             get_absolute_test_path('smallSecond.txt')))
+        self.assertEqual([code.file for code in results[0].affected_code],
+                         [get_absolute_test_path('smallFirst.txt'),
+                          get_absolute_test_path('smallSecond.txt'),
+                          os.path.abspath('third')])
+
+    def test_many_files(self):
+        file_dict = {'file{}'.format(i): ('line {}\n'.format(i % 5000),
+                                          'same length\n')
+                     for i in range(10000)}
+        file_dict['other'] = ('line 0\n', 'same lengtH\n')
+        groups = get_duplicate_groups(file_dict)
+        self.assertEqual(len(groups), 5000)
+        self.assertEqual(groups[0], ['file0', 'file5000'])
+        self.assertEqual(groups[-1], ['file4999', 'file9999'])
+
+    def test_similar_files(self):
+        base = tuple('line {}\n'.format(i) for i in range(100))
+        self.file_dict = {
+            'first': ('# header\n',) + base,
+            'copy': ('# header\n',) + base,
+            'second': ('# other header\n',) + base[:50] + ('\n',) + base[50:],
+            'different': tuple('other {}\n'.format(i) for i in range(100)),
+        }
+        self.uut = DuplicateFileBear(self.file_dict, self.section,
+                                     self.queue)
+        results = list(self.uut.run(similarity_threshold=0.9))
+        self.assertEqual([result.message for result in results],
+                         ['File first is identical to File copy',
+                          'File first is 98% similar to File second'])
+        self.assertEqual([code.file for code in results[1].affected_code],
+                         [os.path.abspath('first'),
+                          os.path.abspath('second')])
+
+        results = list(self.uut.run())
+        self.assertEqual([result.message for result in results],
+                         ['File first is identical to File copy'])
+
+    def test_stable_shingles(self):
+        # The shingles don't depend on PYTHONHASHSEED, so similar files are
+        # found the same way in every run.
+        self.assertEqual(get_shingles(('a\n', ' b\n', 'c\n'), 2),
+                         {18217385946561732713, 1295913956253624349})
+
+    def test_invalid_similarity_threshold(self):
+        self.get_results(self.test_files[:2])
+        self.assertEqual(list(self.uut.run(similarity_threshold=0)), [])
+        self.assertEqual(self.queue.get().message,
+                         'The similarity threshold must be greater than 0 '
+                         'and at most 1.')
+
+    def test_many_similar_files(self):
+        file_dict = {}
+        for i in range(5000):
+            lines = tuple('line {} {}\n'.format(i, j) for j in range(20))
+            file_dict['file{}'.format(i)] = lines
+            file_dict['near{}'.format(i)] = lines[:19] + ('changed\n',)
+        pairs = get_similar_pairs(file_dict, 0.8)
+        self.assertEqual(len(pairs), 5000)
+        self.assertEqual(pairs[0], ('file0', 'near0', 17 / 19))
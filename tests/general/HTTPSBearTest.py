@@ -114,7 +114,7 @@ class HTTPSBearTest(LocalBearTestHelper):
         """.splitlines()
 
         with unittest.mock.patch(
-            'requests.head',
+            'requests.Session.head',
             side_effect=requests.exceptions.RequestException,
         ) as check:
             self.check_validity(self.uut, test_link)
@@ -123,3 +123,20 @@ class HTTPSBearTest(LocalBearTestHelper):
                 allow_redirects=False,
                 timeout=HTTPSBear.DEFAULT_TIMEOUT,
             )
+
+    def test_probe_https(self):
+        test_link = """
+        http://httpbin.org/status/v200
+        http://httpbin.org/status/i200
+        """.splitlines()
+
+        with requests_mock.Mocker() as m:
+            m.add_matcher(custom_matcher_https)
+            self.check_line_result_count(self.uut, test_link, [1, 0],
+                                         settings={'probe_https': True})
+            self.assertEqual(
+                sorted(request.url for request in m.request_history),
+                ['http://httpbin.org/status/i200',
+                 'http://httpbin.org/status/v200',
+                 'https://httpbin.org/status/i200',
+                 'https://httpbin.org/status/v200'])
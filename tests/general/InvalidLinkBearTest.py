@@ -7,11 +7,13 @@ import unittest
 import unittest.mock
 
 from bears.general.InvalidLinkBear import InvalidLinkBear
-from bears.general.URLHeadBear import URLHeadBear
+from bears.general.URLBear import LINK_CONTEXT
+from bears.general.URLHeadBear import URLHeadBear, URLHeadResult
 from coalib.testing.LocalBearTestHelper import LocalBearTestHelper
 from coalib.results.Diff import Diff
 from coalib.results.RESULT_SEVERITY import RESULT_SEVERITY
 from coalib.results.Result import Result
+from coalib.results.SourceRange import SourceRange
 from coalib.settings.Section import Section
 from coala_utils.ContextManagers import prepare_file
 
@@ -275,6 +277,25 @@ class InvalidLinkBearTest(LocalBearTestHelper):
                 settings={'follow_redirects': 'true'},
                 filename='short_url_redirect_text')
 
+    def test_redirect_urls_of_dependency(self):
+        response = requests.Response()
+        response.status_code = 301
+        dependency_results = {URLHeadBear.name: [URLHeadResult(
+            URLHeadBear, (SourceRange.from_values('F', 1),),
+            'http://httpbin.org/status/301', response,
+            LINK_CONTEXT.no_context,
+            redirect_urls=('http://httpbin.org/status/301',
+                           'http://httpbin.org/get'))]}
+
+        # No requests are made, the redirects followed by the URLHeadBear
+        # are used.
+        with requests_mock.Mocker():
+            results = list(self.uut.run('F', ['http://httpbin.org/status/301'],
+                                        dependency_results,
+                                        follow_redirects=True))
+        self.assertEqual([result.message for result in results],
+                         ['This link redirects to http://httpbin.org/get'])
+
     def test_multiple_results_per_line(self):
         test_file = """
         http://httpbin.org/status/410
@@ -448,7 +469,7 @@ class InvalidLinkBearTest(LocalBearTestHelper):
             return res
 
         with unittest.mock.patch(
-                'tests.general.InvalidLinkBearTest.requests.head',
+                'requests.Session.head',
                 return_value=response(status_code=200)) as mock:
             self.check_validity(self.uut, file_contents,
                                 settings={'network_timeout': nt})
@@ -462,18 +483,20 @@ class InvalidLinkBearTest(LocalBearTestHelper):
                                   'instead.'])
 
             self.check_validity(self.uut, ['https://gitmate.io'])
-            mock.assert_has_calls([
-                unittest.mock.call('https://facebook.com/', timeout=2,
-                                   allow_redirects=False),
-                unittest.mock.call('https://google.com/',
-                                   timeout=10, allow_redirects=False),
-                unittest.mock.call('https://coala.io/som/thingg/page/123',
-                                   timeout=25, allow_redirects=False),
-                unittest.mock.call('https://facebook.com/', timeout=20,
-                                   allow_redirects=False),
-                unittest.mock.call('https://google.com/',
-                                   timeout=20, allow_redirects=False),
-                unittest.mock.call('https://coala.io/som/thingg/page/123',
-                                   timeout=20, allow_redirects=False),
-                unittest.mock.call('https://gitmate.io',
-                                   timeout=15, allow_redirects=False)])
+            mock.assert_has_calls(
+                [
+                    unittest.mock.call('https://facebook.com/', timeout=2,
+                                       allow_redirects=False),
+                    unittest.mock.call('https://google.com/',
+                                       timeout=10, allow_redirects=False),
+                    unittest.mock.call('https://coala.io/som/thingg/page/123',
+                                       timeout=25, allow_redirects=False),
+                    unittest.mock.call('https://facebook.com/', timeout=20,
+                                       allow_redirects=False),
+                    unittest.mock.call('https://google.com/',
+                                       timeout=20, allow_redirects=False),
+                    unittest.mock.call('https://coala.io/som/thingg/page/123',
+                                       timeout=20, allow_redirects=False),
+                    unittest.mock.call('https://gitmate.io',
+                                       timeout=15, allow_redirects=False)],
+                any_order=True)
@@ -10,8 +10,10 @@ from bears.general.URLHeadBear import URLHeadBear
 
 from coalib.results.Result import Result
 from coalib.settings.Section import Section
+from coalib.settings.Setting import Setting
 from coalib.results.RESULT_SEVERITY import RESULT_SEVERITY
-from coalib.testing.LocalBearTestHelper import LocalBearTestHelper
+from coalib.testing.LocalBearTestHelper import (
+    get_results, LocalBearTestHelper)
 
 from queue import Queue
 
@@ -249,10 +251,13 @@ class MementoBearTest(LocalBearTestHelper):
             memento_archive_status_mock(m, 'http://redirect9times.com')
             generate_redirects(m, 'http://redirect9times.com', 9)
 
-            redirect_links = MementoBear.get_redirect_urls(
-                'http://redirect9times.com')
-            self.assertTrue(len(redirect_links) == 9)
+            self.check_line_result_count(self.uut, invalid_file, [9])
 
+            # The redirects followed by the URLHeadBear are used as well.
+            self.section.append(Setting('probe_redirects', True))
+            url_results = get_results(URLHeadBear(self.section, Queue()),
+                                      invalid_file)
+            self.assertEqual(len(url_results[0].redirect_urls), 10)
             self.check_line_result_count(self.uut, invalid_file, [9])
 
             # Mark the first redirect url as archived
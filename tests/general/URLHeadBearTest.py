@@ -1,11 +1,21 @@
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+from tempfile import TemporaryDirectory
+from threading import Lock, Thread
+import os
+import time
 import unittest
+import unittest.mock
 import requests
 import requests_mock
 
-from bears.general.URLHeadBear import URLHeadBear, LINK_CONTEXT, URLHeadResult
+from bears.general.URLHeadBear import (
+    get_link_status_cache, get_requested_links, LINK_CONTEXT, URLHeadBear,
+    URLHeadResult)
 from coalib.results.SourceRange import SourceRange
 from coalib.testing.LocalBearTestHelper import get_results
 from coalib.settings.Section import Section
+from coalib.settings.Setting import Setting
 from queue import Queue
 from .InvalidLinkBearTest import custom_matcher
 
@@ -61,6 +71,202 @@ class URLHeadBearTest(unittest.TestCase):
                              [3, 'http://www.google.com/404',
                               404, LINK_CONTEXT.no_context])
 
+    def test_probe_redirects(self):
+        redirect_file = ['http://www.google.com/302\n']
+
+        with requests_mock.Mocker() as m:
+            m.add_matcher(custom_matcher)
+
+            result = get_results(self.uut, redirect_file)
+            self.assertIsNone(result[0].redirect_urls)
+            self.assertEqual(m.call_count, 1)
+
+            self.section.append(Setting('probe_redirects', True))
+            result = get_results(self.uut, redirect_file)
+            self.assertEqual(result[0].redirect_urls,
+                             ('http://httpbin.org/get',))
+            # The head response of the link is reused within the section.
+            self.assertEqual(m.call_count, 2)
+
+    def test_requested_links_scope(self):
+        requested_links = get_requested_links(self.section, {'*': 15})
+        self.assertIs(get_requested_links(self.section, {'*': 15}),
+                      requested_links)
+        self.assertIsNot(get_requested_links(self.section, {'*': 20}),
+                         requested_links)
+        self.assertIsNot(get_requested_links(Section(''), {'*': 15}),
+                         requested_links)
+
+
+class URLHeadBearCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.ib_check_prerequisites = URLHeadBear.check_prerequisites
+        URLHeadBear.check_prerequisites = lambda *args: True
+        self.data_dir = TemporaryDirectory()
+        self.data_dir_patch = unittest.mock.patch.object(
+            URLHeadBear, 'data_dir', self.data_dir.name)
+        self.data_dir_patch.start()
+        get_link_status_cache.cache_clear()
+        self.section = Section('')
+        self.section.append(Setting('link_status_cache_ttl', 3600))
+        self.section.append(Setting('probe_redirects', True))
+        self.uut = URLHeadBear(self.section, Queue())
+        self.file = """
+        http://www.facebook.com/200
+        http://www.google.com/302
+        http://www.google.com/302
+        http://www.github.com/nothing
+        """.splitlines()
+
+    def tearDown(self):
+        URLHeadBear.check_prerequisites = self.ib_check_prerequisites
+        self.data_dir_patch.stop()
+        get_link_status_cache.cache_clear()
+        self.data_dir.cleanup()
+
+    def start_run(self):
+        self.section = self.section.copy()
+        self.uut = URLHeadBear(self.section, Queue())
+
+    def get_status_codes(self):
+        results = get_results(self.uut, self.file)
+        self.assertEqual(results[1].redirect_urls, ('http://httpbin.org/get',))
+        return [result.http_status_code for result in results]
+
+    def test_cached_links(self):
+        with requests_mock.Mocker() as m:
+            m.add_matcher(custom_matcher)
+            self.assertEqual(self.get_status_codes(), [200, 302, 302, None])
+            # The redirects of the 302 link are followed as well.
+            self.assertEqual(m.call_count, 4)
+
+            # Links are only requested once for all files in a run.
+            self.assertEqual(self.get_status_codes(), [200, 302, 302, None])
+            self.assertEqual(m.call_count, 4)
+
+            # Later runs read the cache from disk, except for the links which
+            # could not be connected to.
+            get_link_status_cache.cache_clear()
+            self.start_run()
+            self.assertEqual(self.get_status_codes(), [200, 302, 302, None])
+            self.assertEqual(m.call_count, 5)
+            self.assertEqual(m.request_history[4].url,
+                             'http://www.github.com/nothing')
+
+    def test_redirect_target(self):
+        response = requests.models.Response()
+        response.status_code = 301
+        response.headers['Location'] = 'https://coala.io/'
+        cache = get_link_status_cache(
+            os.path.join(self.data_dir.name, 'test.sqlite3'), 60)
+        cache.add({'http://coala.io/': response,
+                   'http://gitmate.io/': requests.exceptions.Timeout()})
+
+        get_link_status_cache.cache_clear()
+        cache = get_link_status_cache(
+            os.path.join(self.data_dir.name, 'test.sqlite3'), 60)
+        cached = cache.get(['http://coala.io/', 'http://gitmate.io/'])
+        self.assertEqual(list(cached), ['http://coala.io/'])
+        self.assertEqual(cached['http://coala.io/'].status_code, 301)
+        self.assertEqual(cached['http://coala.io/'].headers['location'],
+                         'https://coala.io/')
+
+    def test_expired_links(self):
+        with requests_mock.Mocker() as m:
+            m.add_matcher(custom_matcher)
+            self.get_status_codes()
+            self.start_run()
+            with unittest.mock.patch('time.time',
+                                     return_value=time.time() + 3601):
+                self.get_status_codes()
+            self.assertEqual(m.call_count, 8)
+
+    def test_disabled_cache(self):
+        self.section.append(Setting('link_status_cache_ttl', 0))
+        with requests_mock.Mocker() as m:
+            m.add_matcher(custom_matcher)
+            self.get_status_codes()
+            self.get_status_codes()
+            self.assertEqual(m.call_count, 4)
+
+            self.start_run()
+            self.get_status_codes()
+            self.assertEqual(m.call_count, 8)
+        self.assertEqual(get_link_status_cache.cache_info().currsize, 0)
+
+
+class SlowHeadRequestHandler(BaseHTTPRequestHandler):
+    """
+    Responds to HEAD requests after a delay with the last three characters of
+    the path as status code, keeping track of the number of requests handled
+    at the same time.
+    """
+    delay = 0.1
+
+    def do_HEAD(self):
+        with self.server.lock:
+            self.server.active += 1
+            self.server.max_active = max(self.server.max_active,
+                                         self.server.active)
+        time.sleep(self.delay)
+        with self.server.lock:
+            self.server.active -= 1
+        self.send_response(int(self.path[-3:]))
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+class ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class URLHeadBearConcurrencyTest(unittest.TestCase):
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0),
+                                          SlowHeadRequestHandler)
+        self.server.lock = Lock()
+        self.server.active = self.server.max_active = 0
+        Thread(target=self.server.serve_forever, daemon=True).start()
+        self.links = ['http://127.0.0.1:%d/%d/%d' % (
+                          self.server.server_port, i, 200 + i % 2 * 204)
+                      for i in range(20)]
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_throughput(self):
+        start = time.perf_counter()
+        serial_codes = [URLHeadBear.get_head_response(link, 15).status_code
+                        for link in self.links]
+        serial_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        concurrent_codes = [
+            response.status_code
+            for response in URLHeadBear.get_head_responses(
+                self.links, {}, max_concurrency=10,
+                max_concurrency_per_host=10)]
+        concurrent_time = time.perf_counter() - start
+
+        self.assertEqual(serial_codes, [200, 404] * 10)
+        self.assertEqual(concurrent_codes, serial_codes)
+        self.assertLess(concurrent_time * 2, serial_time)
+
+    def test_max_concurrency_per_host(self):
+        responses = URLHeadBear.get_head_responses(
+            self.links + self.links[:5], {}, max_concurrency=10,
+            max_concurrency_per_host=3)
+
+        self.assertEqual([response.status_code for response in responses],
+                         [200, 404] * 10 + [200, 404, 200, 404, 200])
+        self.assertIs(responses[0], responses[20])
+        self.assertEqual(self.server.max_active, 3)
+
 
 class URLHeadResultTest(unittest.TestCase):
 
@@ -1,7 +1,12 @@
 from bears.python.PyImportSortBear import PyImportSortBear
+from coala_utils.ContextManagers import change_directory
 from coalib.testing.LocalBearTestHelper import verify_local_bear
+import os
+import shutil
 import unittest
 from queue import Queue
+from tempfile import mkdtemp
+from unittest.mock import patch
 
 from coalib.settings.Section import Section
 
@@ -64,6 +69,37 @@ import requests
                          ['\n', 'import os\n', 'import re\n', '\n',
                           'import requests\n'])
 
+    def test_cached_correction_config(self):
+        directory = mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        configured_directory = os.path.join(directory, 'configured')
+        os.mkdir(configured_directory)
+        with open(os.path.join(configured_directory, 'setup.cfg'), 'w') as f:
+            f.write('[isort]\nknown_standard_library = requests\n')
+
+        test_file = ['import os\n', 'import requests\n']
+        with patch.object(PyImportSortBear, 'data_dir', directory):
+            with change_directory(directory):
+                self.assertEqual(len(list(self.uut.run(
+                    '', test_file, correction_cache_size=1))), 1)
+            with change_directory(configured_directory):
+                self.assertEqual(list(self.uut.run(
+                    '', test_file, correction_cache_size=1)), [])
+        self.assertTrue(os.listdir(os.path.join(directory, 'corrections')))
+
+    def test_cache_settings(self):
+        with patch.object(PyImportSortBear,
+                          '_get_cache_settings') as get_cache_settings:
+            list(self.uut.run('', ['import os\n']))
+            self.assertFalse(get_cache_settings.called)
+
+        with patch('isort.settings.from_path') as from_path:
+            from_path.return_value = {'known_third_party': ['b', 'a'],
+                                      'forced_separate': ['b', 'a']}
+            config = self.uut._get_cache_settings({})['config']
+            self.assertEqual(config, {'known_third_party': ['a', 'b'],
+                                      'forced_separate': ['b', 'a']})
+
     def test_treat_seperated_imports_independently(self):
         test_file = (
             """
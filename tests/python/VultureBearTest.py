@@ -1,12 +1,16 @@
 import os
+import shutil
 import unittest
 from queue import Queue
+from tempfile import mkdtemp
 from textwrap import dedent
 from contextlib import ExitStack, contextmanager
+from unittest.mock import patch
 
 from coala_utils.ContextManagers import prepare_file
 from coalib.settings.Section import Section
 
+from bears.python import VultureBear as VultureBearModule
 from bears.python.VultureBear import VultureBear
 
 
@@ -26,6 +30,12 @@ class VultureBearTest(unittest.TestCase):
         self.queue = Queue()
         self.file_dict = {}
         self.uut = VultureBear(self.file_dict, self.section, self.queue)
+        self.data_directory = mkdtemp()
+        patcher = patch('coalib.misc.Constants.USER_DATA_DIR',
+                        self.data_directory)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(shutil.rmtree, self.data_directory)
 
     def get_results(self, *files):
         """
@@ -52,6 +62,11 @@ class VultureBearTest(unittest.TestCase):
 
             return list(self.uut.run())
 
+    def get_messages(self, **kwargs):
+        return sorted((os.path.basename(result.affected_code[0].file),
+                       result.message)
+                      for result in self.uut.run(**kwargs))
+
     def verify_results(self, test_file, expected):
         detected = dict((item.message, (item.affected_code[0].start.line,
                                         item.affected_code[0].end.line,
@@ -108,3 +123,45 @@ class VultureBearTest(unittest.TestCase):
         self.verify_results('unreachable_else.py', {
             "unreachable 'else' block": (3, 6, 100)
         })
+
+    def test_cache(self):
+        directory = mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        first = os.path.join(directory, 'first.py')
+        second = os.path.join(directory, 'second.py')
+        self.file_dict[first] = ['def used():\n', '    pass\n',
+                                 'def unused():\n', '    pass\n']
+        self.file_dict[second] = ['from first import used\n', 'used()\n']
+
+        expected = [('first.py', "unused function 'unused'")]
+        with patch.object(VultureBearModule, '_scan_file',
+                          wraps=VultureBearModule._scan_file) as scan_file:
+            self.assertEqual(self.get_messages(), expected)
+            self.assertEqual(scan_file.call_count, 2)
+
+            self.assertEqual(self.get_messages(), expected)
+            self.assertEqual(scan_file.call_count, 2)
+
+            self.file_dict[second] = ['print(1)\n']
+            expected = [('first.py', "unused function 'unused'"),
+                        ('first.py', "unused function 'used'")]
+            self.assertEqual(self.get_messages(), expected)
+            self.assertEqual(self.get_messages(use_cache=False), expected)
+            self.assertEqual(scan_file.call_count, 5)
+
+            del self.file_dict[second]
+            self.assertEqual(self.get_messages(), expected)
+            self.assertEqual(scan_file.call_count, 5)
+
+    def test_jobs(self):
+        for index in range(4):
+            filename = os.path.join(self.data_directory,
+                                    'file{}.py'.format(index))
+            self.file_dict[filename] = [
+                'def function{}():\n'.format(index),
+                '    return function{}()\n'.format((index + 1) % 3)]
+
+        expected = [('file3.py', "unused function 'function3'")]
+        self.assertEqual(self.get_messages(use_cache=False, jobs=2), expected)
+        self.assertEqual(self.get_messages(jobs=0), expected)
+        self.assertEqual(self.get_messages(use_cache=False), expected)
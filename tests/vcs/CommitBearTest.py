@@ -114,3 +114,58 @@ class CommitBearTest(unittest.TestCase):
         FakeCommitBear._nltk_data_downloaded = False
         FakeCommitBear(None, section, self.msg_queue)
         self.assertTrue(FakeCommitBear._nltk_data_downloaded)
+
+    def test_nltk_data_available(self):
+        section = Section('commit')
+
+        FakeCommitBear._nltk_data_downloaded = False
+        with unittest.mock.patch('nltk.data.find') as find, \
+                unittest.mock.patch('nltk.download') as download:
+            FakeCommitBear(None, section, self.msg_queue)
+
+        self.assertEqual(find.call_count, 2)
+        self.assertFalse(download.called)
+        self.assertTrue(FakeCommitBear._nltk_data_downloaded)
+
+    def test_pos_tagger_loaded_once(self):
+        with unittest.mock.patch('nltk.tag.perceptron.PerceptronTagger') as (
+                tagger_class), \
+                unittest.mock.patch.object(_CommitBear, '_pos_tagger', None):
+            tagger = self.uut.get_pos_tagger()
+            self.assertIs(self.uut.get_pos_tagger(), tagger)
+            self.assertIs(FakeCommitBear(None, Section('commit'),
+                                         self.msg_queue).get_pos_tagger(),
+                          tagger)
+
+        tagger_class.assert_called_once_with()
+
+    def test_check_imperative_known_words(self):
+        with unittest.mock.patch.object(_CommitBear,
+                                        'get_pos_tagger') as get_pos_tagger:
+            self.assertEqual(
+                self.uut.check_imperative_batch(
+                    ['Add file', ' Fixed bug', 'Adding test', 'updates',
+                     'Uses nltk']),
+                [None, ('Fixed', 'VBD'), ('Adding', 'VBG'),
+                 ('updates', 'VBZ'), ('Uses', 'VBZ')])
+            self.assertIsNone(self.uut.check_imperative('Remove file'))
+
+        self.assertFalse(get_pos_tagger.called)
+
+    def test_check_imperative_batch(self):
+        tagger = unittest.mock.Mock()
+        tagger.tag_sents.return_value = [[('I', 'PRP'), ('Wrote', 'VBD')],
+                                         [('I', 'PRP'), ('Write', 'VBP')]]
+        with unittest.mock.patch.object(_CommitBear, 'get_pos_tagger',
+                                        return_value=tagger), \
+                unittest.mock.patch('nltk.sent_tokenize',
+                                    side_effect=lambda text: [text]), \
+                unittest.mock.patch('nltk.word_tokenize',
+                                    side_effect=str.split):
+            self.assertEqual(
+                self.uut.check_imperative_batch(
+                    ['Wrote docs', 'Added file', 'Write docs', '']),
+                [('Wrote', 'VBD'), ('Added', 'VBD'), None, None])
+
+        self.assertEqual(list(tagger.tag_sents.call_args[0][0]),
+                         [['I', 'Wrote', 'docs'], ['I', 'Write', 'docs']])
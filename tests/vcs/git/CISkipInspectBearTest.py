@@ -112,3 +112,22 @@ class CISkipInspectBearTest(unittest.TestCase):
             self.run_uut(appveyor_ci=True),
             ['This commit modifies a file that has pattern of type '
              '".coafile", thus should not disable CI build.'])
+
+    def test_skipci_build_commit_many_files(self):
+        self.section.append(Setting('files', 'tests/**Test.py, .coafile'))
+        os.makedirs(os.path.join('tests', 'sub'))
+        for index in range(200):
+            Path('file%d.txt' % index).touch()
+        Path(os.path.join('tests', 'sub', 'AbcBearTest.py')).touch()
+        Path(os.path.join('tests', 'DefBearTest.py')).touch()
+        run_shell_command('git add .')
+        run_shell_command('git commit -m "Add files"')
+        self.assertEqual(self.run_uut(), [])
+
+        # Deleted files don't exist anymore but are matched as well.
+        run_shell_command('git rm -r tests')
+        run_shell_command('git commit -m "Remove tests [skip ci]"')
+        self.assertEqual(
+            self.run_uut(),
+            ['This commit modifies a file that has pattern of type '
+             '"tests/**Test.py", thus should not disable CI build.'] * 2)
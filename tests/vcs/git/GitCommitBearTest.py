@@ -101,6 +101,37 @@ class GitCommitBearTest(unittest.TestCase):
                          [])
         self.assert_no_msgs()
 
+    def test_commit_range(self):
+        self.git_commit('Base commit')
+        self.git_commit('')
+        self.git_commit('Shortlog with dot.')
+        self.git_commit('Good shortlog\n\nBody')
+        first_sha, second_sha = run_shell_command(
+            'git rev-parse HEAD~2 HEAD~1')[0].split()
+
+        self.assertEqual(self.run_uut(commit_range='HEAD~3..HEAD',
+                                      shortlog_trailing_period=False,
+                                      shortlog_imperative_check=False),
+                         ['Commit {} has no message.'.format(first_sha[:7]),
+                          'Shortlog of commit {} contains a period at '
+                          'end.'.format(second_sha[:7])])
+        self.assert_no_msgs()
+
+        head_sha = run_shell_command('git rev-parse HEAD')[0].strip()
+        self.assertEqual(self.run_uut(commit_range='HEAD~1..HEAD',
+                                      shortlog_regex='HEAD commit: .*',
+                                      shortlog_imperative_check=False),
+                         ['Shortlog of commit {} does not match given regex: '
+                          'HEAD commit: .*'.format(head_sha[:7])])
+        self.assert_no_msgs()
+
+        self.assertEqual(self.run_uut(commit_range='HEAD..HEAD'), [])
+        self.assert_no_msgs()
+
+        self.assertEqual(self.run_uut(commit_range='not-existing..HEAD'), [])
+        self.assertEqual(self.msg_queue.get().message[:4], 'git:')
+        self.assert_no_msgs()
+
     def test_github_pull_request_temporary_merge_commit_check(self):
         self.run_git_command('remote', 'add', 'upstream',
                              'https://github.com/coala/coala-quickstart.git')
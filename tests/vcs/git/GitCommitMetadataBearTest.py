@@ -178,3 +178,41 @@ class AnalyzeGitCommitTest(unittest.TestCase):
         self.assertEqual(self.run_uut(),
                          [(test_raw_commit_msg, test_sha5, parents,
                            COMMIT_TYPE.merge_commit, [], [], [])])
+
+    def test_analyze_commit_range(self):
+        Path('testfile6.txt').touch()
+        Path('testfile7.txt').touch()
+        run_shell_command('git add testfile6.txt testfile7.txt')
+        run_shell_command('git commit -m "Add testfile6 and testfile7"')
+        base_sha = run_shell_command('git rev-parse HEAD')[0].strip('\n')
+
+        Path('test file\twith tab.txt').touch()
+        with open('testfile6.txt', 'w') as f:
+            f.write('Some text')
+        run_shell_command('git add -A')
+        run_shell_command('git commit -m "Add and modify files"')
+        test_sha6 = run_shell_command('git rev-parse HEAD')[0].strip('\n')
+
+        run_shell_command('git checkout -b other-feature HEAD~1')
+        run_shell_command('git rm testfile7.txt')
+        run_shell_command('git commit -m "Delete testfile7"')
+        test_sha7 = run_shell_command('git rev-parse HEAD')[0].strip('\n')
+        run_shell_command('git checkout -')
+        run_shell_command('git merge --no-ff other-feature')
+        test_sha8 = run_shell_command('git rev-parse HEAD')[0].strip('\n')
+
+        self.assertEqual(
+            self.run_uut(commit_range='HEAD~2..HEAD'),
+            [('Add and modify files\n\n', test_sha6, [base_sha],
+              COMMIT_TYPE.simple_commit, ['test file\twith tab.txt'],
+              ['testfile6.txt'], []),
+             ('Delete testfile7\n\n', test_sha7, [base_sha],
+              COMMIT_TYPE.simple_commit, [], [], ['testfile7.txt']),
+             ("Merge branch 'other-feature'\n\n", test_sha8,
+              [test_sha6, test_sha7], COMMIT_TYPE.merge_commit, [], [], [])])
+        self.assertTrue(self.msg_queue.empty())
+
+        self.assertEqual(self.run_uut(commit_range='HEAD..HEAD'), [])
+        self.assertEqual(self.run_uut(commit_range='not-existing..HEAD'),
+                         [])
+        self.assertEqual(self.msg_queue.get().message[:4], 'git:')
@@ -117,3 +117,42 @@ class GitIgnoreBearTest(unittest.TestCase):
         self.run_git_command('add', '.gitignore')
         self.assertEqual(self.run_uut(), [])
         self.assert_no_msgs()
+
+    def test_special_file_names(self):
+        for filename in ('test file.txt', 'tëst_fïle.txt'):
+            file = open(filename, 'w')
+            file.close()
+
+        file = open('.gitignore', 'w')
+        file.write('*.txt')
+        file.close()
+
+        self.run_git_command('add', '-f', '.gitignore', '"test file.txt"',
+                             'tëst_fïle.txt')
+        self.assertEqual(self.run_uut(), [
+            'File test file.txt is being tracked which was ignored in line'
+            ' number 1 in file .gitignore.',
+            'File tëst_fïle.txt is being tracked which was ignored in line'
+            ' number 1 in file .gitignore.'
+        ])
+        self.assert_no_msgs()
+
+    def test_many_files(self):
+        for number in range(2000):
+            file = open('file{}.{}'.format(number, 'log' if number % 4
+                                           else 'txt'), 'w')
+            file.close()
+
+        file = open('.gitignore', 'w')
+        file.write('*.txt')
+        file.close()
+
+        self.run_git_command('add', '-f', '.')
+        with unittest.mock.patch(
+                'bears.vcs.git.GitIgnoreBear.run_shell_command',
+                wraps=run_shell_command) as mock_run_shell_command:
+            self.assertEqual(len(self.run_uut()), 500)
+
+        # The number of git processes doesn't grow with the number of files.
+        self.assertEqual(mock_run_shell_command.call_count, 2)
+        self.assert_no_msgs()
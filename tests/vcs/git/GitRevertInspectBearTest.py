@@ -2,16 +2,14 @@ import os
 import platform
 import shutil
 import stat
-import sys
 import unittest
-import unittest.mock
 from pathlib import Path
 from queue import Queue
 from tempfile import mkdtemp
 
 from bears.vcs.git.GitCommitMetadataBear import GitCommitMetadataBear
 from bears.vcs.git.GitRevertInspectBear import GitRevertInspectBear
-from coalib.misc.Shell import run_shell_command, ShellCommandResult
+from coalib.misc.Shell import run_shell_command
 from coalib.settings.Section import Section
 from coalib.testing.BearTestHelper import generate_skip_decorator
 from .GitCommitBearTest import GitCommitBearTest
@@ -211,17 +209,7 @@ class GitRevertInspectBearTest(unittest.TestCase):
         run_shell_command('git commit --amend --allow-empty --no-edit')
         self.assertEqual(self.run_uut(), [])
 
-    @unittest.mock.patch('bears.vcs.git.GitRevertInspectBear.run_shell_command')
-    def test_check_modified_file_similarity_error(self, mock_run_shell_command):
-        mock_run_shell_command.side_effect = [
-            ShellCommandResult(0, 'M\ttestfile7.txt', sys.stderr),
-            ShellCommandResult(0, None, sys.stderr),
-            ShellCommandResult(0, ('', 'errors'), sys.stderr),
-            ShellCommandResult(0, None, sys.stderr),
-            ShellCommandResult(0, None, sys.stderr),
-            ShellCommandResult(0, None, sys.stderr)
-        ]
-
+    def test_check_modified_file_similarity_error(self):
         Path('testfile7.txt').touch()
         with open('testfile7.txt', 'w') as f:
             f.write('Some other text\n')
@@ -231,14 +219,48 @@ class GitRevertInspectBearTest(unittest.TestCase):
         with open('testfile7.txt', 'w') as f:
             f.write('Changed text\n')
         run_shell_command('git add testfile7.txt')
-        run_shell_command('git commit -m "modify testfile6"')
+        run_shell_command('git commit -m "modify testfile7"')
+        reverted_sha = run_shell_command('git rev-parse HEAD')[0].strip('\n')
 
-        run_shell_command('git revert HEAD --no-edit')
         with open('testfile7.txt', 'w') as f:
-            f.write('Some more text\n')
+            f.write('Changed text again\n')
         run_shell_command('git add testfile7.txt')
-        run_shell_command('git commit --amend --allow-empty --no-edit')
+        run_shell_command('git commit -m "modify testfile7 again"')
 
-        assert self.run_uut() == []
-        mock_run_shell_command.assert_has_calls(
-            [unittest.mock.call('git revert --abort')])
+        # Reverting the first modification conflicts with the second one.
+        with open('testfile7.txt', 'w') as f:
+            f.write('Some other text\n')
+        run_shell_command('git add testfile7.txt')
+        GitCommitBearTest.git_commit('Revert "modify testfile7"\n\n'
+                                     'This reverts commit %s.' %
+                                     reverted_sha)
+
+        self.assertEqual(self.run_uut(), [])
+        self.assertEqual(self.msg_queue.get().message,
+                         'Cannot compare the modified files.')
+        self.assertEqual(
+            run_shell_command('git worktree list')[0].count('\n'), 1)
+
+    def test_working_tree_is_left_alone(self):
+        with open('testfile8.txt', 'w') as f:
+            f.write('Some text\n')
+        run_shell_command('git add testfile8.txt')
+        run_shell_command('git commit -m "Initial commit"')
+
+        with open('testfile8.txt', 'a') as f:
+            f.write('Changed text\n')
+        run_shell_command('git add testfile8.txt')
+        run_shell_command('git commit -m "modify testfile8"')
+        run_shell_command('git revert HEAD --no-edit')
+
+        with open('testfile8.txt', 'a') as f:
+            f.write('Uncommitted text\n')
+        branches = run_shell_command('git branch')[0]
+
+        self.assertEqual(self.run_uut(), [])
+        self.assertTrue(self.msg_queue.empty())
+        self.assertEqual(run_shell_command('git branch')[0], branches)
+        self.assertEqual(
+            run_shell_command('git worktree list')[0].count('\n'), 1)
+        with open('testfile8.txt') as f:
+            self.assertEqual(f.read(), 'Some text\nUncommitted text\n')
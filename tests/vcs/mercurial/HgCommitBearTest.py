@@ -109,6 +109,25 @@ class HgCommitBearTest(unittest.TestCase):
 
         self.assert_no_msgs()
 
+    def test_commit_range(self):
+        self.hg_commit('')
+        self.hg_commit('Shortlog with dot.')
+        self.hg_commit('Good shortlog\n\nBody')
+        first_node, second_node = run_shell_command(
+            'hg log -r .~2::.~1 --template "{node}\\n"')[0].split()
+
+        self.assertEqual(self.run_uut(commit_range='.~2::.',
+                                      shortlog_trailing_period=False,
+                                      shortlog_imperative_check=False),
+                         ['Commit {} has no message.'.format(first_node[:7]),
+                          'Shortlog of commit {} contains a period at '
+                          'end.'.format(second_node[:7])])
+        self.assert_no_msgs()
+
+        self.assertEqual(self.run_uut(commit_range='not-existing::.'), [])
+        self.assertEqual(self.msg_queue.get().message[:3], 'hg:')
+        self.assert_no_msgs()
+
     def test_empty_message(self):
         self.hg_commit('')
 